@@ -2,19 +2,23 @@
 # For license information, please see license.txt
 
 import frappe
+from frappe import _
 from frappe.model.document import Document
-from frappe.utils import cint, cstr
+from frappe.utils import cint, cstr, flt, now
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
 
+# closing balances are bulk inserted in chunks of this size
+CLOSING_BALANCE_CHUNK_SIZE = 5000
+
 
 class AccountClosingBalance(Document):
 	pass
 
 
-def make_closing_entries(closing_entries, voucher_name, company, closing_date):
+def make_closing_entries(closing_entries, voucher_name, company, closing_date, publish_progress=False):
 	accounting_dimensions = get_accounting_dimensions()
 
 	previous_closing_entries = get_previous_closing_entries(company, closing_date, accounting_dimensions)
@@ -22,19 +26,61 @@ def make_closing_entries(closing_entries, voucher_name, company, closing_date):
 
 	merged_entries = aggregate_with_last_account_closing_balance(combined_entries, accounting_dimensions)
 
-	for _key, value in merged_entries.items():
-		cle = frappe.new_doc("Account Closing Balance")
-		cle.update(value)
-		cle.update(value["dimensions"])
-		cle.update(
-			{
-				"period_closing_voucher": voucher_name,
-				"closing_date": closing_date,
-			}
+	fields = [
+		"company",
+		"account",
+		"account_currency",
+		"cost_center",
+		"project",
+		"finance_book",
+		*accounting_dimensions,
+	]
+	amount_fields = ["debit", "credit", "debit_in_account_currency", "credit_in_account_currency"]
+
+	timestamp, user = now(), frappe.session.user
+	values = [
+		(
+			frappe.generate_hash(length=10),
+			timestamp,
+			timestamp,
+			user,
+			user,
+			1,
+			voucher_name,
+			closing_date,
+			value["dimensions"]["is_period_closing_voucher_entry"],
+			*(value["dimensions"][fieldname] or None for fieldname in fields),
+			*(flt(value[fieldname]) for fieldname in amount_fields),
 		)
-		cle.flags.ignore_permissions = True
-		cle.flags.ignore_links = True
-		cle.submit()
+		for value in merged_entries.values()
+	]
+
+	for start in range(0, len(values), CLOSING_BALANCE_CHUNK_SIZE):
+		frappe.db.bulk_insert(
+			"Account Closing Balance",
+			fields=[
+				"name",
+				"creation",
+				"modified",
+				"owner",
+				"modified_by",
+				"docstatus",
+				"period_closing_voucher",
+				"closing_date",
+				"is_period_closing_voucher_entry",
+				*fields,
+				*amount_fields,
+			],
+			values=values[start : start + CLOSING_BALANCE_CHUNK_SIZE],
+		)
+
+		if publish_progress:
+			frappe.publish_progress(
+				min(start + CLOSING_BALANCE_CHUNK_SIZE, len(values)) * 100 / len(values),
+				title=_("Creating Account Closing Balances..."),
+				doctype="Period Closing Voucher",
+				docname=voucher_name,
+			)
 
 
 def aggregate_with_last_account_closing_balance(entries, accounting_dimensions):
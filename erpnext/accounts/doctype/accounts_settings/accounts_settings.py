@@ -38,9 +38,26 @@ class AccountsSettings(Document):
 		if old_doc.acc_frozen_upto != self.acc_frozen_upto:
 			self.validate_pending_reposts()
 
+		if self.use_gl_period_balances != old_doc.use_gl_period_balances:
+			# balances are read from the snapshots once the rebuild enqueued on update has finished
+			self.gl_period_balances_rebuilt = 0
+
+		if self.maintain_voucher_outstanding != old_doc.maintain_voucher_outstanding:
+			# outstandings are read from Voucher Outstanding once the rebuild enqueued on update has finished
+			self.voucher_outstandings_rebuilt = 0
+
 		if clear_cache:
 			frappe.clear_cache()
 
+	def on_update(self):
+		old_doc = self.get_doc_before_save()
+
+		if self.use_gl_period_balances and not old_doc.use_gl_period_balances:
+			self.rebuild_gl_period_balances()
+
+		if self.maintain_voucher_outstanding and not old_doc.maintain_voucher_outstanding:
+			self.rebuild_voucher_outstandings()
+
 	def validate_stale_days(self):
 		if not self.allow_stale and cint(self.stale_days) <= 0:
 			frappe.msgprint(
@@ -66,6 +83,26 @@ class AccountsSettings(Document):
 		if self.acc_frozen_upto:
 			check_pending_reposting(self.acc_frozen_upto)
 
+	def rebuild_gl_period_balances(self):
+		frappe.enqueue(
+			"erpnext.accounts.doctype.gl_period_balance.gl_period_balance.rebuild_gl_period_balances",
+			queue="long",
+			timeout=3600,
+			enqueue_after_commit=True,
+			now=frappe.flags.in_test,
+		)
+		frappe.msgprint(_("GL Period Balances are being rebuilt in the background."), alert=True)
+
+	def rebuild_voucher_outstandings(self):
+		frappe.enqueue(
+			"erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding.rebuild_voucher_outstandings",
+			queue="long",
+			timeout=3600,
+			enqueue_after_commit=True,
+			now=frappe.flags.in_test,
+		)
+		frappe.msgprint(_("Voucher Outstanding is being rebuilt in the background."), alert=True)
+
 	@frappe.whitelist()
 	def drop_ar_sql_procedures(self):
 		from erpnext.accounts.report.accounts_receivable.accounts_receivable import InitSQLProceduresForAR
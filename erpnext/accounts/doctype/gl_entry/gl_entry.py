@@ -50,32 +50,33 @@ class GLEntry(Document):
 			validate_balance_type(self.account, adv_adj)
 			validate_frozen_account(self.account, adv_adj)
 
-			if (
-				self.voucher_type == "Journal Entry"
-				and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
-				== "Exchange Gain Or Loss"
-			):
-				return
-
-			if frappe.get_cached_value("Account", self.account, "account_type") not in [
-				"Receivable",
-				"Payable",
-			]:
-				# Update outstanding amt on against voucher
-				if (
-					self.against_voucher_type
-					in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
-					and self.against_voucher
-					and self.flags.update_outstanding == "Yes"
-					and not frappe.flags.is_reverse_depr_entry
-				):
-					update_outstanding_amt(
-						self.account,
-						self.party_type,
-						self.party,
-						self.against_voucher_type,
-						self.against_voucher,
-					)
+			if self.is_outstanding_to_be_updated():
+				update_outstanding_amt(
+					self.account,
+					self.party_type,
+					self.party,
+					self.against_voucher_type,
+					self.against_voucher,
+				)
+
+	def is_outstanding_to_be_updated(self):
+		if (
+			self.voucher_type == "Journal Entry"
+			and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
+			== "Exchange Gain Or Loss"
+		):
+			return False
+
+		if frappe.get_cached_value("Account", self.account, "account_type") in ["Receivable", "Payable"]:
+			return False
+
+		# Update outstanding amt on against voucher
+		return bool(
+			self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+			and self.against_voucher
+			and self.flags.update_outstanding == "Yes"
+			and not frappe.flags.is_reverse_depr_entry
+		)
 
 	def check_mandatory(self):
 		mandatory = ["account", "voucher_type", "voucher_no", "company"]
@@ -255,6 +256,33 @@ class GLEntry(Document):
 		frappe.throw(msg)
 
 
+def on_update_gl_entries(gl_entries, adv_adj=False):
+	"""`GLEntry.on_update` for the GL Entries of a voucher inserted together,
+	validating each account and updating each outstanding reference once"""
+	validated_accounts = set()
+	outstanding_references = set()
+
+	for gle in gl_entries:
+		if gle.flags.from_repost or gle.voucher_type == "Period Closing Voucher":
+			continue
+
+		gle.validate_dimensions_for_pl_and_bs()
+
+		if gle.account not in validated_accounts:
+			validated_accounts.add(gle.account)
+			gle.validate_account_details(adv_adj)
+			validate_balance_type(gle.account, adv_adj)
+			validate_frozen_account(gle.account, adv_adj)
+
+		if gle.is_outstanding_to_be_updated():
+			outstanding_references.add(
+				(gle.account, gle.party_type, gle.party, gle.against_voucher_type, gle.against_voucher)
+			)
+
+	for account, party_type, party, against_voucher_type, against_voucher in outstanding_references:
+		update_outstanding_amt(account, party_type, party, against_voucher_type, against_voucher)
+
+
 def validate_balance_type(account, adv_adj=False):
 	if not adv_adj and account:
 		balance_must_be = frappe.get_cached_value("Account", account, "balance_must_be")
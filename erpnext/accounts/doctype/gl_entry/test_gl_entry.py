@@ -79,3 +79,27 @@ class TestGLEntry(unittest.TestCase):
 			"SELECT current from tabSeries where name = %s", naming_series
 		)[0][0]
 		self.assertEqual(old_naming_series_current_value + 2, new_naming_series_current_value)
+
+	def test_gl_entries_posted_in_bulk(self):
+		from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+
+		def get_gl_entries(voucher_no):
+			return frappe.get_all(
+				"GL Entry",
+				filters={"voucher_no": voucher_no, "is_cancelled": 0},
+				fields=["account", "debit", "credit", "cost_center", "fiscal_year", "docstatus", "to_rename"],
+				order_by="account, debit",
+			)
+
+		expected = get_gl_entries(create_sales_invoice(qty=5, rate=100).name)
+
+		frappe.db.set_single_value("Accounts Settings", "post_gl_entries_in_bulk", 1)
+		try:
+			si = create_sales_invoice(qty=5, rate=100)
+		finally:
+			frappe.db.set_single_value("Accounts Settings", "post_gl_entries_in_bulk", 0)
+
+		self.assertEqual(get_gl_entries(si.name), expected)
+
+		si.cancel()
+		self.assertFalse(get_gl_entries(si.name))
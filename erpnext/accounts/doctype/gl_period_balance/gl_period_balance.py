@@ -0,0 +1,244 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, add_months, cint, cstr, flt, get_first_day, getdate, now
+
+PERIOD_KEY_FIELDS = ("company", "account", "cost_center", "party_type", "party", "period_start_date")
+AMOUNT_FIELDS = ("debit", "credit", "debit_in_account_currency", "credit_in_account_currency")
+
+
+class GLPeriodBalance(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("GL Period Balance", ["company", "account", "period_start_date"])
+
+
+def is_gl_period_balance_enabled():
+	"""Whether balances can be read from the monthly balances, which is once they have been rebuilt"""
+	return is_gl_period_balance_maintained() and cint(
+		frappe.db.get_single_value("Accounts Settings", "gl_period_balances_rebuilt")
+	)
+
+
+def is_gl_period_balance_maintained():
+	return cint(frappe.db.get_single_value("Accounts Settings", "use_gl_period_balances"))
+
+
+def update_gl_period_balances(gl_entries, cancel=False):
+	"""Add the given GL Entries to their monthly balances, or remove them on cancel"""
+	if not gl_entries or not is_gl_period_balance_maintained():
+		return
+
+	sign = -1 if cancel else 1
+	balances = {}
+	for gle in gl_entries:
+		gle = frappe._dict(gle)
+		key = (
+			gle.company,
+			gle.account,
+			gle.cost_center or None,
+			gle.party_type or None,
+			gle.party or None,
+			get_first_day(gle.posting_date),
+		)
+
+		balance = balances.setdefault(
+			key, frappe._dict({"account_currency": gle.account_currency, **dict.fromkeys(AMOUNT_FIELDS, 0.0)})
+		)
+		for fieldname in AMOUNT_FIELDS:
+			balance[fieldname] += sign * flt(gle.get(fieldname))
+
+	for key, balance in balances.items():
+		add_to_period_balance(key, balance)
+
+
+def add_to_period_balance(key, balance):
+	table = frappe.qb.DocType("GL Period Balance")
+	filters = dict(zip(PERIOD_KEY_FIELDS, key, strict=True))
+
+	conditions = [
+		table[fieldname].isnull() if value is None else table[fieldname] == value
+		for fieldname, value in filters.items()
+	]
+
+	query = frappe.qb.from_(table).select(table.name).for_update()
+	for condition in conditions:
+		query = query.where(condition)
+
+	existing = query.limit(1).run()
+	if existing:
+		update_query = frappe.qb.update(table).where(table.name == existing[0][0])
+		for fieldname in AMOUNT_FIELDS:
+			update_query = update_query.set(table[fieldname], table[fieldname] + balance[fieldname])
+		update_query.run()
+		return
+
+	doc = frappe.new_doc("GL Period Balance")
+	doc.update(filters)
+	doc.update(balance)
+	doc.flags.ignore_permissions = True
+	doc.db_insert()
+
+
+def reverse_gl_period_balances(filters):
+	"""Remove the active GL Entries matching `filters` from the monthly balances,
+	called before they are cancelled or deleted"""
+	if not is_gl_period_balance_maintained():
+		return
+
+	gl_entries = frappe.get_all(
+		"GL Entry",
+		filters={**filters, "is_cancelled": 0},
+		fields=[
+			"company",
+			"account",
+			"cost_center",
+			"party_type",
+			"party",
+			"posting_date",
+			"account_currency",
+			*AMOUNT_FIELDS,
+		],
+	)
+	update_gl_period_balances(gl_entries, cancel=True)
+
+
+def rebuild_gl_period_balances(company=None):
+	"""Rebuild monthly balances from GL Entry.
+
+	Runs when the feature is enabled in Accounts Settings and can be run manually with
+	`bench execute erpnext.accounts.doctype.gl_period_balance.gl_period_balance.rebuild_gl_period_balances`
+
+	Each company is rebuilt in its own transaction holding the lock on its balances, which postings
+	take as well when updating them. Balances are only read from the snapshots once all companies
+	have been rebuilt and committed.
+	"""
+	rebuild_all = not company
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+
+	for company in companies:
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+		# lock before reading GL Entry, so that entries posted by others are either committed and read
+		# below or added to the rebuilt balances once this transaction is committed
+		table = frappe.qb.DocType("GL Period Balance")
+		frappe.qb.from_(table).select(table.name).where(table.company == company).for_update().run()
+		frappe.db.delete("GL Period Balance", {"company": company})
+
+		balances = frappe.db.sql(
+			"""
+			SELECT
+				account, cost_center, party_type, party,
+				extract(year from posting_date) as period_year,
+				extract(month from posting_date) as period_month,
+				max(account_currency) as account_currency,
+				sum(debit) as debit, sum(credit) as credit,
+				sum(debit_in_account_currency) as debit_in_account_currency,
+				sum(credit_in_account_currency) as credit_in_account_currency
+			FROM `tabGL Entry`
+			WHERE company = %s and is_cancelled = 0
+			GROUP BY account, cost_center, party_type, party, period_year, period_month
+			""",
+			company,
+			as_dict=1,
+		)
+
+		timestamp, user = now(), frappe.session.user
+		fields = [
+			"name",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			*PERIOD_KEY_FIELDS,
+			"account_currency",
+			*AMOUNT_FIELDS,
+		]
+		values = [
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				user,
+				user,
+				company,
+				d.account,
+				d.cost_center or None,
+				d.party_type or None,
+				d.party or None,
+				getdate(f"{cint(d.period_year)}-{cint(d.period_month):02d}-01"),
+				d.account_currency,
+				*(flt(d[fieldname]) for fieldname in AMOUNT_FIELDS),
+			)
+			for d in balances
+		]
+		frappe.db.bulk_insert("GL Period Balance", fields=fields, values=values)
+
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+	if rebuild_all and is_gl_period_balance_maintained():
+		frappe.db.set_single_value("Accounts Settings", "gl_period_balances_rebuilt", 1)
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+
+def get_balance_from_gl_period_balances(select_field, conditions, to_date=None, from_date=None):
+	"""Balance for `conditions` (written against the `gle` alias) read from the monthly balances
+	of complete months plus a scan of GL Entry for the partial months at either end of the range"""
+	period_conditions = list(conditions)
+	gl_conditions = ["is_cancelled=0", *conditions]
+	gl_date_ranges = []
+
+	to_date = getdate(to_date) if to_date else None
+	from_date = getdate(from_date) if from_date else None
+	last_period_start = get_first_day(to_date) if to_date else None
+
+	if from_date and last_period_start and from_date >= last_period_start:
+		# range within a single month
+		gl_date_ranges.append((from_date, to_date))
+		period_conditions = None
+	else:
+		if from_date:
+			first_period_start = get_first_day(from_date)
+			if first_period_start != from_date:
+				first_period_start = get_first_day(add_months(from_date, 1))
+				gl_date_ranges.append((from_date, add_days(first_period_start, -1)))
+			period_conditions.append(f"gle.period_start_date >= {frappe.db.escape(cstr(first_period_start))}")
+
+		if last_period_start:
+			gl_date_ranges.append((last_period_start, to_date))
+			period_conditions.append(f"gle.period_start_date < {frappe.db.escape(cstr(last_period_start))}")
+
+	balance = 0.0
+	if period_conditions is not None:
+		balance += flt(
+			frappe.db.sql(
+				f"""
+				SELECT {select_field}
+				FROM `tabGL Period Balance` gle
+				WHERE {" and ".join(period_conditions) or "1=1"}"""
+			)[0][0]
+		)
+
+	if gl_date_ranges:
+		gl_date_condition = " or ".join(
+			f"gle.posting_date between {frappe.db.escape(cstr(start))} and {frappe.db.escape(cstr(end))}"
+			for start, end in gl_date_ranges
+		)
+		gl_conditions.append(f"({gl_date_condition})")
+		balance += flt(
+			frappe.db.sql(
+				f"""
+				SELECT {select_field}
+				FROM `tabGL Entry` gle
+				WHERE {" and ".join(gl_conditions)}"""
+			)[0][0]
+		)
+
+	return balance
@@ -0,0 +1,66 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+
+from erpnext.accounts.doctype.gl_period_balance.gl_period_balance import (
+	is_gl_period_balance_enabled,
+	rebuild_gl_period_balances,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.utils import get_balance_on
+
+
+class TestGLPeriodBalance(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	@change_settings("Accounts Settings", {"use_gl_period_balances": 1})
+	def test_balance_matches_gl_entries(self):
+		account, against_account = "_Test Bank - _TC", "_Test Cash - _TC"
+
+		journals = [
+			make_journal_entry(account, against_account, amount, posting_date=posting_date, submit=True)
+			for amount, posting_date in (
+				(100, "2026-01-10"),
+				(250, "2026-02-01"),
+				(-75, "2026-02-20"),
+				(400, "2026-03-15"),
+			)
+		]
+
+		def assert_balances_match():
+			for start_date, date in (
+				(None, "2026-01-31"),
+				(None, "2026-02-19"),
+				(None, "2026-03-15"),
+				("2026-01-15", "2026-03-31"),
+				("2026-02-01", "2026-02-28"),
+				("2026-02-10", "2026-02-25"),
+			):
+				balance = get_balance_on(account, date, company="_Test Company", start_date=start_date)
+
+				frappe.db.set_single_value("Accounts Settings", "use_gl_period_balances", 0)
+				expected = get_balance_on(account, date, company="_Test Company", start_date=start_date)
+				frappe.db.set_single_value("Accounts Settings", "use_gl_period_balances", 1)
+
+				self.assertEqual(balance, expected)
+
+		assert_balances_match()
+
+		journals[1].cancel()
+		assert_balances_match()
+
+	def test_balances_are_read_once_rebuilt(self):
+		frappe.db.set_single_value(
+			"Accounts Settings", {"use_gl_period_balances": 1, "gl_period_balances_rebuilt": 0}
+		)
+		self.assertFalse(is_gl_period_balance_enabled())
+
+		# rebuilding a single company leaves the others to be rebuilt
+		rebuild_gl_period_balances("_Test Company")
+		self.assertFalse(is_gl_period_balance_enabled())
+
+		rebuild_gl_period_balances()
+		self.assertTrue(is_gl_period_balance_enabled())
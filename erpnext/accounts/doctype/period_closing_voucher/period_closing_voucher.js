@@ -37,5 +37,11 @@ frappe.ui.form.on("Period Closing Voucher", {
 				"fa fa-table"
 			);
 		}
+
+		if (frm.doc.docstatus === 1 && frm.doc.gle_processing_status === "Failed") {
+			frm.add_custom_button(__("Retry"), function () {
+				frm.call("retry_gle_processing").then(() => frm.reload_doc());
+			});
+		}
 	},
 });
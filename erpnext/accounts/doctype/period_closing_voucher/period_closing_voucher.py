@@ -13,6 +13,9 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 from erpnext.accounts.utils import get_account_currency, get_fiscal_year, validate_fiscal_year
 from erpnext.controllers.accounts_controller import AccountsController
 
+# closing vouchers for periods with more GL Entries than this are processed in the background
+BACKGROUND_PROCESSING_THRESHOLD = 5000
+
 
 class PeriodClosingVoucher(AccountsController):
 	def validate(self):
@@ -21,14 +24,28 @@ class PeriodClosingVoucher(AccountsController):
 
 	def on_submit(self):
 		self.db_set("gle_processing_status", "In Progress")
-		get_opening_entries = False
+		self.make_gl_entries(get_opening_entries=self.is_first_closing_voucher())
 
-		if not frappe.db.exists(
-			"Period Closing Voucher", {"company": self.company, "docstatus": 1, "name": ("!=", self.name)}
-		):
-			get_opening_entries = True
+	def is_first_closing_voucher(self):
+		return not frappe.db.exists(
+			"Period Closing Voucher",
+			{
+				"company": self.company,
+				"docstatus": 1,
+				"name": ("!=", self.name),
+				"posting_date": ("<", self.posting_date),
+			},
+		)
+
+	@frappe.whitelist()
+	def retry_gle_processing(self):
+		"""Resume the processing of a voucher whose GL Entries or closing balances could not be made"""
+		if self.docstatus != 1 or self.gle_processing_status != "Failed":
+			frappe.throw(_("Only the submitted vouchers that failed to process can be retried"))
 
-		self.make_gl_entries(get_opening_entries=get_opening_entries)
+		self.check_permission("submit")
+		self.db_set({"gle_processing_status": "In Progress", "error_message": None})
+		self.enqueue_gl_and_closing_entries(get_opening_entries=self.is_first_closing_voucher())
 
 	def on_cancel(self):
 		self.validate_future_closing_vouchers()
@@ -129,27 +146,34 @@ class PeriodClosingVoucher(AccountsController):
 			frappe.throw(_("Previous Year is not closed, please close it first"))
 
 	def make_gl_entries(self, get_opening_entries=False):
-		gl_entries = self.get_gl_entries()
-		closing_entries = self.get_grouped_gl_entries(get_opening_entries=get_opening_entries)
-		if len(gl_entries + closing_entries) > 3000:
-			frappe.enqueue(
-				process_gl_and_closing_entries,
-				gl_entries=gl_entries,
-				closing_entries=closing_entries,
-				voucher_name=self.name,
-				company=self.company,
-				closing_date=self.posting_date,
-				timeout=3000,
-			)
+		gle_count = frappe.db.count(
+			"GL Entry",
+			{
+				"company": self.company,
+				"is_cancelled": 0,
+				"posting_date": ("between", [self.year_start_date, self.posting_date]),
+			},
+		)
 
+		if gle_count > BACKGROUND_PROCESSING_THRESHOLD:
+			self.enqueue_gl_and_closing_entries(get_opening_entries)
 			frappe.msgprint(
 				_("The GL Entries will be processed in the background, it can take a few minutes."),
 				alert=True,
 			)
 		else:
-			process_gl_and_closing_entries(
-				gl_entries, closing_entries, self.name, self.company, self.posting_date
-			)
+			process_gl_and_closing_entries(self.name, get_opening_entries=get_opening_entries)
+
+	def enqueue_gl_and_closing_entries(self, get_opening_entries=False):
+		frappe.enqueue(
+			process_gl_and_closing_entries,
+			voucher_name=self.name,
+			get_opening_entries=get_opening_entries,
+			commit=True,
+			queue="long",
+			timeout=3000,
+			enqueue_after_commit=True,
+		)
 
 	def get_grouped_gl_entries(self, get_opening_entries=False):
 		closing_entries = []
@@ -162,18 +186,28 @@ class PeriodClosingVoucher(AccountsController):
 
 	def get_gl_entries(self):
 		gl_entries = []
+		closing_account_balances = {}
 
 		# pl account
-		for acc in self.get_balances_based_on_dimensions(
+		pl_balances = self.get_balances_based_on_dimensions(
 			group_by_account=True, report_type="Profit and Loss"
-		):
+		)
+		dimension_fields = self.get_dimension_fields()
+		for acc in pl_balances:
 			if flt(acc.bal_in_company_currency):
 				gl_entries.append(self.get_gle_for_pl_account(acc))
 
+			# the closing account is posted per dimension with the total balance of the pl accounts
+			key = tuple(acc.get(dimension) for dimension in dimension_fields)
+			if key in closing_account_balances:
+				closing_account_balances[key].bal_in_company_currency += flt(acc.bal_in_company_currency)
+			else:
+				closing_account_balances[key] = frappe._dict(
+					acc, account=None, bal_in_company_currency=flt(acc.bal_in_company_currency)
+				)
+
 		# closing liability account
-		for acc in self.get_balances_based_on_dimensions(
-			group_by_account=False, report_type="Profit and Loss"
-		):
+		for acc in closing_account_balances.values():
 			if flt(acc.bal_in_company_currency):
 				gl_entries.append(self.get_gle_for_closing_account(acc))
 
@@ -216,7 +250,7 @@ class PeriodClosingVoucher(AccountsController):
 				"account": self.closing_account_head,
 				"cost_center": acc.cost_center,
 				"finance_book": acc.finance_book,
-				"account_currency": acc.account_currency,
+				"account_currency": get_account_currency(self.closing_account_head),
 				"debit_in_account_currency": debit,
 				"debit": debit,
 				"credit_in_account_currency": credit,
@@ -258,32 +292,31 @@ class PeriodClosingVoucher(AccountsController):
 		for dimension in self.accounting_dimensions:
 			gl_entry.update({dimension: acc.get(dimension)})
 
+	def get_dimension_fields(self):
+		if not self.get("accounting_dimensions"):
+			self.accounting_dimensions = get_accounting_dimensions()
+
+		return ["cost_center", "finance_book", "project", *self.accounting_dimensions]
+
 	def get_balances_based_on_dimensions(
 		self, group_by_account=False, report_type=None, for_aggregation=False, get_opening_entries=False
 	):
 		"""Get balance for dimension-wise pl accounts"""
 
-		qb_dimension_fields = ["cost_center", "finance_book", "project"]
-
 		self.accounting_dimensions = get_accounting_dimensions()
-		for dimension in self.accounting_dimensions:
-			qb_dimension_fields.append(dimension)
+		qb_dimension_fields = self.get_dimension_fields()
 
 		if group_by_account:
 			qb_dimension_fields.append("account")
 
-		account_filters = {
-			"company": self.company,
-			"is_group": 0,
-		}
-
-		if report_type:
-			account_filters.update({"report_type": report_type})
-
-		accounts = frappe.get_all("Account", filters=account_filters, pluck="name")
-
 		gl_entry = frappe.qb.DocType("GL Entry")
-		query = frappe.qb.from_(gl_entry).select(gl_entry.account, gl_entry.account_currency)
+		account = frappe.qb.DocType("Account")
+		query = (
+			frappe.qb.from_(gl_entry)
+			.inner_join(account)
+			.on(account.name == gl_entry.account)
+			.select(gl_entry.account, gl_entry.account_currency)
+		)
 
 		if not for_aggregation:
 			query = query.select(
@@ -306,9 +339,15 @@ class PeriodClosingVoucher(AccountsController):
 		query = query.where(
 			(gl_entry.company == self.company)
 			& (gl_entry.is_cancelled == 0)
-			& (gl_entry.account.isin(accounts))
+			# leave out the entries of this voucher when resuming its processing
+			& (gl_entry.voucher_no != self.name)
+			& (account.company == self.company)
+			& (account.is_group == 0)
 		)
 
+		if report_type:
+			query = query.where(account.report_type == report_type)
+
 		if get_opening_entries:
 			query = query.where(
 				(  # noqa: UP034
@@ -332,21 +371,46 @@ class PeriodClosingVoucher(AccountsController):
 		return query.run(as_dict=1)
 
 
-def process_gl_and_closing_entries(gl_entries, closing_entries, voucher_name, company, closing_date):
+def process_gl_and_closing_entries(voucher_name, get_opening_entries=False, commit=False):
+	"""Post the GL Entries and Account Closing Balances of a Period Closing Voucher.
+
+	GL Entries already posted for the voucher are kept, so a failed run can be resumed.
+	With `commit`, as in background jobs, the GL Entries are committed before the
+	closing balances are made."""
 	from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
 		make_closing_entries,
 	)
 	from erpnext.accounts.general_ledger import make_gl_entries
 
 	try:
-		if gl_entries:
+		pcv = frappe.get_doc("Period Closing Voucher", voucher_name)
+
+		gl_entries = pcv.get_gl_entries()
+		if gl_entries and not frappe.db.exists(
+			"GL Entry", {"voucher_type": pcv.doctype, "voucher_no": pcv.name, "is_cancelled": 0}
+		):
 			make_gl_entries(gl_entries, merge_entries=False)
-		make_closing_entries(gl_entries + closing_entries, voucher_name, company, closing_date)
+			if commit:
+				frappe.db.commit()
+
+		# closing balances of an interrupted run are made again
+		delete_closing_entries(pcv.name)
+		make_closing_entries(
+			gl_entries + pcv.get_grouped_gl_entries(get_opening_entries=get_opening_entries),
+			pcv.name,
+			pcv.company,
+			pcv.posting_date,
+			publish_progress=commit,
+		)
 		frappe.db.set_value("Period Closing Voucher", voucher_name, "gle_processing_status", "Completed")
 	except Exception as e:
 		frappe.db.rollback()
 		frappe.log_error(e)
-		frappe.db.set_value("Period Closing Voucher", voucher_name, "gle_processing_status", "Failed")
+		frappe.db.set_value(
+			"Period Closing Voucher",
+			voucher_name,
+			{"gle_processing_status": "Failed", "error_message": frappe.get_traceback()},
+		)
 
 
 def process_cancellation(voucher_type, voucher_no):
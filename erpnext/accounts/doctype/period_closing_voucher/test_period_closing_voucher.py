@@ -9,6 +9,9 @@ from frappe.utils import add_months, today
 
 from erpnext.accounts.doctype.finance_book.test_finance_book import create_finance_book
 from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.doctype.period_closing_voucher.period_closing_voucher import (
+	process_gl_and_closing_entries,
+)
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.accounts.utils import get_fiscal_year
 
@@ -316,6 +319,58 @@ class TestPeriodClosingVoucher(unittest.TestCase):
 		self.assertEqual(cc2_closing_balance.credit, 500)
 		self.assertEqual(cc2_closing_balance.credit_in_account_currency, 500)
 
+	def test_resume_gle_processing(self):
+		frappe.db.sql("delete from `tabGL Entry` where company='Test PCV Company'")
+		frappe.db.sql("delete from `tabPeriod Closing Voucher` where company='Test PCV Company'")
+		frappe.db.sql("delete from `tabAccount Closing Balance` where company='Test PCV Company'")
+
+		company = create_company()
+		cost_center = create_cost_center("Test Cost Center 1")
+
+		jv = make_journal_entry(
+			posting_date="2021-03-15",
+			amount=400,
+			account1="Cash - TPC",
+			account2="Sales - TPC",
+			cost_center=cost_center,
+			save=False,
+		)
+		jv.company = company
+		jv.save()
+		jv.submit()
+
+		pcv = self.make_period_closing_voucher(posting_date="2021-03-31")
+
+		def get_closing_balances():
+			return [
+				tuple(d)
+				for d in frappe.get_all(
+					"Account Closing Balance",
+					filters={"period_closing_voucher": pcv.name},
+					fields=["account", "debit", "credit", "is_period_closing_voucher_entry", "docstatus"],
+					order_by="account, is_period_closing_voucher_entry",
+					as_list=1,
+				)
+			]
+
+		closing_balances = get_closing_balances()
+		self.assertIn(("Sales - TPC", 0.0, 400.0, 0, 1), closing_balances)
+		self.assertIn(("Sales - TPC", 400.0, 0.0, 1, 1), closing_balances)
+
+		# an interrupted run leaves the GL Entries without the closing balances
+		frappe.db.delete("Account Closing Balance", {"period_closing_voucher": pcv.name})
+		pcv.db_set("gle_processing_status", "Failed")
+
+		process_gl_and_closing_entries(pcv.name, get_opening_entries=True)
+
+		pcv.reload()
+		self.assertEqual(pcv.gle_processing_status, "Completed")
+		self.assertEqual(get_closing_balances(), closing_balances)
+		self.assertEqual(
+			frappe.db.count("GL Entry", {"voucher_no": pcv.name, "is_cancelled": 0}),
+			2,
+		)
+
 	def make_period_closing_voucher(self, posting_date=None, submit=True):
 		surplus_account = create_account()
 		cost_center = create_cost_center("Test Cost Center 1")
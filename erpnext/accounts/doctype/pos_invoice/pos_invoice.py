@@ -23,6 +23,10 @@ from erpnext.stock.doctype.serial_no.serial_no import (
 	get_pos_reserved_serial_nos,
 	get_serial_nos,
 )
+from erpnext.stock.doctype.serial_no_ledger_entry.serial_no_ledger_entry import (
+	delete_serial_no_ledger_entries,
+	make_pos_serial_no_ledger_entries,
+)
 
 
 class POSInvoice(SalesInvoice):
@@ -73,6 +77,7 @@ class POSInvoice(SalesInvoice):
 			self.apply_loyalty_points()
 		self.check_phone_payments()
 		self.set_status(update=True)
+		make_pos_serial_no_ledger_entries(self)
 
 		if self.coupon_code:
 			from erpnext.accounts.doctype.pricing_rule.utils import update_coupon_code_count
@@ -109,6 +114,8 @@ class POSInvoice(SalesInvoice):
 			against_psi_doc.delete_loyalty_point_entry()
 			against_psi_doc.make_loyalty_point_entry()
 
+		delete_serial_no_ledger_entries(self.doctype, self.name)
+
 		if self.coupon_code:
 			from erpnext.accounts.doctype.pricing_rule.utils import update_coupon_code_count
 
@@ -318,19 +325,9 @@ class POSInvoice(SalesInvoice):
 			if d.get("serial_no"):
 				serial_nos = get_serial_nos(d.serial_no)
 				for sr in serial_nos:
-					serial_no_exists = frappe.db.sql(
-						"""
-						SELECT name
-						FROM `tabPOS Invoice Item`
-						WHERE
-							parent = %s
-							and (serial_no = %s
-								or serial_no like %s
-								or serial_no like %s
-								or serial_no like %s
-							)
-					""",
-						(self.return_against, sr, sr + "\n%", "%\n" + sr, "%\n" + sr + "\n%"),
+					serial_no_exists = frappe.db.exists(
+						"Serial No Ledger Entry",
+						{"voucher_type": "POS Invoice", "voucher_no": self.return_against, "serial_no": sr},
 					)
 
 					if not serial_no_exists:
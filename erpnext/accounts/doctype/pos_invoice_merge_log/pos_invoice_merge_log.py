@@ -87,26 +87,22 @@ class POSInvoiceMergeLog(Document):
 					frappe.throw(msg)
 
 	def on_submit(self):
-		pos_invoice_docs = [frappe.get_cached_doc("POS Invoice", d.pos_invoice) for d in self.pos_invoices]
-
-		returns = [d for d in pos_invoice_docs if d.get("is_return") == 1]
-		sales = [d for d in pos_invoice_docs if d.get("is_return") == 0]
+		returns = [d.pos_invoice for d in self.pos_invoices if d.get("is_return") == 1]
+		sales = [d.pos_invoice for d in self.pos_invoices if d.get("is_return") == 0]
 
 		sales_invoice, credit_note = "", ""
 		if returns:
-			credit_note = self.process_merging_into_credit_note(returns)
+			credit_note = self.process_merging_into_credit_note(get_pos_invoice_docs(returns))
 
 		if sales:
-			sales_invoice = self.process_merging_into_sales_invoice(sales)
+			sales_invoice = self.process_merging_into_sales_invoice(get_pos_invoice_docs(sales))
 
 		self.save()  # save consolidated_sales_invoice & consolidated_credit_note ref in merge log
 
-		self.update_pos_invoices(pos_invoice_docs, sales_invoice, credit_note)
+		self.update_pos_invoices([d.pos_invoice for d in self.pos_invoices], sales_invoice, credit_note)
 
 	def on_cancel(self):
-		pos_invoice_docs = [frappe.get_cached_doc("POS Invoice", d.pos_invoice) for d in self.pos_invoices]
-
-		self.update_pos_invoices(pos_invoice_docs)
+		self.update_pos_invoices([d.pos_invoice for d in self.pos_invoices])
 		self.cancel_linked_invoices()
 
 	def process_merging_into_sales_invoice(self, data):
@@ -146,6 +142,8 @@ class POSInvoiceMergeLog(Document):
 
 	def merge_pos_invoice_into(self, invoice, data):
 		items, payments, taxes = [], [], []
+		# merged rows by the fields a row of a later invoice has to match to be added to them
+		items_by_key, payments_by_key, taxes_by_key = {}, {}, {}
 
 		loyalty_amount_sum, loyalty_points_sum = 0, 0
 
@@ -164,24 +162,14 @@ class POSInvoiceMergeLog(Document):
 				loyalty_amount_sum += doc.loyalty_amount
 
 			for item in doc.get("items"):
-				found = False
-				for i in items:
-					if (
-						i.item_code == item.item_code
-						and not i.serial_no
-						and not i.batch_no
-						and i.uom == item.uom
-						and i.net_rate == item.net_rate
-						and i.warehouse == item.warehouse
-					):
-						found = True
-						i.qty = i.qty + item.qty
-						i.amount = i.amount + item.net_amount
-						i.net_amount = i.amount
-						i.base_amount = i.base_amount + item.base_net_amount
-						i.base_net_amount = i.base_amount
-
-				if not found:
+				key = (item.item_code, item.uom, item.net_rate, item.warehouse)
+				if i := items_by_key.get(key):
+					i.qty = i.qty + item.qty
+					i.amount = i.amount + item.net_amount
+					i.net_amount = i.amount
+					i.base_amount = i.base_amount + item.base_net_amount
+					i.base_net_amount = i.base_amount
+				else:
 					item.rate = item.net_rate
 					item.amount = item.net_amount
 					item.base_amount = item.base_net_amount
@@ -189,17 +177,19 @@ class POSInvoiceMergeLog(Document):
 					si_item = map_child_doc(item, invoice, {"doctype": "Sales Invoice Item"})
 					items.append(si_item)
 
+					# rows with serial or batch nos are kept as they are
+					if not si_item.serial_no and not si_item.batch_no:
+						items_by_key[key] = si_item
+
 			for tax in doc.get("taxes"):
-				found = False
-				for t in taxes:
-					if t.account_head == tax.account_head and t.cost_center == tax.cost_center:
-						t.tax_amount = flt(t.tax_amount) + flt(tax.tax_amount_after_discount_amount)
-						t.base_tax_amount = flt(t.base_tax_amount) + flt(
-							tax.base_tax_amount_after_discount_amount
-						)
-						update_item_wise_tax_detail(t, tax)
-						found = True
-				if not found:
+				key = (tax.account_head, tax.cost_center)
+				if t := taxes_by_key.get(key):
+					t.tax_amount = flt(t.tax_amount) + flt(tax.tax_amount_after_discount_amount)
+					t.base_tax_amount = flt(t.base_tax_amount) + flt(
+						tax.base_tax_amount_after_discount_amount
+					)
+					update_item_wise_tax_detail(t, tax)
+				else:
 					tax.charge_type = "Actual"
 					tax.idx = idx
 					idx += 1
@@ -208,16 +198,16 @@ class POSInvoiceMergeLog(Document):
 					tax.base_tax_amount = tax.base_tax_amount_after_discount_amount
 					tax.item_wise_tax_detail = tax.item_wise_tax_detail
 					taxes.append(tax)
+					taxes_by_key[key] = tax
 
 			for payment in doc.get("payments"):
-				found = False
-				for pay in payments:
-					if pay.account == payment.account and pay.mode_of_payment == payment.mode_of_payment:
-						pay.amount = flt(pay.amount) + flt(payment.amount)
-						pay.base_amount = flt(pay.base_amount) + flt(payment.base_amount)
-						found = True
-				if not found:
+				key = (payment.account, payment.mode_of_payment)
+				if pay := payments_by_key.get(key):
+					pay.amount = flt(pay.amount) + flt(payment.amount)
+					pay.base_amount = flt(pay.base_amount) + flt(payment.base_amount)
+				else:
 					payments.append(payment)
+					payments_by_key[key] = payment
 
 			rounding_adjustment += doc.rounding_adjustment
 			rounded_total += doc.rounded_total
@@ -258,9 +248,8 @@ class POSInvoiceMergeLog(Document):
 
 		return sales_invoice
 
-	def update_pos_invoices(self, invoice_docs, sales_invoice="", credit_note=""):
-		for doc in invoice_docs:
-			doc.load_from_db()
+	def update_pos_invoices(self, pos_invoices, sales_invoice="", credit_note=""):
+		for doc in get_pos_invoice_docs(pos_invoices):
 			doc.update(
 				{
 					"consolidated_invoice": None
@@ -280,6 +269,12 @@ class POSInvoiceMergeLog(Document):
 			si.cancel()
 
 
+def get_pos_invoice_docs(pos_invoices):
+	"""Load the POS Invoices one at a time instead of keeping all of them in the document cache"""
+	for pos_invoice in pos_invoices:
+		yield frappe.get_doc("POS Invoice", pos_invoice)
+
+
 def update_item_wise_tax_detail(consolidate_tax_row, tax_row):
 	consolidated_tax_detail = json.loads(consolidate_tax_row.item_wise_tax_detail)
 	tax_row_detail = json.loads(tax_row.item_wise_tax_detail)
@@ -412,10 +407,28 @@ def split_invoices(invoices):
 	return _invoices
 
 
+def chunk_invoices(invoice_groups):
+	"""
+	Splits every group of invoices into chunks of at most `Max POS Invoices per Consolidated Invoice`
+	invoices, each of which is merged into its own Sales Invoice and Credit Note.
+	Sales come before returns so that the original invoice of a return is consolidated first.
+	"""
+	chunk_size = cint(frappe.db.get_single_value("Accounts Settings", "max_pos_invoices_per_merge_log"))
+
+	for invoices in invoice_groups:
+		if not chunk_size or len(invoices) <= chunk_size:
+			yield invoices
+			continue
+
+		invoices = sorted(invoices, key=lambda d: cint(d.get("is_return")))
+		for i in range(0, len(invoices), chunk_size):
+			yield invoices[i : i + chunk_size]
+
+
 def create_merge_logs(invoice_by_customer, closing_entry=None):
 	try:
 		for customer, invoices in invoice_by_customer.items():
-			for _invoices in split_invoices(invoices):
+			for _invoices in chunk_invoices(split_invoices(invoices)):
 				merge_log = frappe.new_doc("POS Invoice Merge Log")
 				merge_log.posting_date = (
 					getdate(closing_entry.get("posting_date")) if closing_entry else nowdate()
@@ -441,3 +441,39 @@ class TestPOSInvoiceMergeLog(unittest.TestCase):
 			frappe.set_user("Administrator")
 			frappe.db.sql("delete from `tabPOS Profile`")
 			frappe.db.sql("delete from `tabPOS Invoice`")
+
+	@change_settings("Accounts Settings", {"max_pos_invoices_per_merge_log": 2})
+	def test_consolidation_split_by_max_invoices(self):
+		frappe.db.sql("delete from `tabPOS Invoice`")
+
+		try:
+			init_user_and_profile()
+
+			pos_invoices = []
+			for _ in range(3):
+				pos_inv = create_pos_invoice(rate=300, do_not_submit=1)
+				pos_inv.append(
+					"payments", {"mode_of_payment": "Cash", "account": "Cash - _TC", "amount": 300}
+				)
+				pos_inv.submit()
+				pos_invoices.append(pos_inv)
+
+			consolidate_pos_invoices()
+
+			for pos_inv in pos_invoices:
+				pos_inv.load_from_db()
+
+			self.assertEqual(pos_invoices[0].consolidated_invoice, pos_invoices[1].consolidated_invoice)
+			self.assertNotEqual(pos_invoices[1].consolidated_invoice, pos_invoices[2].consolidated_invoice)
+
+			# the rows of the same item and rate are merged into one
+			consolidated_invoice = frappe.get_doc("Sales Invoice", pos_invoices[0].consolidated_invoice)
+			self.assertEqual(len(consolidated_invoice.items), 1)
+			self.assertEqual(consolidated_invoice.items[0].qty, 2)
+			self.assertEqual(len(consolidated_invoice.payments), 1)
+			self.assertEqual(consolidated_invoice.payments[0].amount, 600)
+
+		finally:
+			frappe.set_user("Administrator")
+			frappe.db.sql("delete from `tabPOS Profile`")
+			frappe.db.sql("delete from `tabPOS Invoice`")
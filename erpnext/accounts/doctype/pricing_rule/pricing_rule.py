@@ -232,6 +232,8 @@ def apply_pricing_rule(args, doc=None):
 	}
 	"""
 
+	from erpnext.accounts.doctype.pricing_rule.utils import batch_pricing_rules
+
 	if isinstance(args, str):
 		args = json.loads(args)
 
@@ -264,19 +266,20 @@ def apply_pricing_rule(args, doc=None):
 	for item_code, val in query_items:
 		serialized_items.setdefault(item_code, val)
 
-	for item in item_list:
-		args_copy = copy.deepcopy(args)
-		args_copy.update(item)
-		data = get_pricing_rule_for_item(args_copy, doc=doc)
-		out.append(data)
-
-		if (
-			serialized_items.get(item.get("item_code"))
-			and not item.get("serial_no")
-			and set_serial_nos_based_on_fifo
-			and not args.get("is_return")
-		):
-			out[0].update(get_serial_no_for_item(args_copy))
+	with batch_pricing_rules(item_list):
+		for item in item_list:
+			args_copy = copy.deepcopy(args)
+			args_copy.update(item)
+			data = get_pricing_rule_for_item(args_copy, doc=doc)
+			out.append(data)
+
+			if (
+				serialized_items.get(item.get("item_code"))
+				and not item.get("serial_no")
+				and set_serial_nos_based_on_fifo
+				and not args.get("is_return")
+			):
+				out[0].update(get_serial_no_for_item(args_copy))
 
 	return out
 
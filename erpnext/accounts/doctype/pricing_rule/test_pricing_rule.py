@@ -1258,6 +1258,46 @@ class TestPricingRule(FrappeTestCase):
 		debit_note.delete()
 		pi.cancel()
 
+	def test_pricing_rules_resolved_for_all_items_together(self):
+		from erpnext.accounts.doctype.pricing_rule.pricing_rule import apply_pricing_rule
+
+		make_pricing_rule(
+			selling=1, item_code="_Test Item", discount_percentage=10, title="_Test Pricing Rule"
+		)
+		make_pricing_rule(
+			selling=1, item_code="_Test Item 2", discount_percentage=20, title="_Test Pricing Rule 2"
+		)
+		make_pricing_rule(
+			selling=1,
+			apply_on="Item Group",
+			item_group="_Test Item Group",
+			discount_percentage=5,
+			priority=2,
+			title="_Test Pricing Rule 3",
+		)
+
+		args = {
+			"customer": "_Test Customer",
+			"company": "_Test Company",
+			"price_list": "_Test Price List",
+			"currency": "_Test Currency",
+			"doctype": "Sales Order",
+			"transaction_date": frappe.utils.nowdate(),
+			"conversion_rate": 1,
+			"plc_conversion_rate": 1,
+		}
+		items = [
+			{"doctype": "Sales Order Item", "name": f"row-{idx}", "item_code": item_code, "qty": 1}
+			for idx, item_code in enumerate(["_Test Item", "_Test Item 2", "_Test Item Home Desktop 100"])
+		]
+
+		batched = apply_pricing_rule({**args, "items": items})
+		row_wise = [apply_pricing_rule({**args, "items": [item]})[0] for item in items]
+
+		self.assertEqual(batched, row_wise)
+		self.assertEqual(batched[0].discount_percentage, 10)
+		self.assertEqual(batched[1].discount_percentage, 20)
+
 
 test_dependencies = ["Campaign"]
 
@@ -7,6 +7,7 @@
 import copy
 import json
 import math
+from contextlib import contextmanager
 
 import frappe
 from frappe import _, bold
@@ -84,10 +85,14 @@ def sorted_by_priority(pricing_rules, args, doc=None):
 def filter_pricing_rule_based_on_condition(pricing_rules, doc=None):
 	filtered_pricing_rules = []
 	if doc:
+		doc_dict = None
 		for pricing_rule in pricing_rules:
 			if pricing_rule.condition:
+				if doc_dict is None:
+					doc_dict = doc.as_dict()
+
 				try:
-					if frappe.safe_eval(pricing_rule.condition, None, doc.as_dict()):
+					if frappe.safe_eval(pricing_rule.condition, None, doc_dict):
 						filtered_pricing_rules.append(pricing_rule)
 				except Exception:
 					pass
@@ -128,14 +133,19 @@ def _get_pricing_rules(apply_on, args, values):
 	elif apply_on_field == "item_group":
 		item_conditions = _get_tree_conditions(args, "Item Group", child_doc, False)
 
+	if not args.price_list:
+		args.price_list = None
+
+	if frappe.flags.pricing_rule_batch:
+		pricing_rules = get_pricing_rules_from_batch(apply_on, args)
+		if pricing_rules is not None:
+			return pricing_rules
+
 	conditions += get_other_conditions(conditions, values, args)
 	warehouse_conditions = _get_tree_conditions(args, "Warehouse", "`tabPricing Rule`")
 	if warehouse_conditions:
 		warehouse_conditions = f" and {warehouse_conditions}"
 
-	if not args.price_list:
-		args.price_list = None
-
 	conditions += " and ifnull(`tabPricing Rule`.for_price_list, '') in (%(price_list)s, '')"
 	values["price_list"] = args.get("price_list")
 
@@ -190,29 +200,7 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 		if key in frappe.flags.tree_conditions:
 			return frappe.flags.tree_conditions[key]
 
-		try:
-			lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
-		except TypeError:
-			frappe.throw(_("Invalid {0}").format(args.get(field)))
-
-		parent_groups = frappe.db.sql_list(
-			"""select name from `tab{}`
-			where lft<={} and rgt>={}""".format(parenttype, "%s", "%s"),
-			(lft, rgt),
-		)
-
-		if parenttype in ["Customer Group", "Item Group", "Territory"]:
-			parent_field = f"parent_{frappe.scrub(parenttype)}"
-			root_name = frappe.db.get_list(
-				parenttype,
-				{"is_group": 1, parent_field: ("is", "not set")},
-				"name",
-				as_list=1,
-				ignore_permissions=True,
-			)
-
-			if root_name and root_name[0][0]:
-				parent_groups.append(root_name[0][0])
+		parent_groups = get_tree_parents(parenttype, args.get(field))
 
 		if parent_groups:
 			if allow_blank:
@@ -225,6 +213,187 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 	return condition
 
 
+def get_tree_parents(parenttype, name):
+	try:
+		lft, rgt = frappe.db.get_value(parenttype, name, ["lft", "rgt"])
+	except TypeError:
+		frappe.throw(_("Invalid {0}").format(name))
+
+	parent_groups = frappe.db.sql_list(
+		"""select name from `tab{}`
+		where lft<={} and rgt>={}""".format(parenttype, "%s", "%s"),
+		(lft, rgt),
+	)
+
+	if parenttype in ["Customer Group", "Item Group", "Territory"]:
+		parent_field = f"parent_{frappe.scrub(parenttype)}"
+		root_name = frappe.db.get_list(
+			parenttype,
+			{"is_group": 1, parent_field: ("is", "not set")},
+			"name",
+			as_list=1,
+			ignore_permissions=True,
+		)
+
+		if root_name and root_name[0][0]:
+			parent_groups.append(root_name[0][0])
+
+	return parent_groups
+
+
+@contextmanager
+def batch_pricing_rules(items):
+	"""Fetch the pricing rules for all `items` of a transaction together.
+
+	Within the block, `_get_pricing_rules` runs one query per apply on type for the whole
+	transaction and matches each row against the fetched rules in memory. Rows with values
+	outside of `items` (e.g. free items added on the way) still query the database."""
+	if frappe.flags.pricing_rule_batch is not None or len(items) < 2:
+		yield
+		return
+
+	item_codes = {d.get("item_code") for d in items if d.get("item_code")}
+	item_groups = {d.get("item_group") for d in items if d.get("item_group")}
+	brands = {d.get("brand") for d in items if d.get("brand")}
+
+	for item in frappe.get_all(
+		"Item",
+		filters={"name": ("in", list(item_codes))},
+		fields=["variant_of", "item_group", "brand"],
+	):
+		item_codes.add(item.variant_of)
+		item_groups.add(item.item_group)
+		brands.add(item.brand)
+
+	tree_parents = {}
+	for item_group in list(filter(None, item_groups)):
+		tree_parents[("Item Group", item_group)] = get_tree_parents("Item Group", item_group)
+		item_groups.update(tree_parents[("Item Group", item_group)])
+
+	frappe.flags.pricing_rule_batch = frappe._dict(
+		values={"item_code": item_codes, "item_group": item_groups, "brand": brands},
+		tree_parents=tree_parents,
+		pricing_rules={},
+	)
+
+	try:
+		yield
+	finally:
+		frappe.flags.pricing_rule_batch = None
+
+
+def get_pricing_rules_from_batch(apply_on, args):
+	"""Pricing rules for one row matched in memory, in the same order and with the same conditions
+	as the query in `_get_pricing_rules`. Returns None if the row is not covered by the batch."""
+	batch = frappe.flags.pricing_rule_batch
+	apply_on_field = frappe.scrub(apply_on)
+	other_field = f"other_{apply_on_field}"
+	value = args.get(apply_on_field)
+
+	def get_tree_parents_for_batch(parenttype, name):
+		if (parenttype, name) not in batch.tree_parents:
+			batch.tree_parents[(parenttype, name)] = get_tree_parents(parenttype, name)
+		return batch.tree_parents[(parenttype, name)]
+
+	if apply_on_field == "item_code":
+		required_values = {value, args.variant_of} - {None}
+	elif apply_on_field == "item_group":
+		required_values = {value, *get_tree_parents_for_batch("Item Group", value)}
+	else:
+		required_values = {value}
+
+	if not required_values.issubset(batch.values[apply_on_field]):
+		return None
+
+	key = (
+		apply_on,
+		args.transaction_type,
+		args.price_list,
+		*(
+			args.get(field)
+			for field in (
+				"doctype",
+				"transaction_date",
+				"company",
+				"customer",
+				"supplier",
+				"campaign",
+				"sales_partner",
+				"customer_group",
+				"territory",
+				"supplier_group",
+			)
+		),
+	)
+	if key not in batch.pricing_rules:
+		batch.pricing_rules[key] = get_pricing_rules_for_values(
+			apply_on, args, list(filter(None, batch.values[apply_on_field]))
+		)
+
+	warehouses = None
+	if args.get("warehouse"):
+		warehouses = get_tree_parents_for_batch("Warehouse", args.warehouse)
+		if warehouses:
+			warehouses = set(warehouses) | {""}
+
+	item_groups = required_values if apply_on_field == "item_group" else None
+
+	pricing_rules = []
+	for pricing_rule in batch.pricing_rules[key]:
+		if warehouses and (pricing_rule.warehouse or "") not in warehouses:
+			continue
+
+		row_value = pricing_rule.get(apply_on_field)
+		if apply_on_field == "item_code":
+			matched = (
+				row_value == value and (not args.get("uom") or (pricing_rule.uom or "") in (args.uom, ""))
+			) or (args.variant_of and row_value == args.variant_of)
+		elif apply_on_field == "item_group":
+			matched = (row_value or "") in item_groups
+		else:
+			matched = row_value == value
+
+		if matched or (
+			pricing_rule.apply_rule_on_other is not None and pricing_rule.get(other_field) == value
+		):
+			pricing_rules.append(frappe._dict(pricing_rule))
+
+	return pricing_rules
+
+
+def get_pricing_rules_for_values(apply_on, args, apply_on_values):
+	apply_on_field = frappe.scrub(apply_on)
+	child_doc = f"`tabPricing Rule {apply_on}`"
+
+	if not apply_on_values:
+		return []
+
+	values = {"apply_on_values": tuple(apply_on_values), "price_list": args.get("price_list")}
+	conditions = get_other_conditions("", values, args)
+	conditions += " and ifnull(`tabPricing Rule`.for_price_list, '') in (%(price_list)s, '')"
+
+	return frappe.db.sql(
+		"""select `tabPricing Rule`.*,
+			{child_doc}.{apply_on_field}, {child_doc}.uom
+		from `tabPricing Rule`, {child_doc}
+		where ({child_doc}.{apply_on_field} in %(apply_on_values)s
+			or `tabPricing Rule`.{apply_on_other_field} in %(apply_on_values)s)
+			and {child_doc}.parent = `tabPricing Rule`.name
+			and `tabPricing Rule`.disable = 0 and
+			`tabPricing Rule`.{transaction_type} = 1 {conditions}
+		order by `tabPricing Rule`.priority desc,
+			`tabPricing Rule`.name desc""".format(
+			child_doc=child_doc,
+			apply_on_field=apply_on_field,
+			transaction_type=args.transaction_type,
+			apply_on_other_field=f"other_{apply_on_field}",
+			conditions=conditions,
+		),
+		values,
+		as_dict=1,
+	)
+
+
 def get_other_conditions(conditions, values, args):
 	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
 		if args.get(field):
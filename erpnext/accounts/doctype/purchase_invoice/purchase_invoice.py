@@ -10,6 +10,7 @@ from frappe.utils import cint, cstr, flt, formatdate, get_link_to_form, getdate,
 
 import erpnext
 from erpnext.accounts.deferred_revenue import validate_service_stop_date
+from erpnext.accounts.doctype.gl_period_balance.gl_period_balance import reverse_gl_period_balances
 from erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger import (
 	validate_docs_for_deferred_accounting,
 	validate_docs_for_voucher_types,
@@ -651,6 +652,13 @@ class PurchaseInvoice(BuyingController):
 
 		if rows:
 			# cancel gl entries
+			reverse_gl_period_balances(
+				{
+					"voucher_type": "Purchase Receipt",
+					"voucher_no": ["in", list(purchase_receipts)],
+					"voucher_detail_no": ["in", list(rows)],
+				}
+			)
 			gle = qb.DocType("GL Entry")
 			gle_update_query = (
 				qb.update(gle)
@@ -0,0 +1,119 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import today
+
+from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
+from erpnext.accounts.doctype.payment_entry.test_payment_entry import create_payment_entry
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	is_voucher_outstanding_enabled,
+	rebuild_voucher_outstandings,
+)
+from erpnext.accounts.party import get_dashboard_info
+from erpnext.accounts.report.accounts_receivable.accounts_receivable import execute
+from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
+
+
+class TestVoucherOutstanding(AccountsTestMixin, FrappeTestCase):
+	def setUp(self):
+		self.create_company()
+		self.create_customer()
+		self.create_item()
+		self.clear_old_entries()
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def make_sales_invoice(self, **args):
+		return create_sales_invoice(
+			item=self.item,
+			company=self.company,
+			customer=self.customer,
+			debit_to=self.debit_to,
+			cost_center=self.cost_center,
+			rate=100,
+			**args,
+		)
+
+	@change_settings("Accounts Settings", {"maintain_voucher_outstanding": 1})
+	def test_report_matches_payment_ledger(self):
+		si = self.make_sales_invoice(qty=3)
+		credit_note = self.make_sales_invoice(qty=-1, is_return=1, return_against=si.name, do_not_submit=1)
+		credit_note.update_outstanding_for_self = 0
+		credit_note.submit()
+
+		pe = get_payment_entry(si.doctype, si.name, bank_account=self.cash, party_amount=50)
+		pe.submit()
+
+		advance = create_payment_entry(
+			company=self.company,
+			payment_type="Receive",
+			party_type="Customer",
+			party=self.customer,
+			paid_from=self.debit_to,
+			paid_to=self.cash,
+			paid_amount=80,
+			save=1,
+			submit=1,
+		)
+
+		filters = {
+			"company": self.company,
+			"party_type": "Customer",
+			"party": [self.customer],
+			"report_date": today(),
+			"range1": 30,
+			"range2": 60,
+			"range3": 90,
+			"range4": 120,
+		}
+
+		def get_outstanding():
+			report = execute(filters)[1]
+			rows = sorted(
+				(row.voucher_no, row.invoiced, row.paid, row.credit_note, row.outstanding) for row in report
+			)
+			dashboard = [
+				(d["company"], d["total_unpaid"]) for d in get_dashboard_info("Customer", self.customer)
+			]
+			return rows, dashboard
+
+		def assert_outstanding_matches_ledger():
+			from_outstanding = get_outstanding()
+
+			frappe.db.set_single_value("Accounts Settings", "maintain_voucher_outstanding", 0)
+			from_ledger = get_outstanding()
+			frappe.db.set_single_value("Accounts Settings", "maintain_voucher_outstanding", 1)
+
+			self.assertEqual(from_outstanding, from_ledger)
+			return from_outstanding[0]
+
+		rows = assert_outstanding_matches_ledger()
+		self.assertIn((si.name, 300.0, 50.0, 100.0, 150.0), rows)
+		self.assertIn((advance.name, 0.0, 80.0, 0.0, -80.0), rows)
+
+		pe.cancel()
+		rows = assert_outstanding_matches_ledger()
+		self.assertIn((si.name, 300.0, 0.0, 100.0, 200.0), rows)
+
+	def test_outstandings_are_read_once_rebuilt(self):
+		frappe.db.set_single_value(
+			"Accounts Settings", {"maintain_voucher_outstanding": 1, "voucher_outstandings_rebuilt": 0}
+		)
+		si = self.make_sales_invoice(qty=2)
+
+		# entries are maintained before the rebuild, but only read once it has finished
+		self.assertTrue(frappe.db.exists("Voucher Outstanding", {"voucher_no": si.name}))
+		self.assertFalse(is_voucher_outstanding_enabled())
+
+		rebuild_voucher_outstandings(self.company)
+		self.assertFalse(is_voucher_outstanding_enabled())
+
+		rebuild_voucher_outstandings()
+		self.assertTrue(is_voucher_outstanding_enabled())
+		self.assertEqual(
+			frappe.db.get_value("Voucher Outstanding", {"voucher_no": si.name}, "outstanding"), 200
+		)
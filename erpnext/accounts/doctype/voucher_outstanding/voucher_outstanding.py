@@ -0,0 +1,384 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import qb
+from frappe.model.document import Document
+from frappe.query_builder import Tuple
+from frappe.utils import cint, flt, now
+
+BALANCE_FIELDS = (
+	"invoiced",
+	"paid",
+	"credit_note",
+	"invoiced_in_account_currency",
+	"paid_in_account_currency",
+	"credit_note_in_account_currency",
+)
+
+PLE_FIELDS = (
+	"company",
+	"account",
+	"account_type",
+	"party_type",
+	"party",
+	"voucher_type",
+	"voucher_no",
+	"against_voucher_type",
+	"against_voucher_no",
+	"posting_date",
+	"cost_center",
+	"account_currency",
+	"amount",
+	"amount_in_account_currency",
+	"remarks",
+)
+
+
+class VoucherOutstanding(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Voucher Outstanding", ["company", "party_type", "party"])
+	frappe.db.add_index("Voucher Outstanding", ["voucher_no", "voucher_type"])
+
+
+def is_voucher_outstanding_enabled():
+	"""Whether outstandings can be read from Voucher Outstanding, which is once it has been rebuilt"""
+	return is_voucher_outstanding_maintained() and cint(
+		frappe.db.get_single_value("Accounts Settings", "voucher_outstandings_rebuilt")
+	)
+
+
+def is_voucher_outstanding_maintained():
+	return cint(frappe.db.get_single_value("Accounts Settings", "maintain_voucher_outstanding"))
+
+
+def update_voucher_outstandings(ple_entries):
+	"""Refresh the outstanding of the vouchers and against vouchers of the given Payment Ledger Entries"""
+	if not ple_entries or not is_voucher_outstanding_maintained():
+		return
+
+	refresh_voucher_outstandings(get_ple_vouchers(ple_entries))
+
+
+def lock_voucher_outstandings(ple_entries):
+	"""Lock the outstanding rows of the vouchers of Payment Ledger Entries about to be posted,
+	so that postings against the same vouchers refresh them one after the other"""
+	if not ple_entries or not is_voucher_outstanding_maintained():
+		return
+
+	vouchers = [voucher for voucher in get_ple_vouchers(ple_entries) if voucher[0] and voucher[1]]
+	if vouchers:
+		outstanding = qb.DocType("Voucher Outstanding")
+		qb.from_(outstanding).select(outstanding.name).where(
+			Tuple(outstanding.voucher_type, outstanding.voucher_no).isin(vouchers)
+		).for_update().run()
+
+
+def get_ple_vouchers(ple_entries):
+	vouchers = set()
+	for ple in ple_entries:
+		vouchers.add((ple.voucher_type, ple.voucher_no))
+		vouchers.add((ple.against_voucher_type, ple.against_voucher_no))
+
+	return vouchers
+
+
+def get_payment_ledger_vouchers(criterion):
+	"""Vouchers and against vouchers of the Payment Ledger Entries matching `criterion`,
+	collected before the entries are relinked or deleted"""
+	if not is_voucher_outstanding_maintained():
+		return set()
+
+	ple = qb.DocType("Payment Ledger Entry")
+	vouchers = set()
+	for voucher_type, voucher_no, against_voucher_type, against_voucher_no in (
+		qb.from_(ple)
+		.select(ple.voucher_type, ple.voucher_no, ple.against_voucher_type, ple.against_voucher_no)
+		.where(criterion)
+		.distinct()
+		.run()
+	):
+		vouchers.add((voucher_type, voucher_no))
+		vouchers.add((against_voucher_type, against_voucher_no))
+
+	return vouchers
+
+
+def refresh_voucher_outstandings(vouchers):
+	"""Recompute the outstanding rows of `vouchers`, a set of (voucher_type, voucher_no), from the
+	active Payment Ledger Entries allocated to them.
+
+	Entries are allocated the way the Accounts Receivable / Payable report does: to their against
+	voucher, to the invoice a return was made against, or to their own voucher if the against voucher
+	has no entry of its own (like a payment against a Sales Order).
+
+	The rows are locked first and the entries are read with locking reads, which see the entries
+	committed by concurrent postings, so that the last refresh of a voucher includes all of them."""
+	vouchers = {voucher for voucher in vouchers if voucher[0] and voucher[1]}
+	if not vouchers or not is_voucher_outstanding_maintained():
+		return
+
+	ple = qb.DocType("Payment Ledger Entry")
+	outstanding = qb.DocType("Voucher Outstanding")
+	qb.from_(outstanding).select(outstanding.name).where(
+		Tuple(outstanding.voucher_type, outstanding.voucher_no).isin(list(vouchers))
+	).for_update().run()
+
+	# a voucher and its returns share a row, and a voucher gaining or losing its own entries
+	# moves the entries allocated to it between its row and the rows of their own vouchers
+	returns = get_return_against(vouchers)
+	vouchers |= set(returns) | set(returns.values())
+	vouchers |= set(
+		qb.from_(ple)
+		.select(ple.voucher_type, ple.voucher_no)
+		.where(
+			(ple.delinked == 0) & Tuple(ple.against_voucher_type, ple.against_voucher_no).isin(list(vouchers))
+		)
+		.for_update()
+		.run()
+	)
+
+	returns = get_return_against(vouchers)
+	against_vouchers = vouchers | set(returns)
+	ple_entries = (
+		qb.from_(ple)
+		.select(*PLE_FIELDS)
+		.where(
+			(ple.delinked == 0)
+			& (
+				Tuple(ple.voucher_type, ple.voucher_no).isin(list(vouchers))
+				| Tuple(ple.against_voucher_type, ple.against_voucher_no).isin(list(against_vouchers))
+			)
+		)
+		.orderby(ple.posting_date)
+		.orderby(ple.creation)
+		.for_update()
+		.run(as_dict=True)
+	)
+
+	returns.update(get_return_against({(d.against_voucher_type, d.against_voucher_no) for d in ple_entries}))
+
+	# rows of vouchers outside the refreshed set which entries of the set may be allocated to
+	other_vouchers = {
+		returns.get(
+			(d.against_voucher_type, d.against_voucher_no), (d.against_voucher_type, d.against_voucher_no)
+		)
+		for d in ple_entries
+	} - vouchers
+	other_rows = set()
+	if other_vouchers:
+		other_rows = set(
+			qb.from_(ple)
+			.select(ple.account, ple.party_type, ple.party, ple.voucher_type, ple.voucher_no)
+			.where((ple.delinked == 0) & Tuple(ple.voucher_type, ple.voucher_no).isin(list(other_vouchers)))
+			.for_update()
+			.run()
+		)
+
+	rows = build_voucher_outstandings(ple_entries, vouchers, returns, other_rows)
+
+	qb.from_(outstanding).delete().where(
+		Tuple(outstanding.voucher_type, outstanding.voucher_no).isin(list(vouchers))
+	).run()
+	insert_voucher_outstandings(rows)
+
+
+def build_voucher_outstandings(ple_entries, vouchers, returns, other_rows=None):
+	"""Outstanding rows of `vouchers` keyed by (account, party_type, party, voucher_type, voucher_no).
+	`ple_entries` must be ordered by posting date and contain every active entry allocated to them."""
+	rows = {}
+	for ple in ple_entries:
+		if (ple.voucher_type, ple.voucher_no) not in vouchers:
+			continue
+
+		key = (ple.account, ple.party_type, ple.party, ple.voucher_type, ple.voucher_no)
+		if key not in rows:
+			rows[key] = frappe._dict(
+				company=ple.company,
+				account=ple.account,
+				account_type=ple.account_type,
+				party_type=ple.party_type,
+				party=ple.party,
+				voucher_type=ple.voucher_type,
+				voucher_no=ple.voucher_no,
+				posting_date=ple.posting_date,
+				last_posting_date=ple.posting_date,
+				account_currency=ple.account_currency,
+				remarks=ple.remarks,
+				**dict.fromkeys(BALANCE_FIELDS, 0.0),
+			)
+
+		if ple.voucher_type == ple.against_voucher_type and ple.voucher_no == ple.against_voucher_no:
+			rows[key].cost_center = ple.cost_center
+
+	for ple in ple_entries:
+		against_voucher = (ple.against_voucher_type, ple.against_voucher_no)
+		key = (ple.account, ple.party_type, ple.party, *returns.get(against_voucher, against_voucher))
+		if key not in rows and key not in (other_rows or ()):
+			key = (ple.account, ple.party_type, ple.party, ple.voucher_type, ple.voucher_no)
+
+		row = rows.get(key)
+		if not row:
+			# allocated to a voucher outside the refreshed set
+			continue
+
+		amount, amount_in_account_currency = flt(ple.amount), flt(ple.amount_in_account_currency)
+		if amount > 0:
+			if (
+				ple.voucher_type in ("Journal Entry", "Payment Entry")
+				and ple.voucher_no != ple.against_voucher_no
+			):
+				fieldname, sign = "paid", -1
+			else:
+				fieldname, sign = "invoiced", 1
+		elif ple.voucher_type in ("Sales Invoice", "Purchase Invoice") and not (
+			row.voucher_no == ple.voucher_no == ple.against_voucher_no
+		):
+			fieldname, sign = "credit_note", -1
+		else:
+			fieldname, sign = "paid", -1
+
+		row[fieldname] += sign * amount
+		row[f"{fieldname}_in_account_currency"] += sign * amount_in_account_currency
+		row.last_posting_date = max(row.last_posting_date, ple.posting_date)
+
+	return list(rows.values())
+
+
+def get_return_against(vouchers):
+	"""Map the returns among or against `vouchers` that do not keep their own outstanding
+	to the invoice they were made against"""
+	returns = {}
+	for doctype in ("Sales Invoice", "Purchase Invoice"):
+		names = [voucher_no for voucher_type, voucher_no in vouchers if voucher_type == doctype]
+		if not names:
+			continue
+
+		for name, return_against in frappe.get_all(
+			doctype,
+			filters={"is_return": 1, "docstatus": 1, "update_outstanding_for_self": 0},
+			or_filters={"name": ("in", names), "return_against": ("in", names)},
+			fields=["name", "return_against"],
+			as_list=1,
+		):
+			if return_against:
+				returns[(doctype, name)] = (doctype, return_against)
+
+	return returns
+
+
+def insert_voucher_outstandings(rows):
+	timestamp, user = now(), frappe.session.user
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"company",
+		"account",
+		"account_type",
+		"party_type",
+		"party",
+		"voucher_type",
+		"voucher_no",
+		"posting_date",
+		"last_posting_date",
+		"cost_center",
+		"account_currency",
+		"remarks",
+		*BALANCE_FIELDS,
+		"outstanding",
+		"outstanding_in_account_currency",
+	]
+	values = [
+		(
+			frappe.generate_hash(length=10),
+			timestamp,
+			timestamp,
+			user,
+			user,
+			row.company,
+			row.account,
+			row.account_type,
+			row.party_type,
+			row.party,
+			row.voucher_type,
+			row.voucher_no,
+			row.posting_date,
+			row.last_posting_date,
+			row.cost_center,
+			row.account_currency,
+			row.remarks,
+			*(row[fieldname] for fieldname in BALANCE_FIELDS),
+			row.invoiced - row.paid - row.credit_note,
+			row.invoiced_in_account_currency
+			- row.paid_in_account_currency
+			- row.credit_note_in_account_currency,
+		)
+		for row in rows
+	]
+	frappe.db.bulk_insert("Voucher Outstanding", fields=fields, values=values)
+
+
+def rebuild_voucher_outstandings(company=None):
+	"""Rebuild the outstanding of every voucher from Payment Ledger Entry.
+
+	Runs when the feature is enabled in Accounts Settings and can be run manually with
+	`bench execute erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding.rebuild_voucher_outstandings`
+
+	Each company is rebuilt in its own transaction holding the lock on its rows, which postings
+	take as well before refreshing them. Outstandings are only read from Voucher Outstanding once
+	all companies have been rebuilt and committed.
+	"""
+	rebuild_all = not company
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+
+	for company in companies:
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+		# lock before reading the ledger, so that entries posted by others are either committed and
+		# read below or refreshed on the rebuilt rows once this transaction is committed
+		outstanding = qb.DocType("Voucher Outstanding")
+		qb.from_(outstanding).select(outstanding.name).where(
+			outstanding.company == company
+		).for_update().run()
+		frappe.db.delete("Voucher Outstanding", {"company": company})
+
+		ple_entries = frappe.get_all(
+			"Payment Ledger Entry",
+			filters={"company": company, "delinked": 0},
+			fields=list(PLE_FIELDS),
+			order_by="posting_date, creation",
+		)
+		vouchers = {(d.voucher_type, d.voucher_no) for d in ple_entries}
+
+		returns = {}
+		for doctype in ("Sales Invoice", "Purchase Invoice"):
+			for name, return_against in frappe.get_all(
+				doctype,
+				filters={
+					"company": company,
+					"is_return": 1,
+					"docstatus": 1,
+					"update_outstanding_for_self": 0,
+					"return_against": ("is", "set"),
+				},
+				fields=["name", "return_against"],
+				as_list=1,
+			):
+				returns[(doctype, name)] = (doctype, return_against)
+
+		insert_voucher_outstandings(build_voucher_outstandings(ple_entries, vouchers, returns))
+
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+	if rebuild_all and is_voucher_outstanding_maintained():
+		frappe.db.set_single_value("Accounts Settings", "voucher_outstandings_rebuilt", 1)
+		if not frappe.flags.in_test:
+			frappe.db.commit()
@@ -18,6 +18,10 @@ from erpnext.accounts.doctype.accounting_dimension_filter.accounting_dimension_f
 )
 from erpnext.accounts.doctype.accounting_period.accounting_period import ClosedAccountingPeriod
 from erpnext.accounts.doctype.budget.budget import validate_expense_against_budget
+from erpnext.accounts.doctype.gl_period_balance.gl_period_balance import (
+	reverse_gl_period_balances,
+	update_gl_period_balances,
+)
 from erpnext.accounts.utils import create_payment_ledger_entry
 from erpnext.exceptions import InvalidAccountDimensionError, MandatoryAccountDimensionError
 
@@ -381,7 +385,14 @@ def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
 
 	for entry in gl_map:
 		validate_allowed_dimensions(entry, dimension_filter_map)
-		make_entry(entry, adv_adj, update_outstanding, from_repost)
+
+	if len(gl_map) > 1 and cint(frappe.db.get_single_value("Accounts Settings", "post_gl_entries_in_bulk")):
+		make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost)
+	else:
+		for entry in gl_map:
+			make_entry(entry, adv_adj, update_outstanding, from_repost)
+
+	update_gl_period_balances(gl_map)
 
 
 def make_entry(args, adv_adj, update_outstanding, from_repost=False):
@@ -398,6 +409,59 @@ def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 		validate_expense_against_budget(args)
 
 
+def make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost=False):
+	"""Validate the GL Entries of a voucher in memory and insert them with one query.
+
+	Account level checks, outstanding updates and budget checks run once per account,
+	reference and budget dimensions instead of once per GL Entry."""
+	from erpnext.accounts.doctype.gl_entry.gl_entry import on_update_gl_entries
+
+	gl_entries = []
+	for args in gl_map:
+		gle = frappe.new_doc("GL Entry")
+		gle.update(args)
+		gle.flags.ignore_permissions = 1
+		gle.flags.from_repost = from_repost
+		gle.flags.adv_adj = adv_adj
+		gle.flags.update_outstanding = update_outstanding or "Yes"
+		gle.docstatus = 1
+		gle.set_new_name()
+		gle.set_user_and_timestamp()
+		gle.run_method("validate")
+		gl_entries.append(gle)
+
+	rows = [gle.get_valid_dict(convert_dates_to_str=True) for gle in gl_entries]
+	fields = list(rows[0])
+	frappe.db.bulk_insert("GL Entry", fields=fields, values=[[row.get(f) for f in fields] for row in rows])
+
+	on_update_gl_entries(gl_entries, adv_adj)
+
+	if not from_repost:
+		validate_expenses_against_budget(gl_map)
+
+
+def validate_expenses_against_budget(gl_map):
+	"""Budget check for each account and set of budget dimensions of the voucher"""
+	budget_fields = [
+		"account",
+		"company",
+		"posting_date",
+		"cost_center",
+		"project",
+		*get_accounting_dimensions(),
+	]
+
+	checked = set()
+	for args in gl_map:
+		if args.get("voucher_type") == "Period Closing Voucher":
+			continue
+
+		key = tuple(args.get(fieldname) for fieldname in budget_fields)
+		if key not in checked:
+			checked.add(key)
+			validate_expense_against_budget(args)
+
+
 def validate_cwip_accounts(gl_map):
 	"""Validate that CWIP account are not used in Journal Entry"""
 	if gl_map and gl_map[0].voucher_type != "Journal Entry":
@@ -680,6 +744,7 @@ def set_as_cancel(voucher_type, voucher_no):
 	"""
 	Set is_cancelled=1 in all original gl entries for the voucher
 	"""
+	reverse_gl_period_balances({"voucher_type": voucher_type, "voucher_no": voucher_no})
 	frappe.db.sql(
 		"""UPDATE `tabGL Entry` SET is_cancelled = 1,
 		modified=%s, modified_by=%s
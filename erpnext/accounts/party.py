@@ -7,6 +7,7 @@ from frappe import _, msgprint, qb, scrub
 from frappe.contacts.doctype.address.address import get_company_address, get_default_address
 from frappe.core.doctype.user_permission.user_permission import get_permitted_documents
 from frappe.model.utils import get_fetch_values
+from frappe.query_builder import Case
 from frappe.query_builder.functions import Abs, Count, Date, Sum
 from frappe.utils import (
 	add_days,
@@ -25,6 +26,7 @@ from frappe.utils import (
 
 import erpnext
 from erpnext import get_company_currency
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import is_voucher_outstanding_enabled
 from erpnext.accounts.utils import get_fiscal_year
 from erpnext.exceptions import InvalidAccountCurrency, PartyDisabled, PartyFrozen
 from erpnext.utilities.regional import temporary_flag
@@ -838,17 +840,7 @@ def get_dashboard_info(party_type, party, loyalty_program=None):
 			d.company, {"grand_total": d.grand_total, "base_grand_total": d.base_grand_total}
 		)
 
-	company_wise_total_unpaid = frappe._dict(
-		frappe.db.sql(
-			"""
-		select company, sum(debit_in_account_currency) - sum(credit_in_account_currency)
-		from `tabGL Entry`
-		where party_type = %s and party=%s
-		and is_cancelled = 0
-		group by company""",
-			(party_type, party),
-		)
-	)
+	company_wise_total_unpaid = get_company_wise_total_unpaid(party_type, party)
 
 	for d in companies:
 		company_default_currency = frappe.db.get_value("Company", d.company, "default_currency")
@@ -881,6 +873,38 @@ def get_dashboard_info(party_type, party, loyalty_program=None):
 	return company_wise_info
 
 
+def get_company_wise_total_unpaid(party_type, party):
+	"""Debit balance of the party in account currency per company"""
+	if is_voucher_outstanding_enabled():
+		outstanding = frappe.qb.DocType("Voucher Outstanding")
+		return frappe._dict(
+			frappe.qb.from_(outstanding)
+			.select(
+				outstanding.company,
+				Sum(
+					Case()
+					.when(outstanding.account_type == "Payable", -outstanding.outstanding_in_account_currency)
+					.else_(outstanding.outstanding_in_account_currency)
+				),
+			)
+			.where((outstanding.party_type == party_type) & (outstanding.party == party))
+			.groupby(outstanding.company)
+			.run()
+		)
+
+	return frappe._dict(
+		frappe.db.sql(
+			"""
+		select company, sum(debit_in_account_currency) - sum(credit_in_account_currency)
+		from `tabGL Entry`
+		where party_type = %s and party=%s
+		and is_cancelled = 0
+		group by company""",
+			(party_type, party),
+		)
+	)
+
+
 def get_party_shipping_address(doctype: str, name: str) -> str | None:
 	"""
 	Returns an Address name (best guess) for the given doctype and name for which `address_type == 'Shipping'` is true.
@@ -15,6 +15,9 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
 )
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	is_voucher_outstanding_enabled,
+)
 from erpnext.accounts.utils import (
 	build_qb_match_conditions,
 	get_currency_precision,
@@ -101,22 +104,26 @@ class ReceivablePayableReport:
 		# fetch future payments against invoices
 		self.get_future_payments()
 
-		# Get return entries
-		self.get_return_entries()
-
 		# Get Exchange Rate Revaluations
 		self.get_exchange_rate_revaluations()
 
-		self.prepare_ple_query()
 		self.data = []
 		self.voucher_balance = OrderedDict()
 
-		if self.ple_fetch_method == "Buffered Cursor":
-			self.fetch_ple_in_buffered_cursor()
-		elif self.ple_fetch_method == "UnBuffered Cursor":
-			self.fetch_ple_in_unbuffered_cursor()
-		elif self.ple_fetch_method == "Raw SQL":
-			self.fetch_ple_in_sql_procedures()
+		if self.can_use_voucher_outstanding():
+			self.fetch_voucher_outstanding()
+		else:
+			# Get return entries
+			self.get_return_entries()
+
+			self.prepare_ple_query()
+
+			if self.ple_fetch_method == "Buffered Cursor":
+				self.fetch_ple_in_buffered_cursor()
+			elif self.ple_fetch_method == "UnBuffered Cursor":
+				self.fetch_ple_in_unbuffered_cursor()
+			elif self.ple_fetch_method == "Raw SQL":
+				self.fetch_ple_in_sql_procedures()
 
 		# Build delivery note map against all sales invoices
 		self.build_delivery_note_map()
@@ -147,6 +154,96 @@ class ReceivablePayableReport:
 			self.update_voucher_balance(ple)
 		delattr(self, "ple_entries")
 
+	def can_use_voucher_outstanding(self):
+		"""Voucher Outstanding holds the balances of the whole Payment Ledger,
+		so it can only be used when nothing is posted after the report date
+		and no filter needs the individual entries"""
+		if not is_voucher_outstanding_enabled():
+			return False
+
+		for fieldname in (
+			"finance_book",
+			"cost_center",
+			"sales_person",
+			"ignore_accounts",
+			"handle_employee_advances",
+		):
+			if self.filters.get(fieldname):
+				return False
+
+		for dimension in get_accounting_dimensions(as_list=False):
+			if self.filters.get(dimension.fieldname):
+				return False
+
+		if build_qb_match_conditions("Payment Ledger Entry"):
+			return False
+
+		return not frappe.db.exists(
+			"Payment Ledger Entry",
+			{
+				"company": self.filters.company,
+				"delinked": 0,
+				"posting_date": (">", self.filters.report_date),
+			},
+		)
+
+	def fetch_voucher_outstanding(self):
+		# company, party and account filters apply to the same columns of Voucher Outstanding
+		self.ple = qb.DocType("Voucher Outstanding")
+		self.prepare_conditions()
+
+		outstanding = self.ple
+		query = (
+			qb.from_(outstanding)
+			.select(
+				outstanding.account,
+				outstanding.voucher_type,
+				outstanding.voucher_no,
+				outstanding.party_type,
+				outstanding.party,
+				outstanding.posting_date,
+				outstanding.cost_center,
+				outstanding.account_currency,
+				outstanding.invoiced,
+				outstanding.paid,
+				outstanding.credit_note,
+				outstanding.invoiced_in_account_currency,
+				outstanding.paid_in_account_currency,
+				outstanding.credit_note_in_account_currency,
+			)
+			.where(Criterion.all(self.qb_selection_filter))
+			.where(Criterion.any(self.or_filters))
+			.where((outstanding.outstanding != 0) | (outstanding.outstanding_in_account_currency != 0))
+		)
+
+		if self.filters.get("show_remarks"):
+			if remarks_length := frappe.db.get_single_value(
+				"Accounts Settings", "receivable_payable_remarks_length"
+			):
+				query = query.select(Substring(outstanding.remarks, 1, remarks_length).as_("remarks"))
+			else:
+				query = query.select(outstanding.remarks)
+
+		if self.filters.get("group_by_party"):
+			query = query.orderby(outstanding.party, outstanding.posting_date)
+		else:
+			query = query.orderby(outstanding.posting_date, outstanding.party)
+
+		in_account_currency = self.filters.get("in_party_currency") or self.filters.get("party_account")
+		for voucher in query.run(as_dict=True):
+			self.init_voucher_balance(voucher)
+
+			row = self.voucher_balance[
+				(voucher.account, voucher.voucher_type, voucher.voucher_no, voucher.party)
+			]
+			row.party_type = voucher.party_type
+			row.cost_center = voucher.cost_center
+			for fieldname in ("invoiced", "paid", "credit_note"):
+				row[f"{fieldname}_in_account_currency"] = voucher[f"{fieldname}_in_account_currency"]
+				row[fieldname] = voucher[
+					f"{fieldname}_in_account_currency" if in_account_currency else fieldname
+				]
+
 	def build_voucher_dict(self, ple):
 		return frappe._dict(
 			voucher_type=ple.voucher_type,
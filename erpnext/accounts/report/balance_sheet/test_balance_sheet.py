@@ -3,7 +3,7 @@
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import today
+from frappe.utils import add_months, flt, today
 
 from erpnext.accounts.report.balance_sheet.balance_sheet import execute
 
@@ -47,3 +47,57 @@ class TestBalanceSheet(FrappeTestCase):
 				self.assertEqual(account_dict.total, 1000)
 			if account_dict.get("account") == "Current Assets - _TC6":
 				self.assertEqual(account_dict.total, 550)
+
+	def test_gl_entries_summarized_by_period(self):
+		from erpnext.accounts.report.financial_statements import (
+			calculate_values,
+			get_accounts,
+			get_period_list,
+			set_gl_entries_by_account,
+		)
+
+		filters = frappe._dict(
+			company="_Test Company",
+			period_start_date=add_months(today(), -3),
+			period_end_date=today(),
+			periodicity="Monthly",
+		)
+		period_list = get_period_list(
+			filters.period_start_date,
+			filters.period_end_date,
+			filters.period_start_date,
+			filters.period_end_date,
+			"Date Range",
+			filters.periodicity,
+			company=filters.company,
+		)
+		root_lft, root_rgt = frappe.db.get_value(
+			"Account",
+			{"company": filters.company, "root_type": "Asset", "is_group": 1, "parent_account": ""},
+			["lft", "rgt"],
+		)
+
+		values = []
+		for summarize in (False, True):
+			gl_entries_by_account = {}
+			set_gl_entries_by_account(
+				filters.company,
+				None,
+				period_list[-1].to_date,
+				root_lft,
+				root_rgt,
+				filters,
+				gl_entries_by_account,
+				root_type="Asset",
+				period_list=period_list if summarize else None,
+			)
+			accounts_by_name = {d.name: d for d in get_accounts(filters.company, "Asset")}
+			calculate_values(accounts_by_name, gl_entries_by_account, period_list, 1, False)
+			values.append(
+				{
+					name: {period.key: flt(d.get(period.key), 2) for period in period_list}
+					for name, d in accounts_by_name.items()
+				}
+			)
+
+		self.assertEqual(values[0], values[1])
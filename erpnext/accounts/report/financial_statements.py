@@ -9,6 +9,8 @@ import re
 
 import frappe
 from frappe import _
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Sum
 from frappe.utils import add_days, add_months, cint, cstr, flt, formatdate, get_first_day, getdate
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
@@ -188,6 +190,7 @@ def get_data(
 			gl_entries_by_account,
 			ignore_closing_entries=ignore_closing_entries,
 			root_type=root_type,
+			period_list=period_list,
 		)
 
 	calculate_values(
@@ -415,8 +418,12 @@ def set_gl_entries_by_account(
 	ignore_closing_entries=False,
 	ignore_opening_entries=False,
 	root_type=None,
+	period_list=None,
 ):
-	"""Returns a dict like { "account": [gl entries], ... }"""
+	"""Returns a dict like { "account": [gl entries], ... }
+
+	If `period_list` is passed, GL Entries are summed in SQL per account and period instead of
+	being fetched row by row"""
 	gl_entries = []
 
 	account_filters = {
@@ -477,6 +484,7 @@ def set_gl_entries_by_account(
 			filters,
 			ignore_closing_entries,
 			ignore_opening_entries=ignore_opening_entries,
+			period_list=period_list,
 		)
 
 		if filters and filters.get("presentation_currency"):
@@ -497,11 +505,22 @@ def get_accounting_entries(
 	ignore_closing_entries,
 	period_closing_voucher=None,
 	ignore_opening_entries=False,
+	period_list=None,
 ):
 	gl_entry = frappe.qb.DocType(doctype)
-	query = (
-		frappe.qb.from_(gl_entry)
-		.select(
+	summarize = doctype == "GL Entry" and period_list
+
+	if summarize:
+		query = frappe.qb.from_(gl_entry).select(
+			gl_entry.account,
+			Sum(gl_entry.debit).as_("debit"),
+			Sum(gl_entry.credit).as_("credit"),
+			Sum(gl_entry.debit_in_account_currency).as_("debit_in_account_currency"),
+			Sum(gl_entry.credit_in_account_currency).as_("credit_in_account_currency"),
+			gl_entry.account_currency,
+		)
+	else:
+		query = frappe.qb.from_(gl_entry).select(
 			gl_entry.account,
 			gl_entry.debit,
 			gl_entry.credit,
@@ -509,14 +528,25 @@ def get_accounting_entries(
 			gl_entry.credit_in_account_currency,
 			gl_entry.account_currency,
 		)
-		.where(gl_entry.company == filters.company)
-	)
+
+	query = query.where(gl_entry.company == filters.company)
 
 	ignore_is_opening = frappe.db.get_single_value(
 		"Accounts Settings", "ignore_is_opening_check_for_reporting"
 	)
 
-	if doctype == "GL Entry":
+	if summarize:
+		period_boundaries = get_period_boundaries(period_list)
+		query = query.select(
+			get_period_boundary_case(gl_entry.posting_date, period_boundaries).as_("period_date"),
+			gl_entry.fiscal_year,
+		)
+		query = query.where(gl_entry.is_cancelled == 0)
+		query = query.where(gl_entry.posting_date <= to_date)
+
+		if ignore_opening_entries and not ignore_is_opening:
+			query = query.where(gl_entry.is_opening == "No")
+	elif doctype == "GL Entry":
 		query = query.select(gl_entry.posting_date, gl_entry.is_opening, gl_entry.fiscal_year)
 		query = query.where(gl_entry.is_cancelled == 0)
 		query = query.where(gl_entry.posting_date <= to_date)
@@ -538,9 +568,37 @@ def get_accounting_entries(
 	if match_conditions:
 		query += "and" + match_conditions
 
+	if summarize:
+		query += " group by account, account_currency, fiscal_year, period_date"
+		entries = frappe.db.sql(query, params, as_dict=True)
+		for entry in entries:
+			entry.posting_date = getdate(entry.pop("period_date"))
+		return entries
+
 	return frappe.db.sql(query, params, as_dict=True)
 
 
+def get_period_boundaries(period_list):
+	"""Dates at which a GL Entry moves in or out of a period column or the opening balance.
+
+	All entries posted between two consecutive boundaries are treated alike by `calculate_values`,
+	so they can be summed together and dated on the earlier boundary."""
+	boundaries = {getdate(period_list[0].year_start_date)}
+	for period in period_list:
+		boundaries.add(getdate(period.from_date))
+		boundaries.add(add_days(period.to_date, 1))
+
+	return sorted(boundaries)
+
+
+def get_period_boundary_case(posting_date, period_boundaries):
+	period_date = Case()
+	for boundary in reversed(period_boundaries):
+		period_date = period_date.when(posting_date >= boundary, boundary)
+
+	return period_date.else_(add_days(period_boundaries[0], -1))
+
+
 def apply_additional_conditions(doctype, query, from_date, ignore_closing_entries, filters):
 	gl_entry = frappe.qb.DocType(doctype)
 	accounting_dimensions = get_accounting_dimensions(as_list=False)
@@ -151,7 +151,14 @@ def get_result(filters, account_details):
 	if filters.get("include_dimensions"):
 		accounting_dimensions = get_accounting_dimensions()
 
-	gl_entries = get_gl_entries(filters, accounting_dimensions)
+	fetch_method = (
+		frappe.db.get_single_value("Accounts Settings", "general_ledger_fetch_method") or "Buffered Cursor"
+	)
+
+	if fetch_method == "UnBuffered Cursor" and not filters.get("presentation_currency"):
+		gl_entries = get_gl_entries_in_unbuffered_cursor(filters, accounting_dimensions)
+	else:
+		gl_entries = get_gl_entries(filters, accounting_dimensions)
 
 	data = get_data_with_opening_closing(filters, account_details, accounting_dimensions, gl_entries)
 
@@ -160,7 +167,16 @@ def get_result(filters, account_details):
 	return result
 
 
-def get_gl_entries(filters, accounting_dimensions):
+def get_gl_entries_in_unbuffered_cursor(filters, accounting_dimensions):
+	"""Yields GL Entries as they are read from the database.
+
+	The query only runs when iteration starts, so anything else that needs the database
+	has to be fetched before the entries are consumed."""
+	with frappe.db.unbuffered_cursor():
+		yield from get_gl_entries(filters, accounting_dimensions, as_iterator=True)
+
+
+def get_gl_entries(filters, accounting_dimensions, as_iterator=False):
 	currency_map = get_currency(filters)
 	select_fields = """, debit, credit, debit_in_account_currency,
 		credit_in_account_currency """
@@ -202,6 +218,7 @@ def get_gl_entries(filters, accounting_dimensions):
 	""",
 		filters,
 		as_dict=1,
+		as_iterator=as_iterator,
 	)
 
 	if filters.get("presentation_currency"):
@@ -354,18 +371,10 @@ def get_accounts_with_children(accounts):
 	return list(set(all_accounts)) if all_accounts else None
 
 
-def set_bill_no(gl_entries):
-	inv_details = get_supplier_invoice_details()
-	for gl in gl_entries:
-		gl["bill_no"] = inv_details.get(gl.get("against_voucher"), "")
-
-
 def get_data_with_opening_closing(filters, account_details, accounting_dimensions, gl_entries):
 	data = []
 
-	set_bill_no(gl_entries)
-
-	gle_map = initialize_gle_map(gl_entries, filters)
+	gle_map = OrderedDict()
 
 	totals, entries = get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map)
 
@@ -428,15 +437,6 @@ def group_by_field(group_by):
 		return "voucher_no"
 
 
-def initialize_gle_map(gl_entries, filters):
-	gle_map = OrderedDict()
-	group_by = group_by_field(filters.get("categorize_by"))
-
-	for gle in gl_entries:
-		gle_map.setdefault(gle.get(group_by), _dict(totals=get_totals_dict(), entries=[]))
-	return gle_map
-
-
 def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
 	totals = get_totals_dict()
 	entries = []
@@ -447,6 +447,9 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
 	if filters.get("show_net_values_in_party_account"):
 		account_type_map = get_account_type_map(filters.get("company"))
 
+	# gl_entries may be read from an unbuffered cursor, no other queries can run inside the loop
+	inv_details = get_supplier_invoice_details()
+
 	def update_value_in_dict(data, key, gle):
 		data[key].debit += gle.debit
 		data[key].credit += gle.credit
@@ -482,7 +485,9 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
 	show_opening_entries = filters.get("show_opening_entries")
 
 	for gle in gl_entries:
+		gle["bill_no"] = inv_details.get(gle.get("against_voucher"), "")
 		group_by_value = gle.get(group_by)
+		gle_map.setdefault(group_by_value, _dict(totals=get_totals_dict(), entries=[]))
 
 		if gle.posting_date < from_date or (cstr(gle.is_opening) == "Yes" and not show_opening_entries):
 			if not group_by_voucher_consolidated:
@@ -4,7 +4,7 @@
 import frappe
 from frappe import qb
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import flt, today
+from frappe.utils import add_days, flt, today
 
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.accounts.report.general_ledger.general_ledger import execute
@@ -332,3 +332,31 @@ class TestGeneralLedger(FrappeTestCase):
 		)
 		actual = set([x.voucher_no for x in data if x.voucher_no])
 		self.assertEqual(expected, actual)
+
+	def test_unbuffered_fetch_method(self):
+		from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+
+		for posting_date in (add_days(today(), -40), add_days(today(), -5), today()):
+			make_journal_entry(
+				"_Test Bank - _TC", "_Test Cash - _TC", 100, posting_date=posting_date, submit=True
+			)
+
+		filters = frappe._dict(
+			{
+				"company": self.company,
+				"from_date": add_days(today(), -10),
+				"to_date": today(),
+				"account": ["_Test Bank - _TC"],
+				"categorize_by": "Categorize by Voucher (Consolidated)",
+			}
+		)
+
+		results = []
+		for fetch_method in ("Buffered Cursor", "UnBuffered Cursor"):
+			frappe.db.set_single_value("Accounts Settings", "general_ledger_fetch_method", fetch_method)
+			results.append(execute(frappe._dict(filters))[1])
+		frappe.db.set_single_value("Accounts Settings", "general_ledger_fetch_method", "Buffered Cursor")
+
+		self.assertEqual(results[0], results[1])
+		self.assertEqual(results[1][0].debit, 100)
+		self.assertEqual(results[1][-1].balance, 300)
@@ -6,7 +6,7 @@ from collections import OrderedDict
 import frappe
 from frappe import _, qb, scrub
 from frappe.query_builder import Order
-from frappe.utils import cint, flt, formatdate
+from frappe.utils import cint, flt, formatdate, get_first_day
 
 from erpnext.controllers.queries import get_match_cond
 from erpnext.stock.report.stock_ledger.stock_ledger import get_item_group_condition
@@ -443,8 +443,10 @@ def get_column_names():
 class GrossProfitGenerator:
 	def __init__(self, filters=None):
 		self.sle = {}
+		self.sle_period = None
 		self.data = []
 		self.average_buying_rate = {}
+		self.last_purchase_rate = {}
 		self.filters = frappe._dict(filters)
 		self.load_invoice_items()
 		self.get_delivery_notes()
@@ -454,6 +456,8 @@ class GrossProfitGenerator:
 			self.group_items_by_invoice()
 
 		self.load_non_stock_items()
+		self.load_incoming_rates_from_so_dn()
+		self.group_stock_vouchers_by_period()
 		self.get_returned_invoice_items()
 		self.process()
 
@@ -479,6 +483,11 @@ class GrossProfitGenerator:
 
 			row.base_amount = flt(row.base_net_amount, self.currency_precision)
 
+			# stock ledger entries are loaded one month of invoices at a time
+			period = get_first_day(row.posting_date)
+			if period != self.sle_period:
+				self.load_stock_ledger_entries(period)
+
 			product_bundles = []
 			if row.update_stock:
 				product_bundles = self.product_bundles.get(row.parenttype, {}).get(row.parent, frappe._dict())
@@ -669,34 +678,33 @@ class GrossProfitGenerator:
 
 		return flt(buying_amount, self.currency_precision)
 
-	def calculate_buying_amount_from_sle(self, row, my_sle, parenttype, parent, item_row, item_code):
-		for i, sle in enumerate(my_sle):
-			# find the stock valution rate from stock ledger entry
-			if (
-				sle.voucher_type == parenttype
-				and parent == sle.voucher_no
-				and sle.voucher_detail_no == item_row
-			):
-				previous_stock_value = len(my_sle) > i + 1 and flt(my_sle[i + 1].stock_value) or 0.0
+	def calculate_buying_amount_from_sle(self, row, parenttype, parent, item_row, item_code, warehouse):
+		# find the stock valution rate from stock ledger entry
+		sle = self.sle.get((parenttype, parent, item_row, item_code, warehouse))
+		if not sle:
+			return 0.0
+
+		# value of the warehouse before this entry
+		previous_stock_value = flt(sle.stock_value) - flt(sle.stock_value_difference)
 
-				if previous_stock_value:
-					return abs(previous_stock_value - flt(sle.stock_value)) * flt(row.qty) / abs(flt(sle.qty))
-				else:
-					return flt(row.qty) * self.get_average_buying_rate(row, item_code)
-		return 0.0
+		if previous_stock_value:
+			return abs(flt(sle.stock_value_difference)) * flt(row.qty) / abs(flt(sle.qty))
+		else:
+			return flt(row.qty) * self.get_average_buying_rate(row, item_code)
 
 	def get_buying_amount(self, row, item_code):
-		# IMP NOTE
-		# stock_ledger_entries should already be filtered by item_code and warehouse and
-		# sorted by posting_date desc, posting_time desc
 		if item_code in self.non_stock_items and (row.project or row.cost_center):
 			# Issue 6089-Get last purchasing rate for non-stock item
 			item_rate = self.get_last_purchase_rate(item_code, row)
 			return flt(row.qty) * item_rate
 
 		else:
-			my_sle = self.get_stock_ledger_entries(item_code, row.warehouse)
-			if (row.update_stock or row.dn_detail) and my_sle:
+			if (
+				(row.update_stock or row.dn_detail)
+				and row.warehouse
+				and item_code
+				and item_code not in self.non_stock_items
+			):
 				parenttype = row.parenttype
 				parent = row.invoice or row.parent
 
@@ -704,7 +712,7 @@ class GrossProfitGenerator:
 					parenttype, parent = "Delivery Note", row.delivery_note
 
 				return self.calculate_buying_amount_from_sle(
-					row, my_sle, parenttype, parent, row.item_row, item_code
+					row, parenttype, parent, row.item_row, item_code, row.warehouse
 				)
 			elif self.delivery_notes.get((row.parent, row.item_code), None):
 				#  check if Invoice has delivery notes
@@ -715,12 +723,11 @@ class GrossProfitGenerator:
 					dn["item_row"],
 					dn["warehouse"],
 				)
-				my_sle = self.get_stock_ledger_entries(item_code, dn_warehouse)
 				return self.calculate_buying_amount_from_sle(
-					row, my_sle, parenttype, parent, item_row, item_code
+					row, parenttype, parent, item_row, item_code, dn_warehouse
 				)
 			elif row.sales_order and row.so_detail:
-				incoming_amount = self.get_buying_amount_from_so_dn(row.sales_order, row.so_detail, item_code)
+				incoming_amount = self.so_dn_incoming_rates.get((row.so_detail, item_code))
 				if incoming_amount:
 					return flt(row.qty) * incoming_amount
 			else:
@@ -728,23 +735,30 @@ class GrossProfitGenerator:
 
 		return flt(row.qty) * self.get_average_buying_rate(row, item_code)
 
-	def get_buying_amount_from_so_dn(self, sales_order, so_detail, item_code):
+	def load_incoming_rates_from_so_dn(self):
+		"""Average incoming rate of the Delivery Notes made against each Sales Order row invoiced"""
 		from frappe.query_builder.functions import Avg
 
+		self.so_dn_incoming_rates = {}
+		so_details = list({row.so_detail for row in self.si_list if row.sales_order and row.so_detail})
+		if not so_details:
+			return
+
 		delivery_note_item = frappe.qb.DocType("Delivery Note Item")
 
-		query = (
+		for so_detail, item_code, incoming_rate in (
 			frappe.qb.from_(delivery_note_item)
-			.select(Avg(delivery_note_item.incoming_rate))
+			.select(
+				delivery_note_item.so_detail,
+				delivery_note_item.item_code,
+				Avg(delivery_note_item.incoming_rate),
+			)
 			.where(delivery_note_item.docstatus == 1)
-			.where(delivery_note_item.item_code == item_code)
-			.where(delivery_note_item.against_sales_order == sales_order)
-			.where(delivery_note_item.so_detail == so_detail)
-			.groupby(delivery_note_item.item_code)
-		)
-
-		incoming_amount = query.run()
-		return flt(incoming_amount[0][0]) if incoming_amount else 0
+			.where(delivery_note_item.so_detail.isin(so_details))
+			.groupby(delivery_note_item.so_detail, delivery_note_item.item_code)
+			.run()
+		):
+			self.so_dn_incoming_rates[(so_detail, item_code)] = flt(incoming_rate)
 
 	def get_average_buying_rate(self, row, item_code):
 		args = row
@@ -765,6 +779,13 @@ class GrossProfitGenerator:
 		return self.average_buying_rate[key]
 
 	def get_last_purchase_rate(self, item_code, row):
+		key = (item_code, row.project, row.cost_center)
+		if key not in self.last_purchase_rate:
+			self.last_purchase_rate[key] = self.fetch_last_purchase_rate(item_code, row)
+
+		return self.last_purchase_rate[key]
+
+	def fetch_last_purchase_rate(self, item_code, row):
 		purchase_invoice = frappe.qb.DocType("Purchase Invoice")
 		purchase_invoice_item = frappe.qb.DocType("Purchase Invoice Item")
 
@@ -993,36 +1014,71 @@ class GrossProfitGenerator:
 			}
 		)
 
-	def get_stock_ledger_entries(self, item_code, warehouse):
-		if item_code and warehouse:
-			if (item_code, warehouse) not in self.sle:
-				sle = qb.DocType("Stock Ledger Entry")
-				res = (
-					qb.from_(sle)
-					.select(
-						sle.item_code,
-						sle.voucher_type,
-						sle.voucher_no,
-						sle.voucher_detail_no,
-						sle.stock_value,
-						sle.warehouse,
-						sle.actual_qty.as_("qty"),
-					)
-					.where(
-						(sle.company == self.filters.company)
-						& (sle.item_code == item_code)
-						& (sle.warehouse == warehouse)
-						& (sle.is_cancelled == 0)
-					)
-					.orderby(sle.item_code)
-					.orderby(sle.warehouse, sle.posting_datetime, sle.creation, order=Order.desc)
-					.run(as_dict=True)
+	def group_stock_vouchers_by_period(self):
+		"""Vouchers whose stock ledger entries value the invoiced items, grouped by the month
+		the items were invoiced in"""
+		self.stock_vouchers_by_period = {}
+		invoice_periods = {}
+
+		for row in self.si_list:
+			if not row.item_code:
+				continue
+
+			period = get_first_day(row.posting_date)
+			vouchers = self.stock_vouchers_by_period.setdefault(period, set())
+
+			if row.dn_detail and row.delivery_note:
+				vouchers.add(("Delivery Note", row.delivery_note))
+			elif row.update_stock:
+				vouchers.add((row.parenttype, row.invoice or row.parent))
+
+			if row.parent:
+				invoice_periods[row.parent] = period
+
+		for (sales_invoice, _item_code), dn in self.delivery_notes.items():
+			if sales_invoice in invoice_periods:
+				self.stock_vouchers_by_period[invoice_periods[sales_invoice]].add(
+					("Delivery Note", dn.delivery_note)
 				)
 
-				self.sle[(item_code, warehouse)] = res
+	def load_stock_ledger_entries(self, period):
+		"""Load the stock ledger entries of the vouchers of the items invoiced in `period`,
+		keyed by voucher, voucher row, item and warehouse"""
+		self.sle = {}
+		self.sle_period = period
 
-			return self.sle[(item_code, warehouse)]
-		return []
+		vouchers = self.stock_vouchers_by_period.get(period)
+		if not vouchers:
+			return
+
+		sle = qb.DocType("Stock Ledger Entry")
+		res = (
+			qb.from_(sle)
+			.select(
+				sle.item_code,
+				sle.voucher_type,
+				sle.voucher_no,
+				sle.voucher_detail_no,
+				sle.stock_value,
+				sle.stock_value_difference,
+				sle.warehouse,
+				sle.actual_qty.as_("qty"),
+			)
+			.where(
+				(sle.company == self.filters.company)
+				& (sle.voucher_no.isin(list({voucher_no for _voucher_type, voucher_no in vouchers})))
+				& (sle.is_cancelled == 0)
+			)
+			.orderby(sle.posting_datetime, sle.creation, order=Order.desc)
+			.run(as_dict=True)
+		)
+
+		for d in res:
+			if (d.voucher_type, d.voucher_no) in vouchers:
+				# the latest entry of a voucher row wins
+				self.sle.setdefault(
+					(d.voucher_type, d.voucher_no, d.voucher_detail_no, d.item_code, d.warehouse), d
+				)
 
 	def load_product_bundle(self):
 		self.product_bundles = {}
@@ -1051,7 +1107,9 @@ class GrossProfitGenerator:
 			).setdefault(d.parent_item, []).append(d)
 
 	def load_non_stock_items(self):
-		self.non_stock_items = frappe.db.sql_list(
-			"""select name from tabItem
-			where is_stock_item=0"""
+		self.non_stock_items = set(
+			frappe.db.sql_list(
+				"""select name from tabItem
+				where is_stock_item=0"""
+			)
 		)
@@ -588,3 +588,53 @@ class TestGrossProfit(FrappeTestCase):
 		self.assertEqual(total.buying_amount, 0.0)
 		self.assertEqual(total.gross_profit, 100.0)
 		self.assertEqual(total.get("gross_profit_%"), 100.0)
+
+	def test_buying_amount_of_invoices_across_months(self):
+		"""
+		Stock ledger entries are loaded one month of invoices at a time
+		"""
+		for posting_date, basic_rate in (("2025-01-01", 100), ("2025-02-01", 200)):
+			make_stock_entry(
+				company=self.company,
+				item_code=self.item,
+				target=self.warehouse,
+				qty=10,
+				basic_rate=basic_rate,
+				posting_date=posting_date,
+			)
+
+		invoices = [
+			create_sales_invoice(
+				qty=qty,
+				rate=300,
+				company=self.company,
+				customer=self.customer,
+				item_code=self.item,
+				item_name=self.item,
+				cost_center=self.cost_center,
+				warehouse=self.warehouse,
+				debit_to=self.debit_to,
+				parent_cost_center=self.cost_center,
+				update_stock=1,
+				currency="INR",
+				income_account=self.income_account,
+				expense_account=self.expense_account,
+				posting_date=posting_date,
+				set_posting_time=1,
+			)
+			for qty, posting_date in ((4, "2025-01-10"), (8, "2025-02-10"))
+		]
+
+		filters = frappe._dict(
+			company=self.company, from_date="2025-01-01", to_date="2025-02-28", group_by="Invoice"
+		)
+		_, data = execute(filters=filters)
+
+		for sinv in invoices:
+			stock_value_difference = frappe.db.get_value(
+				"Stock Ledger Entry",
+				{"voucher_type": "Sales Invoice", "voucher_no": sinv.name, "is_cancelled": 0},
+				"stock_value_difference",
+			)
+			invoice_row = next(row for row in data if row.get("parent_invoice") == sinv.name)
+			self.assertEqual(invoice_row.buying_amount, abs(stock_value_difference))
@@ -36,6 +36,17 @@ import erpnext
 # imported to enable erpnext.accounts.utils.get_account_currency
 from erpnext.accounts.doctype.account.account import get_account_currency
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_dimensions
+from erpnext.accounts.doctype.gl_period_balance.gl_period_balance import (
+	get_balance_from_gl_period_balances,
+	is_gl_period_balance_enabled,
+	reverse_gl_period_balances,
+)
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	get_payment_ledger_vouchers,
+	lock_voucher_outstandings,
+	refresh_voucher_outstandings,
+	update_voucher_outstandings,
+)
 from erpnext.stock import get_warehouse_account_map
 from erpnext.stock.utils import get_stock_value_on
 
@@ -196,11 +207,13 @@ def get_balance_on(
 	if not cost_center and frappe.form_dict.get("cost_center"):
 		cost_center = frappe.form_dict.get("cost_center")
 
-	cond = ["is_cancelled=0"]
+	cond = []
+	date_cond = ["is_cancelled=0"]
+	to_date = date
 	if start_date:
-		cond.append("posting_date >= %s" % frappe.db.escape(cstr(start_date)))
+		date_cond.append("posting_date >= %s" % frappe.db.escape(cstr(start_date)))
 	if date:
-		cond.append("posting_date <= %s" % frappe.db.escape(cstr(date)))
+		date_cond.append("posting_date <= %s" % frappe.db.escape(cstr(date)))
 	else:
 		# get balance of all entries that exist
 		date = nowdate()
@@ -271,12 +284,16 @@ def get_balance_on(
 			select_field = "sum(debit_in_account_currency) - sum(credit_in_account_currency)"
 		else:
 			select_field = "sum(debit) - sum(credit)"
-		bal = frappe.db.sql(
-			"""
-			SELECT {}
-			FROM `tabGL Entry` gle
-			WHERE {}""".format(select_field, " and ".join(cond))
-		)[0][0]
+		if is_gl_period_balance_enabled():
+			# monthly snapshots for complete periods, GL Entry only for the partial ones
+			bal = get_balance_from_gl_period_balances(select_field, cond, to_date, start_date)
+		else:
+			bal = frappe.db.sql(
+				"""
+				SELECT {}
+				FROM `tabGL Entry` gle
+				WHERE {}""".format(select_field, " and ".join(date_cond + cond))
+			)[0][0]
 
 		# if bal is None, return 0
 		return flt(bal)
@@ -846,20 +863,22 @@ def update_accounting_ledgers_after_reference_removal(
 
 	# Payment Ledger
 	ple = qb.DocType("Payment Ledger Entry")
-	ple_update_query = (
+	criterion = (
+		(ple.against_voucher_type == ref_type) & (ple.against_voucher_no == ref_no) & (ple.delinked == 0)
+	)
+	if payment_name:
+		criterion &= ple.voucher_no == payment_name
+
+	vouchers = get_payment_ledger_vouchers(criterion)
+	(
 		qb.update(ple)
 		.set(ple.against_voucher_type, ple.voucher_type)
 		.set(ple.against_voucher_no, ple.voucher_no)
 		.set(ple.modified, now())
 		.set(ple.modified_by, frappe.session.user)
-		.where(
-			(ple.against_voucher_type == ref_type) & (ple.against_voucher_no == ref_no) & (ple.delinked == 0)
-		)
-	)
-
-	if payment_name:
-		ple_update_query = ple_update_query.where(ple.voucher_no == payment_name)
-	ple_update_query.run()
+		.where(criterion)
+	).run()
+	refresh_voucher_outstandings(vouchers)
 
 
 def remove_ref_from_advance_section(ref_doc: object = None):
@@ -1387,6 +1406,9 @@ def repost_gle_for_stock_vouchers(
 		gle = get_voucherwise_gl_entries(stock_vouchers_chunk, posting_date)
 
 		for voucher_type, voucher_no in stock_vouchers_chunk:
+			# parallel reposts of different items can share a voucher, repost its GL one at a time
+			frappe.db.get_value(voucher_type, voucher_no, "name", for_update=True)
+
 			existing_gle = gle.get((voucher_type, voucher_no), [])
 			voucher_obj = frappe.get_doc(voucher_type, voucher_no)
 			# Some transactions post credit as negative debit, this is handled while posting GLE
@@ -1413,10 +1435,14 @@ def repost_gle_for_stock_vouchers(
 
 def _delete_pl_entries(voucher_type, voucher_no):
 	ple = qb.DocType("Payment Ledger Entry")
-	qb.from_(ple).delete().where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no)).run()
+	criterion = (ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no)
+	vouchers = get_payment_ledger_vouchers(criterion)
+	qb.from_(ple).delete().where(criterion).run()
+	refresh_voucher_outstandings(vouchers)
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
+	reverse_gl_period_balances({"voucher_type": voucher_type, "voucher_no": voucher_no})
 	gle = qb.DocType("GL Entry")
 	qb.from_(gle).delete().where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)).run()
 
@@ -1752,6 +1778,7 @@ def create_payment_ledger_entry(
 ):
 	if gl_entries:
 		ple_map = get_payment_ledger_entries(gl_entries, cancel=cancel)
+		lock_voucher_outstandings(ple_map)
 
 		for entry in ple_map:
 			ple = frappe.get_doc(entry)
@@ -1765,6 +1792,9 @@ def create_payment_ledger_entry(
 			ple.flags.update_outstanding = update_outstanding
 			ple.submit()
 
+		# covers the original entries delinked above as they share vouchers with the reversals
+		update_voucher_outstandings(ple_map)
+
 
 def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party):
 	ple = frappe.qb.DocType("Payment Ledger Entry")
@@ -23,6 +23,16 @@ frappe.ui.form.on("Bulk Transaction Log", {
 			},
 			__("View")
 		);
+		frm.add_custom_button(
+			__("Queued Entries"),
+			function () {
+				frappe.set_route("List", "Bulk Transaction Log Detail", {
+					date: frm.doc.date,
+					transaction_status: "Queued",
+				});
+			},
+			__("View")
+		);
 		if (frm.doc.failed) {
 			frm.add_custom_button(__("Retry Failed Transactions"), function () {
 				frappe.call({
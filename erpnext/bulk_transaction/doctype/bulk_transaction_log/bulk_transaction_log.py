@@ -22,25 +22,20 @@ class BulkTransactionLog(Document):
 		if not has_records:
 			raise frappe.DoesNotExistError
 
-		succeeded_logs = (
+		counts = dict(
 			qb.from_(log_detail)
-			.select(Count(log_detail.date).as_("count"))
-			.where((log_detail.date == self.name) & (log_detail.transaction_status == "Success"))
+			.select(log_detail.transaction_status, Count(log_detail.date))
+			.where(log_detail.date == self.name)
+			.groupby(log_detail.transaction_status)
 			.run()
-		)[0][0] or 0
-		failed_logs = (
-			qb.from_(log_detail)
-			.select(Count(log_detail.date).as_("count"))
-			.where((log_detail.date == self.name) & (log_detail.transaction_status == "Failed"))
-			.run()
-		)[0][0] or 0
-		total_logs = succeeded_logs + failed_logs
+		)
 		transaction_log = frappe._dict(
 			{
 				"date": self.name,
-				"count": total_logs,
-				"succeeded": succeeded_logs,
-				"failed": failed_logs,
+				"count": sum(counts.values()),
+				"succeeded": counts.get("Success", 0),
+				"failed": counts.get("Failed", 0),
+				"queued": counts.get("Queued", 0),
 			}
 		)
 		super(Document, self).__init__(serialize_transaction_log(transaction_log))
@@ -98,6 +93,7 @@ def serialize_transaction_log(data):
 		log_entries=data.count,
 		succeeded=data.succeeded,
 		failed=data.failed,
+		queued=data.queued,
 	)
 
 
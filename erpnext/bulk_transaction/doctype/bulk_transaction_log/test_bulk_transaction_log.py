@@ -1,9 +1,29 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import today
 
 
 class TestBulkTransactionLog(FrappeTestCase):
-	pass
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_log_counts_queued_entries(self):
+		frappe.db.delete("Bulk Transaction Log Detail", {"date": today()})
+		for status in ("Success", "Failed", "Queued", "Queued"):
+			frappe.get_doc(
+				{
+					"doctype": "Bulk Transaction Log Detail",
+					"from_doctype": "Sales Order",
+					"to_doctype": "Sales Invoice",
+					"transaction_name": "_Test Sales Order",
+					"transaction_status": status,
+					"date": today(),
+				}
+			).insert(ignore_permissions=True)
+
+		log = frappe.get_doc("Bulk Transaction Log", today())
+		self.assertEqual(log.log_entries, 4)
+		self.assertEqual((log.succeeded, log.failed, log.queued), (1, 1, 2))
@@ -1,9 +1,50 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
+from erpnext.utilities.bulk_transaction import (
+	create_logs,
+	resume_queued_transactions,
+	transaction_processing,
+)
+
 
 class TestBulkTransactionLogDetail(FrappeTestCase):
-	pass
+	def test_bulk_transaction_resumes_queued_documents(self):
+		sales_orders = [make_sales_order().name for _ in range(2)]
+
+		transaction_processing([{"name": name} for name in sales_orders], "Sales Order", "Sales Invoice")
+		for name in sales_orders:
+			self.assertEqual(
+				frappe.db.get_value(
+					"Bulk Transaction Log Detail",
+					{"transaction_name": name, "to_doctype": "Sales Invoice"},
+					"transaction_status",
+				),
+				"Success",
+			)
+			self.assertTrue(frappe.db.exists("Sales Invoice Item", {"sales_order": name}))
+
+		# documents of an interrupted job stay queued until they are resumed
+		jobs = create_logs(sales_orders[:1], "Sales Order", "Delivery Note")
+		((job_id, (log_name,)),) = jobs.items()
+		self.assertEqual(frappe.db.get_value("Bulk Transaction Log Detail", log_name, "job_id"), job_id)
+
+		# the chunk's job is still queued or running, it converts the document itself
+		with patch("erpnext.utilities.bulk_transaction.is_job_enqueued", return_value=True) as is_enqueued:
+			resume_queued_transactions()
+		is_enqueued.assert_any_call(job_id)
+		self.assertEqual(
+			frappe.db.get_value("Bulk Transaction Log Detail", log_name, "transaction_status"), "Queued"
+		)
+
+		resume_queued_transactions()
+		self.assertEqual(
+			frappe.db.get_value("Bulk Transaction Log Detail", log_name, "transaction_status"), "Success"
+		)
+		self.assertTrue(frappe.db.exists("Delivery Note Item", {"against_sales_order": sales_orders[0]}))
@@ -25,6 +25,7 @@ from erpnext.manufacturing.doctype.blanket_order.blanket_order import (
 	validate_against_blanket_order,
 )
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
+from erpnext.setup.doctype.transaction_trend.transaction_trend import add_transaction_trends
 from erpnext.stock.doctype.item.item import get_item_defaults, get_last_purchase_details
 from erpnext.stock.stock_balance import get_ordered_qty, update_bin_qty
 from erpnext.stock.utils import get_bin
@@ -314,7 +315,10 @@ class PurchaseOrder(BuyingController):
 
 	def update_status(self, status):
 		self.check_modified_date()
+		was_closed = self.status == "Closed"
 		self.set_status(update=True, status=status)
+		if was_closed != (self.status == "Closed"):
+			add_transaction_trends(self, -1 if self.status == "Closed" else 1)
 		self.update_requested_qty()
 		self.update_ordered_qty()
 		self.update_reserved_qty_for_subcontract()
@@ -36,6 +36,10 @@ from erpnext.accounts.doctype.pricing_rule.utils import (
 	apply_pricing_rule_on_transaction,
 	get_applied_pricing_rules,
 )
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	get_payment_ledger_vouchers,
+	refresh_voucher_outstandings,
+)
 from erpnext.accounts.general_ledger import get_round_off_account_and_cost_center
 from erpnext.accounts.party import (
 	get_party_account,
@@ -57,15 +61,16 @@ from erpnext.controllers.print_settings import (
 )
 from erpnext.controllers.sales_and_purchase_return import validate_return
 from erpnext.exceptions import InvalidCurrency
+from erpnext.setup.doctype.transaction_trend.transaction_trend import add_transaction_trends
 from erpnext.setup.utils import get_exchange_rate
 from erpnext.stock.doctype.item.item import get_uom_conv_factor
 from erpnext.stock.doctype.packed_item.packed_item import make_packing_list
 from erpnext.stock.get_item_details import (
 	_get_item_tax_template,
 	get_conversion_factor,
-	get_item_details,
 	get_item_tax_map,
 	get_item_warehouse,
+	get_items_details,
 )
 from erpnext.utilities.regional import temporary_flag
 from erpnext.utilities.transaction_base import TransactionBase
@@ -367,15 +372,15 @@ class AccountsController(TransactionBase):
 			delete_exchange_gain_loss_journal(self)
 
 			ple = frappe.qb.DocType("Payment Ledger Entry")
-			frappe.qb.from_(ple).delete().where(
-				(ple.voucher_type == self.doctype) & (ple.voucher_no == self.name)
-				| (
-					(ple.against_voucher_type == self.doctype)
-					& (ple.against_voucher_no == self.name)
-					& ple.delinked
-					== 1
-				)
-			).run()
+			criterion = (ple.voucher_type == self.doctype) & (ple.voucher_no == self.name) | (
+				(ple.against_voucher_type == self.doctype)
+				& (ple.against_voucher_no == self.name)
+				& ple.delinked
+				== 1
+			)
+			vouchers = get_payment_ledger_vouchers(criterion)
+			frappe.qb.from_(ple).delete().where(criterion).run()
+			refresh_voucher_outstandings(vouchers)
 			gle = frappe.qb.DocType("GL Entry")
 			frappe.qb.from_(gle).delete().where(
 				(gle.voucher_type == self.doctype) & (gle.voucher_no == self.name)
@@ -771,7 +776,7 @@ class AccountsController(TransactionBase):
 
 			self.pricing_rules = []
 
-			selected_serial_nos_map = {}
+			args_list = []
 			for item in self.get("items"):
 				if item.get("item_code"):
 					args = parent_dict.copy()
@@ -784,7 +789,6 @@ class AccountsController(TransactionBase):
 					args["ignore_pricing_rule"] = (
 						self.ignore_pricing_rule if hasattr(self, "ignore_pricing_rule") else 0
 					)
-					args["ignore_serial_nos"] = selected_serial_nos_map.get(item.get("item_code"))
 
 					if not args.get("transaction_date"):
 						args["transaction_date"] = args.get("posting_date")
@@ -792,7 +796,15 @@ class AccountsController(TransactionBase):
 					if self.get("is_subcontracted"):
 						args["is_subcontracted"] = self.is_subcontracted
 
-					ret = get_item_details(args, self, for_validate=for_validate, overwrite_warehouse=False)
+					args_list.append(args)
+
+			# details of all the rows are fetched together
+			items_details = iter(
+				get_items_details(args_list, self, for_validate=for_validate, overwrite_warehouse=False)
+			)
+			for item in self.get("items"):
+				if item.get("item_code"):
+					ret = next(items_details)
 					for fieldname, value in ret.items():
 						if item.meta.get_field(fieldname) and value is not None:
 							if item.get(fieldname) is None or fieldname in force_item_fields:
@@ -849,11 +861,6 @@ class AccountsController(TransactionBase):
 					if ret.get("pricing_rules"):
 						self.apply_pricing_rule_on_items(item, ret)
 						self.set_pricing_rule_details(item, ret)
-
-					if ret.get("serial_no"):
-						selected_serial_nos_map.setdefault(item.get("item_code"), []).extend(
-							ret.get("serial_no").split("\n")
-						)
 				else:
 					# Transactions line item without item code
 
@@ -3319,6 +3326,8 @@ def update_child_qty_rate(parent_doctype, trans_items, parent_doctype_name, chil
 	parent = frappe.get_doc(parent_doctype, parent_doctype_name)
 
 	check_doc_permissions(parent, "write")
+	# the trends are re-added from the updated items
+	add_transaction_trends(parent, -1)
 	_removed_items = validate_and_delete_children(parent, data)
 	items_added_or_removed |= _removed_items
 
@@ -3492,6 +3501,7 @@ def update_child_qty_rate(parent_doctype, trans_items, parent_doctype_name, chil
 
 	parent.reload()
 	validate_workflow_conditions(parent)
+	add_transaction_trends(parent)
 
 	parent.update_blanket_order()
 	parent.update_billing_percentage()
@@ -3,12 +3,16 @@
 
 
 import copy
+import hashlib
 import json
 
 import frappe
 from frappe import _
 from frappe.utils import cstr, flt
 
+# variants created by `create_multiple_variants` are committed in batches of this size
+VARIANT_BATCH_SIZE = 100
+
 
 class ItemVariantExistsError(frappe.ValidationError):
 	pass
@@ -167,36 +171,59 @@ def get_attribute_values(item):
 
 
 def find_variant(template, args, variant_item_code=None):
-	conditions = [
-		"""(iv_attribute.attribute={} and iv_attribute.attribute_value={})""".format(
-			frappe.db.escape(key), frappe.db.escape(cstr(value))
-		)
-		for key, value in args.items()
-	]
-
-	conditions = " or ".join(conditions)
+	filters = {"variant_of": template, "variant_signature": get_variant_signature(args)}
+	if variant_item_code:
+		filters["name"] = ("!=", variant_item_code)
 
-	from erpnext.e_commerce.variant_selector.utils import get_item_codes_by_attributes
+	return frappe.db.get_value("Item", filters)
 
-	possible_variants = [i for i in get_item_codes_by_attributes(args, template) if i != variant_item_code]
 
-	for variant in possible_variants:
-		variant = frappe.get_doc("Item", variant)
+def get_variant_signature(args):
+	"""Canonical hash of the attributes of a variant, independent of their order.
 
-		if len(args.keys()) == len(variant.get("attributes")):
-			# has the same number of attributes and values
-			# assuming no duplication as per the validation in Item
-			match_count = 0
-
-			for attribute, value in args.items():
-				for row in variant.attributes:
-					if row.attribute == attribute and row.attribute_value == cstr(value):
-						# this row matches
-						match_count += 1
-						break
+	:param args: A dictionary with "Attribute" as key and "Attribute Value" as value
+	"""
+	attributes = sorted([attribute, cstr(value)] for attribute, value in args.items())
+	return hashlib.sha256(json.dumps(attributes).encode()).hexdigest()
+
+
+def update_variant_signatures(attribute):
+	"""Recompute the signatures of variants having `attribute`, e.g. after it is renamed"""
+	variants = frappe.get_all(
+		"Item",
+		filters={
+			"name": (
+				"in",
+				frappe.get_all(
+					"Item Variant Attribute",
+					filters={"attribute": attribute, "parenttype": "Item", "parentfield": "attributes"},
+					pluck="parent",
+				),
+			),
+			"variant_of": ("is", "set"),
+			"variant_based_on": "Item Attribute",
+		},
+		pluck="name",
+	)
+	if not variants:
+		return
 
-			if match_count == len(args.keys()):
-				return variant.name
+	attributes = {}
+	for d in frappe.get_all(
+		"Item Variant Attribute",
+		filters={"parent": ("in", variants), "parenttype": "Item", "parentfield": "attributes"},
+		fields=["parent", "attribute", "attribute_value"],
+	):
+		attributes.setdefault(d.parent, {})[d.attribute] = d.attribute_value
+
+	for item_code in variants:
+		frappe.db.set_value(
+			"Item",
+			item_code,
+			"variant_signature",
+			get_variant_signature(attributes.get(item_code, {})),
+			update_modified=False,
+		)
 
 
 @frappe.whitelist()
@@ -204,7 +231,10 @@ def create_variant(item, args):
 	if isinstance(args, str):
 		args = json.loads(args)
 
-	template = frappe.get_doc("Item", item)
+	return make_variant(frappe.get_doc("Item", item), args)
+
+
+def make_variant(template, args, allow_fields=None):
 	variant = frappe.new_doc("Item")
 	variant.variant_based_on = "Item Attribute"
 	variant_attributes = []
@@ -213,7 +243,7 @@ def create_variant(item, args):
 		variant_attributes.append({"attribute": d.attribute, "attribute_value": args.get(d.attribute)})
 
 	variant.set("attributes", variant_attributes)
-	copy_attributes_to_variant(template, variant)
+	copy_attributes_to_variant(template, variant, allow_fields)
 	make_variant_item_code(template.item_code, template.item_name, variant)
 
 	return variant
@@ -243,19 +273,34 @@ def enqueue_multiple_variant_creation(item, args):
 
 
 def create_multiple_variants(item, args):
-	count = 0
 	if isinstance(args, str):
 		args = json.loads(args)
 
-	args_set = generate_keyed_value_combinations(args)
+	template = frappe.get_doc("Item", item)
+	allow_fields = get_variant_fields()
+	existing_signatures = set(
+		frappe.get_all(
+			"Item",
+			filters={"variant_of": item, "variant_signature": ("is", "set")},
+			pluck="variant_signature",
+		)
+	)
+
+	new_variants = []
+	for attribute_values in generate_keyed_value_combinations(args):
+		signature = get_variant_signature(attribute_values)
+		if signature not in existing_signatures:
+			existing_signatures.add(signature)
+			new_variants.append(attribute_values)
 
-	for attribute_values in args_set:
-		if not get_variant(item, args=attribute_values):
-			variant = create_variant(item, attribute_values)
-			variant.save()
-			count += 1
+	for start in range(0, len(new_variants), VARIANT_BATCH_SIZE):
+		for attribute_values in new_variants[start : start + VARIANT_BATCH_SIZE]:
+			make_variant(template, attribute_values, allow_fields).save()
 
-	return count
+		if len(new_variants) > VARIANT_BATCH_SIZE and not frappe.flags.in_test:
+			frappe.db.commit()
+
+	return len(new_variants)
 
 
 def generate_keyed_value_combinations(args):
@@ -310,7 +355,15 @@ def generate_keyed_value_combinations(args):
 	return results
 
 
-def copy_attributes_to_variant(item, variant):
+def get_variant_fields():
+	allow_fields = [d.field_name for d in frappe.get_all("Variant Field", fields=["field_name"])]
+	if "variant_based_on" not in allow_fields:
+		allow_fields.append("variant_based_on")
+
+	return allow_fields
+
+
+def copy_attributes_to_variant(item, variant, allow_fields=None):
 	# copy non no-copy fields
 
 	exclude_fields = [
@@ -327,9 +380,9 @@ def copy_attributes_to_variant(item, variant):
 		# don't copy manufacturer values if based on part no
 		exclude_fields += ["manufacturer", "manufacturer_part_no"]
 
-	allow_fields = [d.field_name for d in frappe.get_all("Variant Field", fields=["field_name"])]
-	if "variant_based_on" not in allow_fields:
-		allow_fields.append("variant_based_on")
+	if allow_fields is None:
+		allow_fields = get_variant_fields()
+
 	for field in item.meta.fields:
 		# "Table" is part of `no_value_field` but we shouldn't ignore tables
 		if (field.reqd or field.fieldname in allow_fields) and field.fieldname not in exclude_fields:
@@ -4,7 +4,19 @@
 
 import frappe
 from frappe import _
-from frappe.utils import getdate
+from frappe.utils import get_last_day, getdate
+
+# columns of Transaction Trend selected and grouped by for each "Based On"
+TRANSACTION_TREND_BASED_ON = {
+	"Item": ("t.item_code, t.item_name", "t.item_code"),
+	"Item Group": ("t.item_group", "t.item_group"),
+	"Customer": ("t.party_name, t.territory", "t.party"),
+	"Customer Group": ("t.customer_group", "t.customer_group"),
+	"Supplier": ("t.party, s.supplier_group", "t.party"),
+	"Supplier Group": ("s.supplier_group", "s.supplier_group"),
+	"Territory": ("t.territory", "t.territory"),
+	"Project": ("t.project", "t.project"),
+}
 
 
 def get_columns(filters, trans):
@@ -57,6 +69,12 @@ def validate_filters(filters):
 
 
 def get_data(filters, conditions):
+	year_start_date, year_end_date = frappe.get_cached_value(
+		"Fiscal Year", filters.get("fiscal_year"), ["year_start_date", "year_end_date"]
+	)
+	if can_use_transaction_trends(filters, year_start_date, year_end_date):
+		return get_data_from_transaction_trends(filters, conditions, year_start_date, year_end_date)
+
 	data = []
 	inc, cond = "", ""
 	query_details = conditions["based_on_select"] + conditions["period_wise_select"]
@@ -80,10 +98,6 @@ def get_data(filters, conditions):
 	if conditions.get("trans") == "Quotation" and filters.get("group_by") == "Customer":
 		cond += " and t1.quotation_to = 'Customer'"
 
-	year_start_date, year_end_date = frappe.get_cached_value(
-		"Fiscal Year", filters.get("fiscal_year"), ["year_start_date", "year_end_date"]
-	)
-
 	if filters.get("group_by"):
 		sel_col = ""
 		ind = conditions["columns"].index(conditions["grbc"][0])
@@ -211,6 +225,78 @@ def get_data(filters, conditions):
 	return data
 
 
+def can_use_transaction_trends(filters, year_start_date, year_end_date):
+	"""Transaction Trend has monthly totals by posting date, so it can only serve periods made of whole months"""
+	return (
+		(filters.get("period_based_on") or "posting_date") == "posting_date"
+		and getdate(year_start_date).day == 1
+		and getdate(year_end_date) == get_last_day(year_end_date)
+	)
+
+
+def get_data_from_transaction_trends(filters, conditions, year_start_date, year_end_date):
+	based_on_select, based_on_group_by = TRANSACTION_TREND_BASED_ON[filters.get("based_on")]
+
+	period_select = ""
+	if filters.get("period") != "Yearly":
+		for start_date, end_date in get_period_date_ranges(filters.get("period"), filters.get("fiscal_year")):
+			period_select = get_period_wise_query(
+				[start_date, end_date], "posting_month", period_select, parent="t", child="t"
+			)
+	else:
+		period_select = "SUM(t.stock_qty), SUM(t.base_net_amount), "
+	period_select += "SUM(t.stock_qty), SUM(t.base_net_amount)"
+
+	tables = "`tabTransaction Trend` t"
+	cond = ""
+	if filters.get("based_on") in ("Supplier", "Supplier Group"):
+		tables += ", `tabSupplier` s"
+		cond += " and s.name = t.party"
+	if filters.get("based_on") == "Project":
+		cond += " and t.project != ''"
+	if conditions.get("trans") == "Quotation" and filters.get("group_by") == "Customer":
+		cond += " and t.party_type = 'Customer'"
+
+	values = {
+		"voucher_type": conditions["trans"],
+		"company": filters.get("company"),
+		"year_start_date": year_start_date,
+		"year_end_date": year_end_date,
+	}
+
+	def get_trends(select, group_by):
+		return frappe.db.sql(
+			f"""select {select}, {period_select}
+				from {tables}
+				where t.voucher_type = %(voucher_type)s and t.company = %(company)s
+				and t.posting_month between %(year_start_date)s and %(year_end_date)s {cond}
+				group by {group_by}
+				order by {group_by}""",
+			values,
+			as_list=1,
+		)
+
+	if not filters.get("group_by"):
+		return get_trends(based_on_select, based_on_group_by)
+
+	group_by_col = "t.item_code" if filters.get("group_by") == "Item" else "t.party"
+	ind = conditions["columns"].index(conditions["grbc"][0])
+
+	group_rows = {}
+	for row in get_trends(f"{based_on_group_by}, {group_by_col}", f"{based_on_group_by}, {group_by_col}"):
+		group_rows.setdefault(row[0], []).append(row[1:])
+
+	data = []
+	for row in get_trends(f"{based_on_group_by}, {based_on_select}", based_on_group_by):
+		# blank column for the group by value
+		data.append([*row[1 : ind + 1], "", *row[ind + 1 :]])
+
+		for group_row in group_rows.get(row[0], []):
+			data.append(["" for _i in range(ind)] + group_row)
+
+	return data
+
+
 def get_mon(dt):
 	return getdate(dt).strftime("%b")
 
@@ -255,10 +341,12 @@ def get_period_wise_columns(bet_dates, period, pwc):
 		]
 
 
-def get_period_wise_query(bet_dates, trans_date, query_details):
-	query_details += """SUM(IF(t1.{trans_date} BETWEEN '{sd}' AND '{ed}', t2.stock_qty, NULL)),
-					SUM(IF(t1.{trans_date} BETWEEN '{sd}' AND '{ed}', t2.base_net_amount, NULL)),
+def get_period_wise_query(bet_dates, trans_date, query_details, parent="t1", child="t2"):
+	query_details += """SUM(IF({parent}.{trans_date} BETWEEN '{sd}' AND '{ed}', {child}.stock_qty, NULL)),
+					SUM(IF({parent}.{trans_date} BETWEEN '{sd}' AND '{ed}', {child}.base_net_amount, NULL)),
 				""".format(
+		parent=parent,
+		child=child,
 		trans_date=trans_date,
 		sd=bet_dates[0],
 		ed=bet_dates[1],
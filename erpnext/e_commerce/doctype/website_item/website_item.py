@@ -14,6 +14,7 @@ from frappe.website.doctype.website_slideshow.website_slideshow import get_slide
 from frappe.website.website_generator import WebsiteGenerator
 
 from erpnext.e_commerce.doctype.item_review.item_review import get_item_reviews
+from erpnext.e_commerce.product_data_engine.query import clear_product_listing_cache
 from erpnext.e_commerce.redisearch_utils import (
 	delete_item_from_index,
 	insert_item_to_index,
@@ -79,6 +80,7 @@ class WebsiteItem(WebsiteGenerator):
 	def on_trash(self):
 		super().on_trash()
 		delete_item_from_index(self)
+		clear_product_listing_cache()
 		self.publish_unpublish_desk_item(publish=False)
 
 	def validate_duplicate_website_item(self):
@@ -375,6 +377,7 @@ def invalidate_cache_for_web_item(doc):
 	from erpnext.stock.doctype.item.item import invalidate_item_variants_cache_for_website
 
 	invalidate_cache_for(doc, doc.item_group)
+	clear_product_listing_cache()
 
 	website_item_groups = list(
 		set(
@@ -1,13 +1,23 @@
 # Copyright (c) 2021, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+import hashlib
+import json
+
 import frappe
-from frappe.utils import flt
+from frappe.utils import cint, flt
 
 from erpnext.e_commerce.doctype.item_review.item_review import get_customer
-from erpnext.e_commerce.shopping_cart.product_info import get_product_info_for_website
+from erpnext.e_commerce.shopping_cart.product_info import get_product_prices_for_website
+from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
 from erpnext.utilities.product import get_non_stock_item_status
 
+PRODUCT_LISTING_CACHE_KEY = "erpnext:product_listing:"
+
+
+def clear_product_listing_cache():
+	frappe.cache().delete_keys(PRODUCT_LISTING_CACHE_KEY)
+
 
 class ProductQuery:
 	"""Query engine for product listing
@@ -91,18 +101,18 @@ class ProductQuery:
 
 	def query_items(self, start=0):
 		"""Build a query to fetch Website Items based on field filters."""
-		# MySQL does not support offset without limit,
-		# frappe does not accept two parameters for limit
-		# https://dev.mysql.com/doc/refman/8.0/en/select.html#id4651989
-		count_items = frappe.db.get_all(
+		cache_key = self.get_cache_key(start) if self.settings.cache_product_listing else None
+		if cache_key and (cached := frappe.cache().get_value(cache_key)):
+			return [frappe._dict(item) for item in cached["items"]], cached["count"]
+
+		total_count = frappe.db.get_all(
 			"Website Item",
+			fields=["count(distinct `tabWebsite Item`.name) as count"],
 			filters=self.filters,
 			or_filters=self.or_filters,
-			limit_page_length=184467440737095516,
-			limit_start=start,  # get all items from this offset for total count ahead
-			order_by="ranking desc",
-		)
-		count = len(count_items)
+		)[0].count
+		# count of all items from this offset ahead
+		count = max(cint(total_count) - cint(start), 0)
 
 		# If discounts included, return all rows.
 		# Slice after filtering rows with discount (See `filter_results_by_discount`).
@@ -120,8 +130,22 @@ class ProductQuery:
 			order_by="ranking desc",
 		)
 
+		if cache_key:
+			frappe.cache().set_value(
+				cache_key,
+				{"items": [dict(item) for item in items], "count": count},
+				expires_in_sec=5 * 60,
+			)
+
 		return items, count
 
+	def get_cache_key(self, start):
+		query = json.dumps(
+			[self.filters, self.or_filters, self.fields, start, self.page_length, self.filter_with_discount],
+			default=str,
+		)
+		return PRODUCT_LISTING_CACHE_KEY + hashlib.sha256(query.encode()).hexdigest()
+
 	def query_items_with_attributes(self, attributes, start=0):
 		"""Build a query to fetch Website Items based on field & attribute filters."""
 		item_codes = []
@@ -221,25 +245,32 @@ class ProductQuery:
 
 	def add_display_details(self, result, discount_list, cart_items):
 		"""Add price and availability details in result."""
-		for item in result:
-			product_info = get_product_info_for_website(item.item_code, skip_quotation_creation=True).get(
-				"product_info"
+		item_codes = [item.item_code for item in result]
+		prices = get_product_prices_for_website(item_codes)
+
+		if self.settings.show_stock_availability:
+			self.set_stock_details(result)
+
+		wished_items = set()
+		if item_codes:
+			wished_items = set(
+				frappe.get_all(
+					"Wishlist Item",
+					filters={"item_code": ("in", item_codes), "parent": frappe.session.user},
+					pluck="item_code",
+				)
 			)
 
-			if product_info and product_info["price"]:
+		for item in result:
+			if prices.get(item.item_code):
 				# update/mutate item and discount_list objects
-				self.get_price_discount_info(item, product_info["price"], discount_list)
+				self.get_price_discount_info(item, prices[item.item_code], discount_list)
 
 			if self.settings.show_stock_availability:
 				self.get_stock_availability(item)
 
 			item.in_cart = item.item_code in cart_items
-
-			item.wished = False
-			if frappe.db.exists(
-				"Wishlist Item", {"item_code": item.item_code, "parent": frappe.session.user}
-			):
-				item.wished = True
+			item.wished = item.item_code in wished_items
 
 		return result, discount_list
 
@@ -258,15 +289,51 @@ class ProductQuery:
 				"formatted_discount_rate"
 			)
 
-	def get_stock_availability(self, item):
-		from erpnext.templates.pages.wishlist import (
-			get_stock_availability as get_stock_availability_from_template,
+	def set_stock_details(self, items):
+		"""Fetch the stock items and their qty in the website warehouses of all `items` together."""
+		item_codes = [item.item_code for item in items]
+		self.stock_items = set()
+		self.stock_qty = {}
+
+		if not item_codes:
+			return
+
+		self.stock_items = set(
+			frappe.get_all("Item", filters={"name": ("in", item_codes), "is_stock_item": 1}, pluck="name")
 		)
 
+		warehouses = {}
+		for warehouse in {item.website_warehouse for item in items if item.get("website_warehouse")}:
+			if frappe.get_cached_value("Warehouse", warehouse, "is_group") == 1:
+				warehouses[warehouse] = get_child_warehouses(warehouse)
+			else:
+				warehouses[warehouse] = [warehouse]
+
+		if not warehouses:
+			return
+
+		bin_qty = {}
+		for d in frappe.get_all(
+			"Bin",
+			filters={
+				"item_code": ("in", item_codes),
+				"warehouse": ("in", list(set().union(*warehouses.values()))),
+			},
+			fields=["item_code", "warehouse", "actual_qty"],
+		):
+			bin_qty[(d.item_code, d.warehouse)] = flt(d.actual_qty)
+
+		for item in items:
+			self.stock_qty[item.item_code] = sum(
+				bin_qty.get((item.item_code, warehouse), 0.0)
+				for warehouse in warehouses.get(item.get("website_warehouse"), [])
+			)
+
+	def get_stock_availability(self, item):
 		"""Modify item object and add stock details."""
 		item.in_stock = False
 		warehouse = item.get("website_warehouse")
-		is_stock_item = frappe.get_cached_value("Item", item.item_code, "is_stock_item")
+		is_stock_item = item.item_code in self.stock_items
 
 		if item.get("on_backorder"):
 			return
@@ -278,7 +345,7 @@ class ProductQuery:
 			else:
 				item.in_stock = True
 		elif warehouse:
-			item.in_stock = get_stock_availability_from_template(item.item_code, warehouse)
+			item.in_stock = bool(self.stock_qty.get(item.item_code))
 
 	def get_cart_items(self):
 		customer = get_customer(silent=True)
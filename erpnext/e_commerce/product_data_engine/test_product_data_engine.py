@@ -10,7 +10,7 @@ from erpnext.e_commerce.doctype.e_commerce_settings.test_e_commerce_settings imp
 )
 from erpnext.e_commerce.doctype.website_item.test_website_item import create_regular_web_item
 from erpnext.e_commerce.product_data_engine.filters import ProductFiltersBuilder
-from erpnext.e_commerce.product_data_engine.query import ProductQuery
+from erpnext.e_commerce.product_data_engine.query import ProductQuery, clear_product_listing_cache
 
 test_dependencies = ["Item", "Item Group"]
 
@@ -273,6 +273,34 @@ class TestProductDataEngine(unittest.TestCase):
 		# tear down
 		setup_e_commerce_settings({"enable_attribute_filters": 1, "hide_variants": 0})
 
+	def test_product_list_cache(self):
+		"Test if cached listing is reused and cleared on updating a Website Item."
+		setup_e_commerce_settings({"cache_product_listing": 1})
+		clear_product_listing_cache()
+
+		def get_item_codes(start=0):
+			result = ProductQuery().query(
+				attributes={}, fields={}, search_term=None, start=start, item_group=None
+			)
+			return [item.get("item_code") for item in result.get("items")], result.get("items_count")
+
+		item_codes, count = get_item_codes()
+		self.assertEqual(get_item_codes(start=4)[1], count - 4)
+
+		# not via doc event, listing is not cleared
+		web_item = frappe.get_doc("Website Item", {"item_code": "Test 12I Laptop"})
+		frappe.db.set_value("Website Item", web_item.name, "ranking", 10)
+		self.assertEqual(get_item_codes()[0], item_codes)
+
+		web_item.reload()
+		web_item.save()
+		self.assertEqual(get_item_codes()[0][0], "Test 12I Laptop")
+
+		# tear down
+		frappe.db.set_value("Website Item", web_item.name, "ranking", 2)
+		setup_e_commerce_settings({"cache_product_listing": 0})
+		clear_product_listing_cache()
+
 	def test_custom_field_as_filter(self):
 		"Test if custom field functions as filter correctly."
 		from frappe.custom.doctype.custom_field.custom_field import create_custom_field
@@ -386,6 +386,27 @@ doc_events = {
 	"Integration Request": {
 		"validate": "erpnext.accounts.doctype.payment_request.payment_request.validate_payment"
 	},
+	(
+		"Quotation",
+		"Sales Order",
+		"Delivery Note",
+		"Sales Invoice",
+		"Purchase Order",
+		"Purchase Receipt",
+		"Purchase Invoice",
+	): {
+		"on_submit": "erpnext.setup.doctype.transaction_trend.transaction_trend.update_transaction_trends",
+		"on_cancel": "erpnext.setup.doctype.transaction_trend.transaction_trend.update_transaction_trends",
+	},
+	"Holiday List": {
+		"on_update": "erpnext.support.doctype.service_level_agreement.service_level_agreement.clear_service_level_agreement_calendars",
+		"on_trash": "erpnext.support.doctype.service_level_agreement.service_level_agreement.clear_service_level_agreement_calendars",
+	},
+	("Item", "Item Group", "Item Price", "Price List", "POS Profile", "POS Settings"): {
+		"on_update": "erpnext.selling.page.point_of_sale.point_of_sale.clear_item_catalogue",
+		"on_trash": "erpnext.selling.page.point_of_sale.point_of_sale.clear_item_catalogue",
+		"after_rename": "erpnext.selling.page.point_of_sale.point_of_sale.clear_item_catalogue",
+	},
 }
 
 # function should expect the variable and doc as arguments
@@ -431,6 +452,7 @@ scheduler_events = {
 		"erpnext.accounts.doctype.subscription.subscription.process_all",
 		"erpnext.stock.doctype.repost_item_valuation.repost_item_valuation.repost_entries",
 		"erpnext.utilities.bulk_transaction.retry",
+		"erpnext.utilities.bulk_transaction.resume_queued_transactions",
 	],
 	"daily": [
 		"erpnext.support.doctype.issue.issue.auto_close_tickets",
@@ -466,6 +488,7 @@ scheduler_events = {
 		"erpnext.loan_management.doctype.process_loan_interest_accrual.process_loan_interest_accrual.process_loan_interest_accrual_for_term_loans",
 		"erpnext.crm.utils.open_leads_opportunities_based_on_todays_event",
 		"erpnext.assets.doctype.asset.depreciation.post_depreciation_entries",
+		"erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot.update_stock_balance_snapshots",
 	],
 	"monthly_long": [
 		"erpnext.accounts.deferred_revenue.process_deferred_accounting",
@@ -217,12 +217,15 @@ class BOM(WebsiteGenerator):
 
 	def on_update(self):
 		frappe.cache().hdel("bom_children", self.name)
+		self.clear_bom_graph_cache()
 		self.check_recursion()
 
 	def on_submit(self):
+		self.clear_bom_graph_cache()
 		self.manage_default_bom()
 
 	def on_cancel(self):
+		self.clear_bom_graph_cache()
 		self.db_set("is_active", 0)
 		self.db_set("is_default", 0)
 
@@ -231,9 +234,13 @@ class BOM(WebsiteGenerator):
 		self.manage_default_bom()
 
 	def on_update_after_submit(self):
+		self.clear_bom_graph_cache()
 		self.validate_bom_links()
 		self.manage_default_bom()
 
+	def clear_bom_graph_cache(self):
+		frappe.cache().hdel("bom_graph", self.name)
+
 	def get_item_det(self, item_code):
 		item = get_item_details(item_code)
 
@@ -620,6 +627,7 @@ class BOM(WebsiteGenerator):
 		if save_updates:
 			# not via doc event, table is not regenerated and needs updation
 			self.calculate_exploded_cost()
+			self.clear_bom_graph_cache()
 
 		old_cost = self.total_cost
 
@@ -772,6 +780,9 @@ class BOM(WebsiteGenerator):
 		self.get_exploded_items()
 		self.add_exploded_items(save=save)
 
+		if save:
+			self.clear_bom_graph_cache()
+
 	def get_exploded_items(self):
 		"""Get all raw materials including items from child bom"""
 		self.cur_exploded_items = {}
@@ -808,30 +819,8 @@ class BOM(WebsiteGenerator):
 
 	def get_child_exploded_items(self, bom_no, stock_qty):
 		"""Add all items from Flat BOM of child BOM"""
-		# Did not use qty_consumed_per_unit in the query, as it leads to rounding loss
-		child_fb_items = frappe.db.sql(
-			"""
-			SELECT
-				bom_item.item_code,
-				bom_item.item_name,
-				bom_item.description,
-				bom_item.source_warehouse,
-				bom_item.operation,
-				bom_item.stock_uom,
-				bom_item.stock_qty,
-				bom_item.rate,
-				bom_item.include_item_in_manufacturing,
-				bom_item.sourced_by_supplier,
-				bom_item.stock_qty / ifnull(bom.quantity, 1) AS qty_consumed_per_unit
-			FROM `tabBOM Explosion Item` bom_item, `tabBOM` bom
-			WHERE
-				bom_item.parent = bom.name
-				AND bom.name = %s
-				AND bom.docstatus = 1
-		""",
-			bom_no,
-			as_dict=1,
-		)
+		graph = get_bom_graph(bom_no)
+		child_fb_items = graph.exploded_items if graph.docstatus == 1 else []
 
 		for d in child_fb_items:
 			self.add_to_cur_exploded_items(
@@ -843,7 +832,7 @@ class BOM(WebsiteGenerator):
 						"operation": d["operation"],
 						"description": d["description"],
 						"stock_uom": d["stock_uom"],
-						"stock_qty": d["qty_consumed_per_unit"] * stock_qty,
+						"stock_qty": d["qty_per_unit"] * stock_qty,
 						"rate": flt(d["rate"]),
 						"include_item_in_manufacturing": d.get("include_item_in_manufacturing", 0),
 						"sourced_by_supplier": d.get("sourced_by_supplier", 0),
@@ -1189,6 +1178,70 @@ def get_children(parent=None, is_root=False, **filters):
 		return bom_items
 
 
+def get_bom_graph(bom_no: str) -> frappe._dict:
+	"""Items and exploded items of a BOM, cached until the BOM, its exploded items or its cost change.
+
+	`qty_per_unit` of every row is its stock qty per unit of the BOM, so that a sub-assembly can be
+	exploded for any qty without querying its BOM again."""
+	graph = frappe.cache().hget("bom_graph", bom_no)
+	if graph is not None:
+		return graph
+
+	bom = frappe.db.get_value("BOM", bom_no, ["item", "quantity", "docstatus"], as_dict=True)
+	if not bom:
+		return frappe._dict(items=[], exploded_items=[])
+
+	items = frappe.get_all(
+		"BOM Item",
+		filters={"parent": bom_no, "parenttype": "BOM", "docstatus": ("<", 2)},
+		fields=[
+			"item_code",
+			"item_name",
+			"bom_no",
+			"qty",
+			"uom",
+			"stock_qty",
+			"stock_uom",
+			"description",
+			"source_warehouse",
+		],
+		order_by="idx",
+	)
+
+	exploded_items = frappe.get_all(
+		"BOM Explosion Item",
+		filters={"parent": bom_no, "parenttype": "BOM"},
+		fields=[
+			"item_code",
+			"item_name",
+			"description",
+			"source_warehouse",
+			"operation",
+			"stock_uom",
+			"stock_qty",
+			"rate",
+			"include_item_in_manufacturing",
+			"sourced_by_supplier",
+		],
+		order_by="idx",
+	)
+
+	# qty_consumed_per_unit of the rows is not used, as it leads to rounding loss
+	for d in items + exploded_items:
+		d.qty_per_unit = flt(d.stock_qty) / (flt(bom.quantity) or 1)
+
+	graph = frappe._dict(
+		item=bom.item,
+		quantity=bom.quantity,
+		docstatus=bom.docstatus,
+		items=items,
+		exploded_items=exploded_items,
+	)
+	frappe.cache().hset("bom_graph", bom_no, graph)
+
+	return graph
+
+
 def add_additional_cost(stock_entry, work_order):
 	# Add non stock items cost in the additional cost
 	stock_entry.additional_costs = []
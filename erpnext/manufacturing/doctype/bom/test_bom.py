@@ -775,6 +775,26 @@ class TestBOM(FrappeTestCase):
 		for row in bom.items:
 			self.assertEqual(row.stock_uom, "Kg")
 
+	def test_bom_graph_cache(self):
+		from erpnext.manufacturing.doctype.bom.bom import get_bom_graph
+		from erpnext.manufacturing.doctype.production_plan.test_production_plan import make_bom
+
+		rm_items = [make_item(properties={"is_stock_item": 1}).name for _ in range(2)]
+		fg_item = make_item(properties={"is_stock_item": 1}).name
+
+		bom = make_bom(item=fg_item, raw_materials=rm_items, quantity=2, rm_qty=3)
+		graph = get_bom_graph(bom.name)
+
+		self.assertEqual(graph.item, fg_item)
+		self.assertEqual([d.item_code for d in graph.items], rm_items)
+		self.assertEqual([d.qty_per_unit for d in graph.items], [1.5, 1.5])
+		self.assertEqual([d.qty_per_unit for d in graph.exploded_items], [1.5, 1.5])
+		self.assertIsNotNone(frappe.cache().hget("bom_graph", bom.name))
+
+		bom.cancel()
+		self.assertIsNone(frappe.cache().hget("bom_graph", bom.name))
+		self.assertEqual(get_bom_graph(bom.name).docstatus, 2)
+
 
 def get_default_bom(item_code="_Test FG Item 2"):
 	return frappe.db.get_value("BOM", {"item": item_code, "is_active": 1, "is_default": 1})
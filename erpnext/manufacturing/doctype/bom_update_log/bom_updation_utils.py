@@ -23,6 +23,7 @@ def replace_bom(boms: dict, log_name: str) -> None:
 	update_new_bom_in_bom_items(unit_cost, current_bom, new_bom)
 
 	frappe.cache().delete_key("bom_children")
+	frappe.cache().delete_key("bom_graph")
 	parent_boms = get_ancestor_boms(new_bom)
 
 	for bom in parent_boms:
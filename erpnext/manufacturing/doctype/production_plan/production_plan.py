@@ -23,8 +23,7 @@ from frappe.utils import (
 from frappe.utils.csvutils import build_csv_response
 from pypika.terms import ExistsCriterion
 
-from erpnext.manufacturing.doctype.bom.bom import get_children as get_bom_children
-from erpnext.manufacturing.doctype.bom.bom import validate_bom_no
+from erpnext.manufacturing.doctype.bom.bom import get_bom_graph, validate_bom_no
 from erpnext.manufacturing.doctype.work_order.work_order import get_item_details
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
 from erpnext.stock.get_item_details import get_conversion_factor
@@ -1083,75 +1082,140 @@ def get_subitems(
 	parent_qty,
 	planned_qty=1,
 ):
-	bom_item = frappe.qb.DocType("BOM Item")
-	bom = frappe.qb.DocType("BOM")
+	return explode_bom_items(
+		item_details,
+		{bom_no: flt(parent_qty) * flt(planned_qty)},
+		company,
+		include_non_stock_items,
+		include_subcontracted_items,
+		data.get("include_exploded_items"),
+	)
+
+
+def explode_bom_items(
+	item_details,
+	bom_qty,
+	company,
+	include_non_stock_items,
+	include_subcontracted_items,
+	include_exploded_items,
+):
+	"""
+	Add the items required to make `bom_qty` ({bom_no: qty}) to `item_details`.
+	With `include_exploded_items`, sub-assemblies are exploded into their default BOMs.
+	The BOMs are exploded in topological order, each one once for the total qty required of it.
+	"""
+	item_data, sub_boms = {}, {}
+
+	def can_be_exploded(item):
+		return (
+			include_exploded_items
+			and item.default_bom
+			and (
+				(
+					item.default_material_request_type in ["Manufacture", "Purchase"]
+					and not item.is_sub_contracted
+				)
+				or (item.is_sub_contracted and include_subcontracted_items)
+			)
+		)
+
+	# find the BOMs to explode level by level, with the item details of a level in one query
+	to_visit = list(bom_qty)
+	while to_visit:
+		graphs = {bom_no: get_bom_graph(bom_no) for bom_no in to_visit if bom_no not in sub_boms}
+		item_codes = {d.item_code for graph in graphs.values() for d in graph.items} - set(item_data)
+		item_data.update(get_bom_item_data(item_codes, company, include_non_stock_items))
+
+		to_visit = []
+		for bom_no, graph in graphs.items():
+			sub_boms[bom_no] = []
+			for d in graph.items:
+				item = item_data.get(d.item_code)
+				if item and can_be_exploded(item):
+					sub_boms[bom_no].append(item.default_bom)
+					to_visit.append(item.default_bom)
+
+	bom_order, visited = [], set()
+
+	def visit(bom_no):
+		visited.add(bom_no)
+		for sub_bom in sub_boms[bom_no]:
+			if sub_bom not in visited:
+				visit(sub_bom)
+		bom_order.append(bom_no)
+
+	for bom_no in bom_qty:
+		if bom_no not in visited:
+			visit(bom_no)
+
+	required_qty = {bom_no: flt(qty) for bom_no, qty in bom_qty.items()}
+	for bom_no in reversed(bom_order):
+		graph = get_bom_graph(bom_no)
+
+		qty_per_unit = {}
+		for d in graph.items:
+			qty_per_unit[d.item_code] = qty_per_unit.get(d.item_code, 0) + d.qty_per_unit
+
+		for d in graph.items:
+			item = item_data.get(d.item_code)
+			if not item or d.item_code not in qty_per_unit:
+				continue
+
+			qty = flt(required_qty.get(bom_no)) * qty_per_unit.pop(d.item_code)
+
+			if not include_exploded_items or not item.default_bom:
+				if d.item_code in item_details:
+					item_details[d.item_code].qty = item_details[d.item_code].qty + qty
+				else:
+					item_details[d.item_code] = frappe._dict(
+						item,
+						qty=qty,
+						source_warehouse=d.source_warehouse,
+						description=d.description,
+						stock_uom=d.stock_uom,
+						main_bom_item=graph.item,
+					)
+
+			elif can_be_exploded(item) and qty > 0:
+				required_qty[item.default_bom] = flt(required_qty.get(item.default_bom)) + qty
+
+	return item_details
+
+
+def get_bom_item_data(item_codes, company, include_non_stock_items):
+	if not item_codes:
+		return {}
+
 	item = frappe.qb.DocType("Item")
 	item_default = frappe.qb.DocType("Item Default")
 	item_uom = frappe.qb.DocType("UOM Conversion Detail")
 
 	items = (
-		frappe.qb.from_(bom_item)
-		.join(bom)
-		.on(bom.name == bom_item.parent)
-		.join(item)
-		.on(bom_item.item_code == item.name)
+		frappe.qb.from_(item)
 		.left_join(item_default)
 		.on((item.name == item_default.parent) & (item_default.company == company))
 		.left_join(item_uom)
 		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
 		.select(
-			bom_item.item_code,
+			item.name.as_("item_code"),
 			item.default_material_request_type,
 			item.item_name,
-			IfNull(parent_qty * Sum(bom_item.stock_qty / IfNull(bom.quantity, 1)) * planned_qty, 0).as_(
-				"qty"
-			),
 			item.is_sub_contracted_item.as_("is_sub_contracted"),
-			bom_item.source_warehouse,
 			item.default_bom.as_("default_bom"),
-			bom_item.description.as_("description"),
-			bom_item.stock_uom.as_("stock_uom"),
 			item.min_order_qty.as_("min_order_qty"),
 			item.safety_stock.as_("safety_stock"),
 			item_default.default_warehouse,
 			item.purchase_uom,
 			item_uom.conversion_factor,
-			bom.item.as_("main_bom_item"),
 		)
 		.where(
-			(bom.name == bom_no)
-			& (bom_item.docstatus < 2)
+			item.name.isin(list(item_codes))
 			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
 		)
-		.groupby(bom_item.item_code)
 	).run(as_dict=True)
 
-	for d in items:
-		if not data.get("include_exploded_items") or not d.default_bom:
-			if d.item_code in item_details:
-				item_details[d.item_code].qty = item_details[d.item_code].qty + d.qty
-			else:
-				if not d.conversion_factor and d.purchase_uom:
-					d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
-
-				item_details[d.item_code] = d
-
-		if data.get("include_exploded_items") and d.default_bom:
-			if (
-				d.default_material_request_type in ["Manufacture", "Purchase"] and not d.is_sub_contracted
-			) or (d.is_sub_contracted and include_subcontracted_items):
-				if d.qty > 0:
-					get_subitems(
-						doc,
-						data,
-						item_details,
-						d.default_bom,
-						company,
-						include_non_stock_items,
-						include_subcontracted_items,
-						d.qty,
-					)
-	return item_details
+	return {d.item_code: d for d in items}
 
 
 def get_material_request_items(
@@ -1407,6 +1471,9 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 
 	so_item_details = frappe._dict()
 
+	# BOMs exploded together for all the items, by the options they are exploded with
+	bom_qty_to_explode = {}
+
 	sub_assembly_items = {}
 	if doc.get("skip_available_sub_assembly_item") and doc.get("sub_assembly_items"):
 		for d in doc.get("sub_assembly_items"):
@@ -1458,17 +1525,13 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 						doc=doc,
 					)
 				else:
-					item_details = get_subitems(
-						doc,
-						data,
-						item_details,
-						bom_no,
-						company,
-						include_non_stock_items,
-						include_subcontracted_items,
-						1,
-						planned_qty=planned_qty,
+					options = (
+						cint(include_non_stock_items),
+						cint(include_subcontracted_items),
+						cint(data.get("include_exploded_items")),
 					)
+					bom_qty = bom_qty_to_explode.setdefault(options, {})
+					bom_qty[bom_no] = flt(bom_qty.get(bom_no)) + flt(planned_qty)
 		elif data.get("item_code"):
 			item_master = frappe.get_doc("Item", data["item_code"]).as_dict()
 			purchase_uom = item_master.purchase_uom or item_master.stock_uom
@@ -1494,16 +1557,11 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 				}
 			)
 
-		sales_order = doc.get("sales_order")
+		add_so_item_details(so_item_details, doc.get("sales_order"), item_details)
 
-		for item_code, details in item_details.items():
-			so_item_details.setdefault(sales_order, frappe._dict())
-			if item_code in so_item_details.get(sales_order, {}):
-				so_item_details[sales_order][item_code]["qty"] = so_item_details[sales_order][item_code].get(
-					"qty", 0
-				) + flt(details.qty)
-			else:
-				so_item_details[sales_order][item_code] = details
+	for options, bom_qty in bom_qty_to_explode.items():
+		item_details = explode_bom_items({}, bom_qty, company, *options)
+		add_so_item_details(so_item_details, doc.get("sales_order"), item_details)
 
 	mr_items = []
 	for sales_order in so_item_details:
@@ -1549,6 +1607,17 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 	return mr_items
 
 
+def add_so_item_details(so_item_details, sales_order, item_details):
+	for item_code, details in item_details.items():
+		so_item_details.setdefault(sales_order, frappe._dict())
+		if item_code in so_item_details.get(sales_order, {}):
+			so_item_details[sales_order][item_code]["qty"] = so_item_details[sales_order][item_code].get(
+				"qty", 0
+			) + flt(details.qty)
+		else:
+			so_item_details[sales_order][item_code] = details
+
+
 def get_materials_from_other_locations(item, warehouses, new_mr_items, company):
 	from erpnext.stock.doctype.pick_list.pick_list import get_available_item_locations
 
@@ -1616,11 +1685,16 @@ def get_item_data(item_code):
 
 
 def get_sub_assembly_items(bom_no, bom_data, to_produce_qty, company, warehouse=None, indent=0):
-	data = get_bom_children(parent=bom_no)
-	for d in data:
-		if d.expandable:
-			parent_item_code = frappe.get_cached_value("BOM", bom_no, "item")
-			stock_qty = (d.stock_qty / d.parent_bom_qty) * flt(to_produce_qty)
+	graph = get_bom_graph(bom_no)
+	for d in graph.items:
+		if d.bom_no:
+			item = frappe.get_cached_value(
+				"Item",
+				d.item_code,
+				["item_name", "description", "stock_uom", "is_sub_contracted_item"],
+				as_dict=True,
+			)
+			stock_qty = d.qty_per_unit * flt(to_produce_qty)
 
 			if warehouse:
 				bin_details = get_bin_details(d, company, for_warehouse=warehouse)
@@ -1637,14 +1711,14 @@ def get_sub_assembly_items(bom_no, bom_data, to_produce_qty, company, warehouse=
 				bom_data.append(
 					frappe._dict(
 						{
-							"parent_item_code": parent_item_code,
-							"description": d.description,
+							"parent_item_code": graph.item,
+							"description": item.description,
 							"production_item": d.item_code,
-							"item_name": d.item_name,
-							"stock_uom": d.stock_uom,
-							"uom": d.stock_uom,
-							"bom_no": d.value,
-							"is_sub_contracted_item": d.is_sub_contracted_item,
+							"item_name": item.item_name,
+							"stock_uom": item.stock_uom,
+							"uom": item.stock_uom,
+							"bom_no": d.bom_no,
+							"is_sub_contracted_item": item.is_sub_contracted_item,
 							"bom_level": indent,
 							"indent": indent,
 							"stock_qty": stock_qty,
@@ -1652,10 +1726,7 @@ def get_sub_assembly_items(bom_no, bom_data, to_produce_qty, company, warehouse=
 					)
 				)
 
-				if d.value:
-					get_sub_assembly_items(
-						d.value, bom_data, stock_qty, company, warehouse, indent=indent + 1
-					)
+				get_sub_assembly_items(d.bom_no, bom_data, stock_qty, company, warehouse, indent=indent + 1)
 
 
 def set_default_warehouses(row, default_warehouses):
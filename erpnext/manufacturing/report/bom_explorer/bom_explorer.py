@@ -5,6 +5,8 @@
 import frappe
 from frappe import _
 
+from erpnext.manufacturing.doctype.bom.bom import get_bom_graph
+
 
 def execute(filters=None):
 	data = []
@@ -18,16 +20,7 @@ def get_data(filters, data):
 
 
 def get_exploded_items(bom, data, indent=0, qty=1):
-	exploded_items = frappe.get_all(
-		"BOM Item",
-		filters={"parent": bom},
-		fields=["qty", "bom_no", "qty", "item_code", "item_name", "description", "uom", "idx"],
-		order_by="idx ASC",
-	)
-
-	for item in exploded_items:
-		print(item.bom_no, indent)
-		item["indent"] = indent
+	for item in get_bom_graph(bom).items:
 		data.append(
 			{
 				"item_code": item.item_code,
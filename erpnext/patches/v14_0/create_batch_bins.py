@@ -0,0 +1,5 @@
+from erpnext.stock.doctype.batch_bin.batch_bin import repost_batch_bins
+
+
+def execute():
+	repost_batch_bins()
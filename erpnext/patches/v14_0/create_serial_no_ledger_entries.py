@@ -0,0 +1,7 @@
+from erpnext.stock.doctype.serial_no_ledger_entry.serial_no_ledger_entry import (
+	rebuild_serial_no_ledger_entries,
+)
+
+
+def execute():
+	rebuild_serial_no_ledger_entries()
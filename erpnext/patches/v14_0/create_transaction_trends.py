@@ -0,0 +1,5 @@
+from erpnext.setup.doctype.transaction_trend.transaction_trend import rebuild_transaction_trends
+
+
+def execute():
+	rebuild_transaction_trends()
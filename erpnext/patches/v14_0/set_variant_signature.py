@@ -0,0 +1,26 @@
+import frappe
+
+from erpnext.controllers.item_variant import get_variant_signature
+
+
+def execute():
+	attributes = {}
+	for d in frappe.get_all(
+		"Item Variant Attribute",
+		filters={"parenttype": "Item", "parentfield": "attributes"},
+		fields=["parent", "attribute", "attribute_value"],
+	):
+		attributes.setdefault(d.parent, {})[d.attribute] = d.attribute_value
+
+	for item_code in frappe.get_all(
+		"Item",
+		filters={"variant_of": ("is", "set"), "variant_based_on": "Item Attribute"},
+		pluck="name",
+	):
+		frappe.db.set_value(
+			"Item",
+			item_code,
+			"variant_signature",
+			get_variant_signature(attributes.get(item_code, {})),
+			update_modified=False,
+		)
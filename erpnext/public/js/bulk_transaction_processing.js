@@ -18,7 +18,13 @@ $.extend(erpnext.bulk_transaction_processing, {
 						method: "erpnext.utilities.bulk_transaction.transaction_processing",
 						args: { data: checked_items, from_doctype: from_doctype, to_doctype: to_doctype },
 					})
-					.then(() => {});
+					.then(() => {
+						erpnext.bulk_transaction_processing.show_progress(
+							from_doctype,
+							to_doctype,
+							count_of_rows
+						);
+					});
 				if (count_of_rows > 10) {
 					frappe.show_alert("Starting a background job to create {0} {1}", [
 						count_of_rows,
@@ -30,4 +36,25 @@ $.extend(erpnext.bulk_transaction_processing, {
 			}
 		});
 	},
+
+	show_progress: function (from_doctype, to_doctype, count_of_rows) {
+		frappe.realtime.off("bulk_transaction_progress");
+		frappe.realtime.on("bulk_transaction_progress", (data) => {
+			if (data.from_doctype != from_doctype || data.to_doctype != to_doctype) return;
+
+			if (!data.queued) {
+				frappe.hide_progress();
+				frappe.realtime.off("bulk_transaction_progress");
+				return;
+			}
+
+			frappe.show_progress(
+				__("Creating {0}", [to_doctype]),
+				Math.max(count_of_rows - data.queued, 0),
+				count_of_rows,
+				__("{0} documents per second", [data.docs_per_second]),
+				true
+			);
+		});
+	},
 });
@@ -456,139 +456,195 @@ erpnext.TransactionController = class TransactionController extends erpnext.taxe
 				this.frm.fields_dict["items"].grid.grid_rows[item.idx - 1].remove();
 			} else {
 				item.pricing_rules = ''
-				return this.frm.call({
-					method: "erpnext.stock.get_item_details.get_item_details",
-					child: item,
-					args: {
-						doc: me.frm.doc,
-						args: {
-							item_code: item.item_code,
-							barcode: item.barcode,
-							serial_no: item.serial_no,
-							batch_no: item.batch_no,
-							set_warehouse: me.frm.doc.set_warehouse,
-							warehouse: item.warehouse,
-							customer: me.frm.doc.customer || me.frm.doc.party_name,
-							quotation_to: me.frm.doc.quotation_to,
-							supplier: me.frm.doc.supplier,
-							currency: me.frm.doc.currency,
-							is_internal_supplier: me.frm.doc.is_internal_supplier,
-							is_internal_customer: me.frm.doc.is_internal_customer,
-							update_stock: update_stock,
-							conversion_rate: me.frm.doc.conversion_rate,
-							price_list: me.frm.doc.selling_price_list || me.frm.doc.buying_price_list,
-							price_list_currency: me.frm.doc.price_list_currency,
-							plc_conversion_rate: me.frm.doc.plc_conversion_rate,
-							company: me.frm.doc.company,
-							order_type: me.frm.doc.order_type,
-							is_pos: cint(me.frm.doc.is_pos),
-							is_return: cint(me.frm.doc.is_return),
-							is_subcontracted: me.frm.doc.is_subcontracted,
-							ignore_pricing_rule: me.frm.doc.ignore_pricing_rule,
-							doctype: me.frm.doc.doctype,
-							name: me.frm.doc.name,
-							project: item.project || me.frm.doc.project,
-							qty: item.qty || 1,
-							net_rate: item.rate,
-							stock_qty: item.stock_qty,
-							conversion_factor: item.conversion_factor,
-							weight_per_unit: item.weight_per_unit,
-							uom: item.uom,
-							weight_uom: item.weight_uom,
-							manufacturer: item.manufacturer,
-							stock_uom: item.stock_uom,
-							pos_profile: cint(me.frm.doc.is_pos) ? me.frm.doc.pos_profile : '',
-							cost_center: item.cost_center,
-							tax_category: me.frm.doc.tax_category,
-							item_tax_template: item.item_tax_template,
-							child_doctype: item.doctype,
-							child_docname: item.name,
-							is_old_subcontracting_flow: me.frm.doc.is_old_subcontracting_flow,
-						}
-					},
+				return this.queue_item_details(item, {update_stock, show_batch_dialog});
+			}
+		}
+	}
 
-					callback: function(r) {
-						if(!r.exc) {
-							frappe.run_serially([
-								() => {
-									var d = locals[cdt][cdn];
-									me.add_taxes_from_item_tax_template(d.item_tax_rate);
-									if (d.free_item_data && d.free_item_data.length > 0) {
-										me.apply_product_discount(d);
-									}
-								},
-								() => {
-									// for internal customer instead of pricing rule directly apply valuation rate on item
-									if ((me.frm.doc.is_internal_customer || me.frm.doc.is_internal_supplier) && me.frm.doc.represents_company === me.frm.doc.company) {
-										me.get_incoming_rate(item, me.frm.posting_date, me.frm.posting_time,
-											me.frm.doc.doctype, me.frm.doc.company);
-									} else {
-										me.frm.script_manager.trigger("price_list_rate", cdt, cdn);
-									}
-								},
-								() => {
-									if (me.frm.doc.is_internal_customer || me.frm.doc.is_internal_supplier) {
-										me.calculate_taxes_and_totals();
-									}
-								},
-								() => me.toggle_conversion_factor(item),
-								() => {
-									if (show_batch_dialog)
-										return frappe.db.get_value("Item", item.item_code, ["has_batch_no", "has_serial_no"])
-											.then((r) => {
-												if (r.message &&
-												(r.message.has_batch_no || r.message.has_serial_no)) {
-													frappe.flags.hide_serial_batch_dialog = false;
-												}
-											});
-								},
-								() => {
-									// check if batch serial selector is disabled or not
-									if (show_batch_dialog && !frappe.flags.hide_serial_batch_dialog)
-										return frappe.db.get_single_value('Stock Settings', 'disable_serial_no_and_batch_selector')
-											.then((value) => {
-												if (value) {
-													frappe.flags.hide_serial_batch_dialog = true;
-												}
-											});
-								},
-								() => {
-									if(show_batch_dialog && !frappe.flags.hide_serial_batch_dialog) {
-										var d = locals[cdt][cdn];
-										$.each(r.message, function(k, v) {
-											if(!d[k]) d[k] = v;
-										});
-
-										if (d.has_batch_no && d.has_serial_no) {
-											d.batch_no = undefined;
-										}
-
-										erpnext.show_serial_batch_selector(me.frm, d, (item) => {
-											me.frm.script_manager.trigger('qty', item.doctype, item.name);
-											if (!me.frm.doc.set_warehouse)
-												me.frm.script_manager.trigger('warehouse', item.doctype, item.name);
-											me.apply_price_list(item, true);
-										}, undefined, !frappe.flags.hide_serial_batch_dialog);
-									}
-								},
-								() => me.conversion_factor(doc, cdt, cdn, true),
-								() => me.remove_pricing_rule(item),
-								() => {
-									if (item.apply_rule_on_other_items) {
-										let key = item.name;
-										me.apply_rule_on_other_items({key: item});
-									}
-								},
-								() => {
-									var company_currency = me.get_company_currency();
-									me.update_item_grid_labels(company_currency);
-								}
-							]);
-						}
-					}
-				});
+	queue_item_details(item, opts) {
+		// rows changed together, e.g. pasted in the grid, are fetched in one call
+		return new Promise((resolve) => {
+			if (!this.item_details_queue) {
+				this.item_details_queue = [];
+				setTimeout(() => this.fetch_queued_item_details(), 0);
 			}
+			this.item_details_queue.push({item, opts, resolve});
+		});
+	}
+
+	fetch_queued_item_details() {
+		var me = this;
+		const queue = this.item_details_queue;
+		this.item_details_queue = null;
+
+		if (queue.length === 1) {
+			const {item, opts, resolve} = queue[0];
+			return this.frm.call({
+				method: "erpnext.stock.get_item_details.get_item_details",
+				child: item,
+				args: {
+					doc: me.frm.doc,
+					args: me.get_item_details_args(item, opts.update_stock)
+				},
+				callback: function(r) {
+					if(!r.exc) {
+						me.after_item_details(item, r.message, opts.show_batch_dialog);
+					}
+				}
+			}).then(resolve, resolve);
 		}
+
+		return this.frm.call({
+			method: "erpnext.stock.get_item_details.get_items_details",
+			args: {
+				doc: me.frm.doc,
+				args_list: queue.map(({item, opts}) => me.get_item_details_args(item, opts.update_stock))
+			},
+			callback: function(r) {
+				if(!r.exc) {
+					const std_fields = ["doctype", ...frappe.model.std_fields_list, ...frappe.model.child_table_field_list];
+					queue.forEach(({item}, i) => {
+						let d = locals[item.doctype][item.name];
+						$.each(r.message[i], function(k, v) {
+							if (!std_fields.includes(k)) d[k] = v;
+						});
+					});
+					new Set(queue.map(({item}) => item.parentfield)).forEach(
+						(parentfield) => me.frm.refresh_field(parentfield)
+					);
+					queue.forEach(({item, opts}, i) => me.after_item_details(item, r.message[i], opts.show_batch_dialog));
+				}
+			}
+		}).then(() => queue.forEach(({resolve}) => resolve()), () => queue.forEach(({resolve}) => resolve()));
+	}
+
+	get_item_details_args(item, update_stock) {
+		var me = this;
+		return {
+			item_code: item.item_code,
+			barcode: item.barcode,
+			serial_no: item.serial_no,
+			batch_no: item.batch_no,
+			set_warehouse: me.frm.doc.set_warehouse,
+			warehouse: item.warehouse,
+			customer: me.frm.doc.customer || me.frm.doc.party_name,
+			quotation_to: me.frm.doc.quotation_to,
+			supplier: me.frm.doc.supplier,
+			currency: me.frm.doc.currency,
+			is_internal_supplier: me.frm.doc.is_internal_supplier,
+			is_internal_customer: me.frm.doc.is_internal_customer,
+			update_stock: update_stock,
+			conversion_rate: me.frm.doc.conversion_rate,
+			price_list: me.frm.doc.selling_price_list || me.frm.doc.buying_price_list,
+			price_list_currency: me.frm.doc.price_list_currency,
+			plc_conversion_rate: me.frm.doc.plc_conversion_rate,
+			company: me.frm.doc.company,
+			order_type: me.frm.doc.order_type,
+			is_pos: cint(me.frm.doc.is_pos),
+			is_return: cint(me.frm.doc.is_return),
+			is_subcontracted: me.frm.doc.is_subcontracted,
+			ignore_pricing_rule: me.frm.doc.ignore_pricing_rule,
+			doctype: me.frm.doc.doctype,
+			name: me.frm.doc.name,
+			project: item.project || me.frm.doc.project,
+			qty: item.qty || 1,
+			net_rate: item.rate,
+			stock_qty: item.stock_qty,
+			conversion_factor: item.conversion_factor,
+			weight_per_unit: item.weight_per_unit,
+			uom: item.uom,
+			weight_uom: item.weight_uom,
+			manufacturer: item.manufacturer,
+			stock_uom: item.stock_uom,
+			pos_profile: cint(me.frm.doc.is_pos) ? me.frm.doc.pos_profile : '',
+			cost_center: item.cost_center,
+			tax_category: me.frm.doc.tax_category,
+			item_tax_template: item.item_tax_template,
+			child_doctype: item.doctype,
+			child_docname: item.name,
+			is_old_subcontracting_flow: me.frm.doc.is_old_subcontracting_flow,
+		};
+	}
+
+	after_item_details(item, item_details, show_batch_dialog) {
+		var me = this;
+		var doc = me.frm.doc, cdt = item.doctype, cdn = item.name;
+
+		return frappe.run_serially([
+			() => {
+				var d = locals[cdt][cdn];
+				me.add_taxes_from_item_tax_template(d.item_tax_rate);
+				if (d.free_item_data && d.free_item_data.length > 0) {
+					me.apply_product_discount(d);
+				}
+			},
+			() => {
+				// for internal customer instead of pricing rule directly apply valuation rate on item
+				if ((me.frm.doc.is_internal_customer || me.frm.doc.is_internal_supplier) && me.frm.doc.represents_company === me.frm.doc.company) {
+					me.get_incoming_rate(item, me.frm.posting_date, me.frm.posting_time,
+						me.frm.doc.doctype, me.frm.doc.company);
+				} else {
+					me.frm.script_manager.trigger("price_list_rate", cdt, cdn);
+				}
+			},
+			() => {
+				if (me.frm.doc.is_internal_customer || me.frm.doc.is_internal_supplier) {
+					me.calculate_taxes_and_totals();
+				}
+			},
+			() => me.toggle_conversion_factor(item),
+			() => {
+				if (show_batch_dialog)
+					return frappe.db.get_value("Item", item.item_code, ["has_batch_no", "has_serial_no"])
+						.then((r) => {
+							if (r.message &&
+							(r.message.has_batch_no || r.message.has_serial_no)) {
+								frappe.flags.hide_serial_batch_dialog = false;
+							}
+						});
+			},
+			() => {
+				// check if batch serial selector is disabled or not
+				if (show_batch_dialog && !frappe.flags.hide_serial_batch_dialog)
+					return frappe.db.get_single_value('Stock Settings', 'disable_serial_no_and_batch_selector')
+						.then((value) => {
+							if (value) {
+								frappe.flags.hide_serial_batch_dialog = true;
+							}
+						});
+			},
+			() => {
+				if(show_batch_dialog && !frappe.flags.hide_serial_batch_dialog) {
+					var d = locals[cdt][cdn];
+					$.each(item_details, function(k, v) {
+						if(!d[k]) d[k] = v;
+					});
+
+					if (d.has_batch_no && d.has_serial_no) {
+						d.batch_no = undefined;
+					}
+
+					erpnext.show_serial_batch_selector(me.frm, d, (item) => {
+						me.frm.script_manager.trigger('qty', item.doctype, item.name);
+						if (!me.frm.doc.set_warehouse)
+							me.frm.script_manager.trigger('warehouse', item.doctype, item.name);
+						me.apply_price_list(item, true);
+					}, undefined, !frappe.flags.hide_serial_batch_dialog);
+				}
+			},
+			() => me.conversion_factor(doc, cdt, cdn, true),
+			() => me.remove_pricing_rule(item),
+			() => {
+				if (item.apply_rule_on_other_items) {
+					let key = item.name;
+					me.apply_rule_on_other_items({key: item});
+				}
+			},
+			() => {
+				var company_currency = me.get_company_currency();
+				me.update_item_grid_labels(company_currency);
+			}
+		]);
 	}
 
 	price_list_rate(doc, cdt, cdn) {
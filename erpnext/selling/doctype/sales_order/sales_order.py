@@ -29,6 +29,7 @@ from erpnext.manufacturing.doctype.production_plan.production_plan import (
 )
 from erpnext.selling.doctype.customer.customer import check_credit_limit
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
+from erpnext.setup.doctype.transaction_trend.transaction_trend import add_transaction_trends
 from erpnext.stock.doctype.item.item import get_item_defaults
 from erpnext.stock.get_item_details import get_bin_details, get_default_bom, get_price_list_rate
 from erpnext.stock.stock_balance import get_reserved_qty, update_bin_qty
@@ -342,7 +343,10 @@ class SalesOrder(SellingController):
 
 	def update_status(self, status):
 		self.check_modified_date()
+		was_closed = self.status == "Closed"
 		self.set_status(update=True, status=status)
+		if was_closed != (self.status == "Closed"):
+			add_transaction_trends(self, -1 if self.status == "Closed" else 1)
 		# Upon Sales Order Re-open, check for credit limit.
 		# Limit should be checked after the 'Hold/Closed' status is reset.
 		if status == "Draft" and self.docstatus == 1:
@@ -3,90 +3,360 @@
 
 
 import json
+import re
+import time
+from bisect import bisect_left
 
 import frappe
-from frappe.utils import cint
+from frappe.query_builder.functions import IfNull, Sum
+from frappe.utils import cint, create_batch, cstr, flt
 from frappe.utils.nestedset import get_root_of
 
 from erpnext.accounts.doctype.pos_invoice.pos_invoice import get_stock_availability
 from erpnext.accounts.doctype.pos_profile.pos_profile import get_child_nodes, get_item_groups
 from erpnext.stock.utils import scan_barcode
 
+ITEM_CATALOGUE_CACHE_KEY = "erpnext:pos_item_catalogue:"
+ITEM_CATALOGUE_VERSION_KEY = "erpnext:pos_item_catalogue_version"
+# seconds a catalogue is cached for, in case a change to it is not followed by `clear_item_catalogue`
+ITEM_CATALOGUE_TTL = 60 * 60
 
-def search_by_term(search_term, warehouse, price_list):
-	result = search_for_serial_or_batch_or_barcode_number(search_term) or {}
-	item_code = result.get("item_code", search_term)
-	serial_no = result.get("serial_no", "")
-	batch_no = result.get("batch_no", "")
-	barcode = result.get("barcode", "")
-	if not result:
-		return
-	item_doc = frappe.get_doc("Item", item_code)
-	if not item_doc:
-		return
-	item = {
-		"barcode": barcode,
-		"batch_no": batch_no,
-		"description": item_doc.description,
-		"is_stock_item": item_doc.is_stock_item,
-		"item_code": item_doc.name,
-		"item_image": item_doc.image,
-		"item_name": item_doc.item_name,
-		"serial_no": serial_no,
-		"stock_uom": item_doc.stock_uom,
-		"uom": item_doc.stock_uom,
-	}
-	if barcode:
-		barcode_info = next(filter(lambda x: x.barcode == barcode, item_doc.get("barcodes", [])), None)
-		if barcode_info and barcode_info.uom:
-			uom = next(filter(lambda x: x.uom == barcode_info.uom, item_doc.uoms), {})
-			item.update(
-				{
-					"uom": barcode_info.uom,
-					"conversion_factor": uom.get("conversion_factor", 1),
-				}
-			)
+# catalogues loaded by this process, reused while the version in redis is unchanged
+_item_catalogues = {}
 
-	item_stock_qty, is_stock_item = get_stock_availability(item_code, warehouse)
-	item_stock_qty = item_stock_qty // item.get("conversion_factor", 1)
-	item.update({"actual_qty": item_stock_qty})
 
-	price_filters = {
+@frappe.whitelist()
+def get_item_catalogue(pos_profile, price_list=None):
+	"""Items sold through the POS Profile with their barcodes, UOM conversion factors and prices in
+	`price_list`, cached until one of them changes. Also used by terminals to work offline."""
+	frappe.has_permission("POS Profile", doc=pos_profile, throw=True)
+
+	return get_cached_item_catalogue(pos_profile, price_list)
+
+
+def get_cached_item_catalogue(pos_profile, price_list=None):
+	if not price_list:
+		price_list = frappe.db.get_value("POS Profile", pos_profile, "selling_price_list")
+
+	version = frappe.cache().get_value(ITEM_CATALOGUE_VERSION_KEY)
+	if version is None:
+		version = bump_item_catalogue_version()
+
+	local_key = (frappe.local.site, price_list, pos_profile)
+	cached = _item_catalogues.get(local_key)
+	if cached and cached[0] == version and cached[1] > time.monotonic():
+		return cached[2]
+
+	cache_key = f"{ITEM_CATALOGUE_CACHE_KEY}{price_list}"
+	catalogue = frappe.cache().hget(cache_key, pos_profile)
+	if catalogue is None:
+		catalogue = build_item_catalogue(pos_profile, price_list)
+		frappe.cache().hset(cache_key, pos_profile, catalogue)
+		frappe.cache().expire(frappe.cache().make_key(cache_key), ITEM_CATALOGUE_TTL)
+
+	_item_catalogues[local_key] = (version, time.monotonic() + ITEM_CATALOGUE_TTL, catalogue)
+	return catalogue
+
+
+def bump_item_catalogue_version():
+	"""Invalidate the catalogues held by every process"""
+	version = frappe.generate_hash(length=10)
+	frappe.cache().set_value(ITEM_CATALOGUE_VERSION_KEY, version)
+	return version
+
+
+def build_item_catalogue(pos_profile, price_list):
+	item = frappe.qb.DocType("Item")
+	search_fields = [
+		d.fieldname
+		for d in frappe.get_all("POS Search Fields", fields=["fieldname"])
+		if d.fieldname not in ("item_code", "item_name")
+	]
+
+	query = (
+		frappe.qb.from_(item)
+		.select(
+			item.name.as_("item_code"),
+			item.item_name,
+			item.description,
+			item.stock_uom,
+			item.image.as_("item_image"),
+			item.is_stock_item,
+			item.item_group,
+			*(item[fieldname] for fieldname in search_fields),
+		)
+		.where(
+			(item.disabled == 0)
+			& (item.has_variants == 0)
+			& (item.is_sales_item == 1)
+			& (item.is_fixed_asset == 0)
+		)
+	)
+
+	if item_groups := get_pos_profile_item_groups(pos_profile):
+		query = query.where(item.item_group.isin(item_groups))
+
+	items, search_index = {}, []
+	for d in query.run(as_dict=True):
+		items[d.item_code] = {
+			"item_code": d.item_code,
+			"item_name": d.item_name,
+			"description": d.description,
+			"stock_uom": d.stock_uom,
+			"item_image": d.item_image,
+			"is_stock_item": d.is_stock_item,
+			"item_group": d.item_group,
+		}
+
+		tokens = set()
+		for value in (d.item_code, d.item_name, *(d.get(fieldname) for fieldname in search_fields)):
+			tokens.update(get_search_tokens(value))
+		search_index.extend([token, d.item_code] for token in tokens)
+
+	search_index.sort()
+
+	barcodes, uoms, prices = {}, {}, {}
+	item_codes = list(items)
+	for chunk in create_batch(item_codes, 1000):
+		for d in frappe.get_all(
+			"Item Barcode",
+			filters={"parent": ("in", chunk), "parenttype": "Item"},
+			fields=["barcode", "parent", "uom"],
+		):
+			barcodes[d.barcode] = {"item_code": d.parent, "uom": d.uom}
+
+		for d in frappe.get_all(
+			"UOM Conversion Detail",
+			filters={"parent": ("in", chunk), "parenttype": "Item"},
+			fields=["parent", "uom", "conversion_factor"],
+		):
+			uoms.setdefault(d.parent, {})[d.uom] = d.conversion_factor
+
+		for d in frappe.get_all(
+			"Item Price",
+			filters={"price_list": price_list, "item_code": ("in", chunk)},
+			fields=["item_code", "uom", "currency", "price_list_rate", "batch_no"],
+		):
+			prices.setdefault(d.pop("item_code"), []).append(d)
+
+	return {
+		"pos_profile": pos_profile,
 		"price_list": price_list,
-		"item_code": item_code,
+		"items": items,
+		"barcodes": barcodes,
+		"uoms": uoms,
+		"prices": prices,
+		"search_index": search_index,
 	}
 
-	if batch_no:
-		price_filters["batch_no"] = batch_no
 
-	price = frappe.get_list(
-		doctype="Item Price",
-		filters=price_filters,
-		fields=["uom", "currency", "price_list_rate", "batch_no"],
-	)
+def get_pos_profile_item_groups(pos_profile):
+	item_groups = set()
+	for row in frappe.get_cached_doc("POS Profile", pos_profile).get("item_groups"):
+		item_groups.update(d.name for d in get_child_nodes("Item Group", row.item_group))
+
+	return list(item_groups)
+
+
+def get_search_tokens(value):
+	"""The lowercased value and each of its words, which search terms are matched against as prefixes"""
+	value = cstr(value).strip().lower()
+	if not value:
+		return []
+
+	return [value, *re.split(r"[\W_]+", value)]
+
+
+def search_item_catalogue(catalogue, search_term):
+	"""Item codes having a token starting with each word of `search_term`"""
+	search_index = catalogue["search_index"]
+
+	matches = None
+	for word in get_search_tokens(search_term)[1:] or [search_term.lower()]:
+		if not word:
+			continue
+
+		word_matches = set()
+		for i in range(bisect_left(search_index, [word]), len(search_index)):
+			token, item_code = search_index[i]
+			if not token.startswith(word):
+				break
+			word_matches.add(item_code)
+
+		matches = word_matches if matches is None else matches & word_matches
+
+	return matches or set()
+
+
+def clear_item_catalogue(doc=None, method=None):
+	"""Drop the cached POS item catalogues affected by a change to `doc`"""
+	if doc and doc.doctype == "Item Price":
+		price_lists = {doc.price_list}
+		if previous := doc.get_doc_before_save():
+			price_lists.add(previous.price_list)
+
+		clear_price_list_catalogues(price_lists)
+	elif doc and doc.doctype == "Price List":
+		clear_price_list_catalogues([doc.name])
+	else:
+		frappe.cache().delete_keys(ITEM_CATALOGUE_CACHE_KEY)
+		bump_item_catalogue_version()
+
+
+def clear_price_list_catalogues(price_lists):
+	"""Drop the cached POS item catalogues of `price_lists`, also called when their Item Prices are
+	updated without doc events (e.g. with `frappe.db.set_value`)"""
+	for price_list in price_lists:
+		frappe.cache().delete_key(f"{ITEM_CATALOGUE_CACHE_KEY}{price_list}")
+
+	bump_item_catalogue_version()
+
+
+def get_stock_availability_for_items(item_codes, warehouse, catalogue):
+	"""Available qty of `item_codes` in `warehouse` less the qty reserved by POS Invoices, like
+	`get_stock_availability` does for a single item"""
+	stock_items = [
+		d for d in item_codes if d in catalogue["items"] and catalogue["items"][d]["is_stock_item"]
+	]
+	other_items = [d for d in item_codes if d not in stock_items]
+
+	available_qty = {}
+	if stock_items:
+		bin_qty = dict(
+			frappe.get_all(
+				"Bin",
+				filters={"item_code": ("in", stock_items), "warehouse": warehouse},
+				fields=["item_code", "actual_qty"],
+				as_list=1,
+			)
+		)
+
+		pos_invoice = frappe.qb.DocType("POS Invoice")
+		pos_invoice_item = frappe.qb.DocType("POS Invoice Item")
+		reserved_qty = dict(
+			frappe.qb.from_(pos_invoice)
+			.from_(pos_invoice_item)
+			.select(pos_invoice_item.item_code, Sum(pos_invoice_item.stock_qty))
+			.where(
+				(pos_invoice.name == pos_invoice_item.parent)
+				& (IfNull(pos_invoice.consolidated_invoice, "") == "")
+				& (pos_invoice.is_return == 0)
+				& (pos_invoice_item.docstatus == 1)
+				& (pos_invoice_item.item_code.isin(stock_items))
+				& (pos_invoice_item.warehouse == warehouse)
+			)
+			.groupby(pos_invoice_item.item_code)
+			.run()
+		)
+
+		for item_code in stock_items:
+			available_qty[item_code] = flt(bin_qty.get(item_code)) - flt(reserved_qty.get(item_code))
+
+	for item_code in other_items:
+		# product bundles and items outside the catalogue
+		available_qty[item_code] = get_stock_availability(item_code, warehouse)[0]
+
+	return available_qty
+
+
+def get_item_price(prices, uom, stock_uom, batch_no=None):
+	if batch_no:
+		prices = [p for p in prices if p.get("batch_no") == batch_no]
 
 	def __sort(p):
 		p_uom = p.get("uom")
-		if p_uom == item.get("uom"):
+		if p_uom == uom:
 			return 0
-		elif p_uom == item.get("stock_uom"):
+		elif p_uom == stock_uom:
 			return 1
 		else:
 			return 2
 
 	# sort by fallback preference. always pick exact uom match if available
-	price = sorted(price, key=__sort)
-	if len(price) > 0:
-		p = price.pop(0)
+	prices = sorted(prices, key=__sort)
+	return prices[0] if prices else {}
+
+
+def search_by_term(search_term, warehouse, price_list, pos_profile=None):
+	catalogue = get_cached_item_catalogue(pos_profile, price_list) if pos_profile else None
+
+	if catalogue and (barcode_data := catalogue["barcodes"].get(search_term)):
+		result = {"barcode": search_term, **barcode_data}
+	else:
+		result = search_for_serial_or_batch_or_barcode_number(search_term) or {}
+
+	item_code = result.get("item_code", search_term)
+	serial_no = result.get("serial_no", "")
+	batch_no = result.get("batch_no", "")
+	barcode = result.get("barcode", "")
+	if not result:
+		return
+
+	if catalogue and item_code in catalogue["items"]:
+		item = {
+			**catalogue["items"][item_code],
+			"uoms": catalogue["uoms"].get(item_code, {}),
+			"prices": catalogue["prices"].get(item_code, []),
+		}
+	else:
+		item = get_item_from_db(item_code, price_list)
+
+	uoms, prices = item.pop("uoms"), item.pop("prices")
+	item.pop("item_group", None)
+	item.update(
+		{
+			"barcode": barcode,
+			"batch_no": batch_no,
+			"serial_no": serial_no,
+			"uom": item["stock_uom"],
+		}
+	)
+
+	if barcode and result.get("uom"):
+		item.update(
+			{
+				"uom": result["uom"],
+				"conversion_factor": uoms.get(result["uom"], 1),
+			}
+		)
+
+	if not catalogue:
+		item_stock_qty = get_stock_availability(item_code, warehouse)[0]
+	else:
+		item_stock_qty = get_stock_availability_for_items([item_code], warehouse, catalogue)[item_code]
+
+	item_stock_qty = item_stock_qty // item.get("conversion_factor", 1)
+	item.update({"actual_qty": item_stock_qty})
+
+	if price := get_item_price(prices, item["uom"], item["stock_uom"], batch_no):
 		item.update(
 			{
-				"currency": p.get("currency"),
-				"price_list_rate": p.get("price_list_rate"),
+				"currency": price.get("currency"),
+				"price_list_rate": price.get("price_list_rate"),
 			}
 		)
+
 	return {"items": [item]}
 
 
+def get_item_from_db(item_code, price_list):
+	item_doc = frappe.get_cached_doc("Item", item_code)
+	return {
+		"description": item_doc.description,
+		"is_stock_item": item_doc.is_stock_item,
+		"item_code": item_doc.name,
+		"item_image": item_doc.image,
+		"item_name": item_doc.item_name,
+		"stock_uom": item_doc.stock_uom,
+		"uoms": {d.uom: d.conversion_factor for d in item_doc.uoms},
+		"prices": frappe.get_all(
+			"Item Price",
+			filters={"price_list": price_list, "item_code": item_code},
+			fields=["uom", "currency", "price_list_rate", "batch_no"],
+		),
+	}
+
+
 @frappe.whitelist()
 def get_items(start, page_length, price_list, item_group, pos_profile, search_term=""):
 	warehouse, hide_unavailable_items = frappe.db.get_value(
@@ -96,87 +366,47 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 	result = []
 
 	if search_term:
-		result = search_by_term(search_term, warehouse, price_list) or []
+		result = search_by_term(search_term, warehouse, price_list, pos_profile) or []
 		if result:
 			return result
 
 	if not frappe.db.exists("Item Group", item_group):
 		item_group = get_root_of("Item Group")
 
-	condition = get_conditions(search_term)
-	condition += get_item_group_condition(pos_profile)
+	catalogue = get_cached_item_catalogue(pos_profile, price_list)
+	item_groups = {d.name for d in get_child_nodes("Item Group", item_group)}
 
-	lft, rgt = frappe.db.get_value("Item Group", item_group, ["lft", "rgt"])
+	item_codes = search_item_catalogue(catalogue, search_term) if search_term else catalogue["items"]
+	item_codes = [d for d in item_codes if catalogue["items"][d]["item_group"] in item_groups]
 
-	bin_join_selection, bin_join_condition = "", ""
 	if hide_unavailable_items:
-		bin_join_selection = ", `tabBin` bin"
-		bin_join_condition = (
-			"AND bin.warehouse = %(warehouse)s AND bin.item_code = item.name AND bin.actual_qty > 0"
+		in_stock = set(
+			frappe.get_all(
+				"Bin",
+				filters={"warehouse": warehouse, "actual_qty": (">", 0)},
+				pluck="item_code",
+			)
 		)
+		item_codes = [d for d in item_codes if d in in_stock]
 
-	items_data = frappe.db.sql(
-		"""
-		SELECT
-			item.name AS item_code,
-			item.item_name,
-			item.description,
-			item.stock_uom,
-			item.image AS item_image,
-			item.is_stock_item
-		FROM
-			`tabItem` item {bin_join_selection}
-		WHERE
-			item.disabled = 0
-			AND item.has_variants = 0
-			AND item.is_sales_item = 1
-			AND item.is_fixed_asset = 0
-			AND item.item_group in (SELECT name FROM `tabItem Group` WHERE lft >= {lft} AND rgt <= {rgt})
-			AND {condition}
-			{bin_join_condition}
-		ORDER BY
-			item.name asc
-		LIMIT
-			{page_length} offset {start}""".format(
-			start=cint(start),
-			page_length=cint(page_length),
-			lft=cint(lft),
-			rgt=cint(rgt),
-			condition=condition,
-			bin_join_selection=bin_join_selection,
-			bin_join_condition=bin_join_condition,
-		),
-		{"warehouse": warehouse},
-		as_dict=1,
-	)
+	item_codes = sorted(item_codes)[cint(start) : cint(start) + cint(page_length)]
+	available_qty = get_stock_availability_for_items(item_codes, warehouse, catalogue)
 
-	if items_data:
-		items = [d.item_code for d in items_data]
-		item_prices_data = frappe.get_all(
-			"Item Price",
-			fields=["item_code", "price_list_rate", "currency"],
-			filters={"price_list": price_list, "item_code": ["in", items]},
+	for item_code in item_codes:
+		item = catalogue["items"][item_code]
+		item_price = get_item_price(
+			catalogue["prices"].get(item_code, []), item["stock_uom"], item["stock_uom"]
 		)
 
-		item_prices = {}
-		for d in item_prices_data:
-			item_prices[d.item_code] = d
-
-		for item in items_data:
-			item_code = item.item_code
-			item_price = item_prices.get(item_code) or {}
-			item_stock_qty, is_stock_item = get_stock_availability(item_code, warehouse)
-
-			row = {}
-			row.update(item)
-			row.update(
-				{
-					"price_list_rate": item_price.get("price_list_rate"),
-					"currency": item_price.get("currency"),
-					"actual_qty": item_stock_qty,
-				}
-			)
-			result.append(row)
+		row = {key: value for key, value in item.items() if key != "item_group"}
+		row.update(
+			{
+				"price_list_rate": item_price.get("price_list_rate"),
+				"currency": item_price.get("currency"),
+				"actual_qty": available_qty[item_code],
+			}
+		)
+		result.append(row)
 
 	return {"items": result}
 
@@ -186,36 +416,6 @@ def search_for_serial_or_batch_or_barcode_number(search_value: str) -> dict[str,
 	return scan_barcode(search_value)
 
 
-def get_conditions(search_term):
-	condition = "("
-	condition += """item.name like {search_term}
-		or item.item_name like {search_term}""".format(search_term=frappe.db.escape("%" + search_term + "%"))
-	condition += add_search_fields_condition(search_term)
-	condition += ")"
-
-	return condition
-
-
-def add_search_fields_condition(search_term):
-	condition = ""
-	search_fields = frappe.get_all("POS Search Fields", fields=["fieldname"])
-	if search_fields:
-		for field in search_fields:
-			condition += " or item.`{}` like {}".format(
-				field["fieldname"], frappe.db.escape("%" + search_term + "%")
-			)
-	return condition
-
-
-def get_item_group_condition(pos_profile):
-	cond = "and 1=1"
-	item_groups = get_item_groups(pos_profile)
-	if item_groups:
-		cond = "and item.item_group in (%s)" % (", ".join(["%s"] * len(item_groups)))
-
-	return cond % tuple(item_groups)
-
-
 @frappe.whitelist()
 @frappe.validate_and_sanitize_search_inputs
 def item_group_query(doctype, txt, searchfield, start, page_len, filters):
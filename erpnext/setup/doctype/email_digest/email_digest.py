@@ -63,31 +63,35 @@ class EmailDigest(Document):
 	@frappe.whitelist()
 	def send(self):
 		# send email only to enabled users
-		valid_users = [
-			p[0]
-			for p in frappe.db.sql(
-				"""select name from `tabUser`
-			where enabled=1"""
+		valid_users = set(frappe.get_all("User", filters={"enabled": 1}, pluck="name"))
+		recipients = [row.recipient for row in self.recipients if row.recipient in valid_users]
+		if not recipients:
+			return
+
+		# company metrics are computed once for all the recipients, and recipients
+		# receiving the same digest share an Email Queue entry
+		context = self.get_common_context()
+		recipients_by_message = {}
+		for recipient in recipients:
+			msg_for_this_recipient = self.get_msg_html(recipient, context)
+			if msg_for_this_recipient:
+				recipients_by_message.setdefault(msg_for_this_recipient, []).append(recipient)
+
+		for message, message_recipients in recipients_by_message.items():
+			frappe.sendmail(
+				recipients=message_recipients,
+				subject=_("{0} Digest").format(self.frequency),
+				message=message,
+				reference_doctype=self.doctype,
+				reference_name=self.name,
+				unsubscribe_message=_("Unsubscribe from this Email Digest"),
 			)
-		]
 
-		if self.recipients:
-			for row in self.recipients:
-				msg_for_this_recipient = self.get_msg_html()
-				if msg_for_this_recipient and row.recipient in valid_users:
-					frappe.sendmail(
-						recipients=row.recipient,
-						subject=_("{0} Digest").format(self.frequency),
-						message=msg_for_this_recipient,
-						reference_doctype=self.doctype,
-						reference_name=self.name,
-						unsubscribe_message=_("Unsubscribe from this Email Digest"),
-					)
+	def get_common_context(self):
+		"""Content of the digest that is the same for every recipient"""
+		from erpnext.setup.doctype.email_digest.quotes import get_random_quote
 
-	def get_msg_html(self):
-		"""Build email digest content"""
 		frappe.flags.ignore_account_permission = True
-		from erpnext.setup.doctype.email_digest.quotes import get_random_quote
 
 		context = frappe._dict()
 		context.update(self.__dict__)
@@ -96,15 +100,8 @@ class EmailDigest(Document):
 		self.set_style(context)
 		self.set_accounting_cards(context)
 
-		if self.get("calendar_events"):
-			context.events, context.event_count = self.get_calendar_events()
-		if self.get("todo_list"):
-			context.todo_list = self.get_todo_list()
-			context.todo_count = self.get_todo_count()
-		if self.get("notifications"):
-			context.notifications = self.get_notifications()
 		if self.get("issue"):
-			context.issue_list = self.get_issue_list()
+			context.issue_list = self.get_issue_list(check_permission=False)
 			context.issue_count = self.get_issue_count()
 		if self.get("project"):
 			context.project_list = self.get_project_list()
@@ -121,11 +118,30 @@ class EmailDigest(Document):
 			if not context.purchase_order_list:
 				frappe.throw(_("No items to be received are overdue"))
 
+		frappe.flags.ignore_account_permission = False
+
+		return context
+
+	def get_msg_html(self, user_id=None, common_context=None):
+		"""Build email digest content"""
+		if not user_id:
+			user_id = frappe.session.user
+
+		context = frappe._dict(common_context or self.get_common_context())
+
+		if self.get("calendar_events"):
+			context.events, context.event_count = self.get_calendar_events(user_id)
+		if self.get("todo_list"):
+			context.todo_list = self.get_todo_list(user_id)
+			context.todo_count = self.get_todo_count(user_id)
+		if self.get("notifications"):
+			context.notifications = self.get_notifications()
+		if self.get("issue") and not self.has_issue_permission(user_id):
+			context.issue_list = None
+
 		if not context:
 			return None
 
-		frappe.flags.ignore_account_permission = False
-
 		# style
 		return frappe.render_template(
 			"erpnext/setup/doctype/email_digest/templates/default.html", context, is_path=True
@@ -167,13 +183,13 @@ class EmailDigest(Document):
 
 		return notifications
 
-	def get_calendar_events(self):
+	def get_calendar_events(self, user_id=None):
 		"""Get calendar events for given user"""
 		from frappe.desk.doctype.event.event import get_events
 
 		from_date, to_date = get_future_date_for_calendaer_event(self.frequency)
 
-		events = get_events(from_date, to_date)
+		events = get_events(from_date, to_date, user=user_id)
 
 		event_count = 0
 		for _i, e in enumerate(events):
@@ -214,14 +230,9 @@ class EmailDigest(Document):
 			(user_id, user_id),
 		)[0][0]
 
-	def get_issue_list(self, user_id=None):
+	def get_issue_list(self, user_id=None, check_permission=True):
 		"""Get issue list"""
-		if not user_id:
-			user_id = frappe.session.user
-
-		meta = frappe.get_meta("Issue")
-		role_permissions = frappe.permissions.get_role_permissions(meta, user_id)
-		if not role_permissions.get("read"):
+		if check_permission and not self.has_issue_permission(user_id):
 			return None
 
 		issue_list = frappe.db.sql(
@@ -236,6 +247,13 @@ class EmailDigest(Document):
 
 		return issue_list
 
+	def has_issue_permission(self, user_id=None):
+		if not user_id:
+			user_id = frappe.session.user
+
+		meta = frappe.get_meta("Issue")
+		return frappe.permissions.get_role_permissions(meta, user_id).get("read")
+
 	def get_issue_count(self):
 		"""Get count of Issue"""
 		return frappe.db.sql(
@@ -294,12 +312,9 @@ class EmailDigest(Document):
 		):
 			if self.get(key):
 				cache_key = f"email_digest:card:{self.company}:{self.frequency}:{key}:{self.from_date}"
-				card = cache.get(cache_key)
-
-				if card:
-					card = frappe.safe_eval(card)
+				card = cache.get_value(cache_key)
 
-				else:
+				if not card:
 					card = frappe._dict(getattr(self, "get_" + key)())
 
 					# format values
@@ -1,10 +1,67 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-import unittest
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from erpnext.setup.doctype.email_digest.email_digest import EmailDigest
+from erpnext.support.doctype.issue.test_issue import make_issue
 
 # test_records = frappe.get_test_records('Email Digest')
 
 
-class TestEmailDigest(unittest.TestCase):
-	pass
+class TestEmailDigest(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_send_digest_to_multiple_recipients(self):
+		support_user = make_user("digest_support@example.com", "Support Team")
+		accounts_user = make_user("digest_accounts@example.com", "Accounts User")
+		make_issue()
+
+		digest = frappe.get_doc(
+			{
+				"doctype": "Email Digest",
+				"company": "_Test Company",
+				"frequency": "Daily",
+				"issue": 1,
+				"recipients": [{"recipient": support_user}, {"recipient": accounts_user}],
+			}
+		)
+
+		with (
+			patch.object(
+				EmailDigest, "get_common_context", autospec=True, side_effect=EmailDigest.get_common_context
+			) as get_common_context,
+			patch("frappe.sendmail") as sendmail,
+		):
+			digest.send()
+
+		# company metrics are computed once for all the recipients
+		self.assertEqual(get_common_context.call_count, 1)
+
+		messages = {}
+		for call in sendmail.call_args_list:
+			for recipient in call.kwargs["recipients"]:
+				messages[recipient] = call.kwargs["message"]
+
+		# only recipients with access to issues get the issue list
+		self.assertIn("Open Issues", messages[support_user])
+		self.assertNotIn("Open Issues", messages[accounts_user])
+
+
+def make_user(email, role):
+	if not frappe.db.exists("User", email):
+		frappe.get_doc(
+			{
+				"doctype": "User",
+				"email": email,
+				"first_name": email.split("@")[0],
+				"send_welcome_email": 0,
+				"roles": [{"doctype": "Has Role", "role": role}],
+			}
+		).insert(ignore_permissions=True)
+
+	return email
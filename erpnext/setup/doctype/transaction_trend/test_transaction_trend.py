@@ -0,0 +1,52 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import get_first_day, nowdate
+
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.report.sales_invoice_trends.sales_invoice_trends import execute
+from erpnext.accounts.utils import get_fiscal_year
+from erpnext.setup.doctype.transaction_trend.transaction_trend import rebuild_transaction_trends
+from erpnext.stock.doctype.item.test_item import make_item
+
+
+class TestTransactionTrend(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_trends_follow_submitted_invoices(self):
+		item_code = make_item("_Test Transaction Trend Item", {"is_stock_item": 0}).name
+
+		def get_trend():
+			return frappe.get_all(
+				"Transaction Trend",
+				filters={"voucher_type": "Sales Invoice", "item_code": item_code},
+				fields=["posting_month", "party", "stock_qty", "base_net_amount"],
+				as_list=1,
+			)
+
+		si = create_sales_invoice(item_code=item_code, qty=2, rate=100)
+		create_sales_invoice(item_code=item_code, qty=3, rate=100)
+
+		trend = [(get_first_day(nowdate()), si.customer, 5.0, 500.0)]
+		self.assertEqual(get_trend(), trend)
+
+		filters = frappe._dict(
+			{
+				"company": si.company,
+				"fiscal_year": get_fiscal_year(nowdate(), company=si.company)[0],
+				"period": "Yearly",
+				"based_on": "Item",
+			}
+		)
+		row = next(row for row in execute(filters)[1] if row[0] == item_code)
+		self.assertEqual(row[-2:], [5.0, 500.0])
+
+		# the backfill rebuilds the same trends
+		rebuild_transaction_trends("Sales Invoice")
+		self.assertEqual(get_trend(), trend)
+
+		si.cancel()
+		self.assertEqual(get_trend(), [(get_first_day(nowdate()), si.customer, 3.0, 300.0)])
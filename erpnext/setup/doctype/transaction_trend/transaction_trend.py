@@ -0,0 +1,245 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.custom import ConstantColumn
+from frappe.query_builder.functions import Abs
+from frappe.utils import cstr, flt, get_first_day, now
+
+TREND_DOCTYPES = (
+	"Quotation",
+	"Sales Order",
+	"Delivery Note",
+	"Sales Invoice",
+	"Purchase Order",
+	"Purchase Receipt",
+	"Purchase Invoice",
+)
+
+DIMENSIONS = (
+	"posting_month",
+	"party_type",
+	"party",
+	"party_name",
+	"customer_group",
+	"territory",
+	"item_code",
+	"item_name",
+	"item_group",
+	"project",
+)
+
+
+class TransactionTrend(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Transaction Trend", ["voucher_type", "company", "posting_month"])
+
+
+def update_transaction_trends(doc, method=None):
+	"""Add the items of a submitted transaction to its monthly trends, or remove them on cancel"""
+	if doc.doctype in ("Sales Order", "Purchase Order") and doc.status == "Closed":
+		# closed orders are left out of the trends when closed
+		return
+
+	add_transaction_trends(doc, -1 if method == "on_cancel" else 1)
+
+
+def add_transaction_trends(doc, sign=1):
+	"""Add (or with `sign` -1, subtract) the qty and amount of the items of `doc` to its monthly trends"""
+	rows = get_transaction_trend_rows(doc)
+	if not rows:
+		return
+
+	trend = frappe.qb.DocType("Transaction Trend")
+	existing = {
+		tuple(cstr(d[fieldname]) for fieldname in DIMENSIONS): d.name
+		for d in (
+			frappe.qb.from_(trend)
+			.select(trend.name, *DIMENSIONS)
+			.where(
+				(trend.voucher_type == doc.doctype)
+				& (trend.company == doc.company)
+				& trend.posting_month.isin(list({key[0] for key in rows}))
+				& trend.item_code.isin(list({key[6] for key in rows}))
+			)
+			.run(as_dict=True)
+		)
+	}
+
+	new_rows, updated = [], []
+	for key, (stock_qty, base_net_amount) in rows.items():
+		stock_qty, base_net_amount = sign * stock_qty, sign * base_net_amount
+		if name := existing.get(key):
+			(
+				frappe.qb.update(trend)
+				.set(trend.stock_qty, trend.stock_qty + stock_qty)
+				.set(trend.base_net_amount, trend.base_net_amount + base_net_amount)
+				.where(trend.name == name)
+			).run()
+			updated.append(name)
+		else:
+			new_rows.append((doc.doctype, doc.company, *key, stock_qty, base_net_amount))
+
+	if sign < 0 and updated:
+		# drop the rows emptied by the cancellation so they do not block deleting their masters
+		frappe.qb.from_(trend).delete().where(
+			trend.name.isin(updated) & (Abs(trend.stock_qty) < 1e-6) & (Abs(trend.base_net_amount) < 1e-6)
+		).run()
+
+	insert_transaction_trends(new_rows)
+
+
+def get_transaction_trend_rows(doc):
+	"""Qty and amount of the items of `doc` keyed by the dimensions of the trends reports"""
+	party_type, party, party_name = get_party_details(doc)
+	is_purchase = party_type == "Supplier"
+
+	rows = {}
+	for item in doc.get("items"):
+		key = get_transaction_trend_key(
+			doc.get("posting_date") or doc.get("transaction_date"),
+			party_type,
+			party,
+			party_name,
+			doc.get("customer_group"),
+			doc.get("territory"),
+			item.item_code,
+			item.item_name,
+			item.item_group,
+			item.get("project") if is_purchase else doc.get("project"),
+		)
+
+		stock_qty, base_net_amount = rows.get(key, (0.0, 0.0))
+		rows[key] = (stock_qty + flt(item.stock_qty), base_net_amount + flt(item.base_net_amount))
+
+	return rows
+
+
+def get_party_details(doc):
+	if doc.doctype == "Quotation":
+		return doc.quotation_to, doc.party_name, doc.customer_name
+	elif doc.doctype in ("Sales Order", "Delivery Note", "Sales Invoice"):
+		return "Customer", doc.customer, doc.customer_name
+	else:
+		return "Supplier", doc.supplier, doc.supplier_name
+
+
+def get_transaction_trend_key(posting_date, *dimensions):
+	return (cstr(get_first_day(posting_date)), *(cstr(value) for value in dimensions))
+
+
+def insert_transaction_trends(rows):
+	if not rows:
+		return
+
+	timestamp, user = now(), frappe.session.user
+	frappe.db.bulk_insert(
+		"Transaction Trend",
+		fields=[
+			"name",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			"voucher_type",
+			"company",
+			*DIMENSIONS,
+			"stock_qty",
+			"base_net_amount",
+		],
+		values=[(frappe.generate_hash(length=10), timestamp, timestamp, user, user, *row) for row in rows],
+	)
+
+
+def rebuild_transaction_trends(voucher_type=None):
+	"""Rebuild the monthly trends from the submitted transactions.
+
+	Runs as a patch and can be run manually with
+	`bench execute erpnext.setup.doctype.transaction_trend.transaction_trend.rebuild_transaction_trends`
+	"""
+	for doctype in [voucher_type] if voucher_type else TREND_DOCTYPES:
+		frappe.db.delete("Transaction Trend", {"voucher_type": doctype})
+
+		rows = {}
+		for d in get_submitted_transaction_items(doctype):
+			key = (
+				d.company,
+				*get_transaction_trend_key(
+					d.posting_date,
+					d.party_type,
+					d.party,
+					d.party_name,
+					d.customer_group,
+					d.territory,
+					d.item_code,
+					d.item_name,
+					d.item_group,
+					d.project,
+				),
+			)
+
+			stock_qty, base_net_amount = rows.get(key, (0.0, 0.0))
+			rows[key] = (stock_qty + flt(d.stock_qty), base_net_amount + flt(d.base_net_amount))
+
+		insert_transaction_trends(
+			[
+				(doctype, *key, stock_qty, base_net_amount)
+				for key, (stock_qty, base_net_amount) in rows.items()
+			]
+		)
+
+
+def get_submitted_transaction_items(doctype):
+	parent = frappe.qb.DocType(doctype)
+	child = frappe.qb.DocType(f"{doctype} Item")
+
+	if doctype == "Quotation":
+		party_columns = [parent.quotation_to, parent.party_name, parent.customer_name]
+	elif doctype in ("Sales Order", "Delivery Note", "Sales Invoice"):
+		party_columns = [ConstantColumn("Customer"), parent.customer, parent.customer_name]
+	else:
+		party_columns = [ConstantColumn("Supplier"), parent.supplier, parent.supplier_name]
+
+	is_purchase = doctype in ("Purchase Order", "Purchase Receipt", "Purchase Invoice")
+	if is_purchase:
+		project = child.project
+	elif doctype == "Quotation":
+		project = ConstantColumn("")
+	else:
+		project = parent.project
+
+	if doctype in ("Quotation", "Sales Order", "Purchase Order"):
+		posting_date = parent.transaction_date
+	else:
+		posting_date = parent.posting_date
+
+	query = (
+		frappe.qb.from_(parent)
+		.join(child)
+		.on(child.parent == parent.name)
+		.select(
+			parent.company,
+			posting_date.as_("posting_date"),
+			party_columns[0].as_("party_type"),
+			party_columns[1].as_("party"),
+			party_columns[2].as_("party_name"),
+			(ConstantColumn("") if is_purchase else parent.customer_group).as_("customer_group"),
+			(ConstantColumn("") if is_purchase else parent.territory).as_("territory"),
+			child.item_code,
+			child.item_name,
+			child.item_group,
+			project.as_("project"),
+			child.stock_qty,
+			child.base_net_amount,
+		)
+		.where((parent.docstatus == 1) & (child.parenttype == doctype))
+	)
+
+	if doctype in ("Sales Order", "Purchase Order"):
+		query = query.where(parent.status != "Closed")
+
+	return query.run(as_dict=True)
@@ -116,6 +116,9 @@ class Batch(Document):
 	def onload(self):
 		self.image = frappe.db.get_value("Item", self.item, "image")
 
+	def on_trash(self):
+		frappe.db.delete("Batch Bin", {"batch_no": self.name})
+
 	def after_delete(self):
 		revert_series_if_last(get_batch_naming_series(), self.name)
 
@@ -175,41 +178,51 @@ def get_batch_qty(batch_no=None, warehouse=None, item_code=None, posting_date=No
 	:param warehouse: Optional - give qty for this warehouse
 	:param item_code: Optional - give qty for this item"""
 
-	sle = frappe.qb.DocType("Stock Ledger Entry")
+	batch_bin = frappe.qb.DocType("Batch Bin")
 
 	out = 0
 	if batch_no and warehouse:
-		query = (
-			frappe.qb.from_(sle)
-			.select(Sum(sle.actual_qty))
-			.where((sle.is_cancelled == 0) & (sle.warehouse == warehouse) & (sle.batch_no == batch_no))
+		out = flt(
+			(
+				frappe.qb.from_(batch_bin)
+				.select(Sum(batch_bin.actual_qty))
+				.where((batch_bin.warehouse == warehouse) & (batch_bin.batch_no == batch_no))
+			).run()[0][0]
 		)
 
 		if posting_date:
 			if posting_time is None:
 				posting_time = nowtime()
 
-			query = query.where(
-				CombineDatetime(sle.posting_date, sle.posting_time)
-				<= CombineDatetime(posting_date, posting_time)
+			# batch bins hold the current qty, take back what was posted after the given time
+			sle = frappe.qb.DocType("Stock Ledger Entry")
+			out -= flt(
+				(
+					frappe.qb.from_(sle)
+					.select(Sum(sle.actual_qty))
+					.where(
+						(sle.is_cancelled == 0)
+						& (sle.warehouse == warehouse)
+						& (sle.batch_no == batch_no)
+						& (sle.posting_datetime > CombineDatetime(posting_date, posting_time))
+					)
+				).run()[0][0]
 			)
 
-		out = query.run(as_list=True)[0][0] or 0
-
 	if batch_no and not warehouse:
 		out = (
-			frappe.qb.from_(sle)
-			.select(sle.warehouse, Sum(sle.actual_qty).as_("qty"))
-			.where((sle.is_cancelled == 0) & (sle.batch_no == batch_no))
-			.groupby(sle.warehouse)
+			frappe.qb.from_(batch_bin)
+			.select(batch_bin.warehouse, Sum(batch_bin.actual_qty).as_("qty"))
+			.where(batch_bin.batch_no == batch_no)
+			.groupby(batch_bin.warehouse)
 		).run(as_dict=True)
 
 	if not batch_no and item_code and warehouse:
 		out = (
-			frappe.qb.from_(sle)
-			.select(sle.batch_no, Sum(sle.actual_qty).as_("qty"))
-			.where((sle.is_cancelled == 0) & (sle.item_code == item_code) & (sle.warehouse == warehouse))
-			.groupby(sle.batch_no)
+			frappe.qb.from_(batch_bin)
+			.select(batch_bin.batch_no, Sum(batch_bin.actual_qty).as_("qty"))
+			.where((batch_bin.item_code == item_code) & (batch_bin.warehouse == warehouse))
+			.groupby(batch_bin.batch_no)
 		).run(as_dict=True)
 
 	return out
@@ -307,20 +320,19 @@ def get_batches(item_code, warehouse, qty=1, throw=False, serial_no=None):
 	from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
 	batch = frappe.qb.DocType("Batch")
-	sle = frappe.qb.DocType("Stock Ledger Entry")
+	batch_bin = frappe.qb.DocType("Batch Bin")
 
 	query = (
 		frappe.qb.from_(batch)
-		.join(sle)
-		.on(batch.batch_id == sle.batch_no)
+		.join(batch_bin)
+		.on(batch.batch_id == batch_bin.batch_no)
 		.select(
 			batch.batch_id,
-			Sum(sle.actual_qty).as_("qty"),
+			Sum(batch_bin.actual_qty).as_("qty"),
 		)
 		.where(
-			(sle.item_code == item_code)
-			& (sle.warehouse == warehouse)
-			& (sle.is_cancelled == 0)
+			(batch_bin.item_code == item_code)
+			& (batch_bin.warehouse == warehouse)
 			& ((batch.expiry_date >= CurDate()) | (batch.expiry_date.isnull()))
 		)
 		.groupby(batch.batch_id)
@@ -0,0 +1,99 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import flt, now
+
+
+class BatchBin(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Batch Bin", ["batch_no", "warehouse"])
+	frappe.db.add_index("Batch Bin", ["item_code", "warehouse"])
+
+
+def update_batch_bin_qty(item_code, warehouse, batch_no, qty):
+	"""Add `qty` to the actual qty of `batch_no` in `warehouse`"""
+	if not (batch_no and flt(qty)):
+		return
+
+	name = frappe.db.get_value(
+		"Batch Bin", {"item_code": item_code, "warehouse": warehouse, "batch_no": batch_no}
+	)
+
+	if not name:
+		batch_bin = frappe.get_doc(
+			doctype="Batch Bin", item_code=item_code, warehouse=warehouse, batch_no=batch_no, actual_qty=qty
+		)
+		batch_bin.flags.ignore_permissions = 1
+		batch_bin.insert()
+		return
+
+	batch_bin = frappe.qb.DocType("Batch Bin")
+	(
+		frappe.qb.update(batch_bin)
+		.set(batch_bin.actual_qty, batch_bin.actual_qty + flt(qty))
+		.where(batch_bin.name == name)
+	).run()
+
+
+def cancel_batch_bin_qty(voucher_type, voucher_no):
+	"""Reverse the batch qty of the active Stock Ledger Entries of a voucher being cancelled"""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	for item_code, warehouse, batch_no, qty in (
+		frappe.qb.from_(sle)
+		.select(sle.item_code, sle.warehouse, sle.batch_no, Sum(sle.actual_qty))
+		.where(
+			(sle.voucher_type == voucher_type)
+			& (sle.voucher_no == voucher_no)
+			& (sle.is_cancelled == 0)
+			& (sle.batch_no.isnotnull())
+			& (sle.batch_no != "")
+		)
+		.groupby(sle.item_code, sle.warehouse, sle.batch_no)
+	).run():
+		update_batch_bin_qty(item_code, warehouse, batch_no, -flt(qty))
+
+
+def repost_batch_bins(item_code=None):
+	"""Recompute the batch bins (of `item_code`) from the Stock Ledger.
+
+	Can be run manually with
+	`bench execute erpnext.stock.doctype.batch_bin.batch_bin.repost_batch_bins`
+	"""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	query = (
+		frappe.qb.from_(sle)
+		.select(sle.item_code, sle.warehouse, sle.batch_no, Sum(sle.actual_qty))
+		.where((sle.is_cancelled == 0) & (sle.batch_no.isnotnull()) & (sle.batch_no != ""))
+		.groupby(sle.item_code, sle.warehouse, sle.batch_no)
+	)
+
+	if item_code:
+		query = query.where(sle.item_code == item_code)
+
+	frappe.db.delete("Batch Bin", {"item_code": item_code} if item_code else {})
+
+	timestamp, user = now(), frappe.session.user
+	values = [
+		(frappe.generate_hash(length=10), timestamp, timestamp, user, user, *row) for row in query.run()
+	]
+	frappe.db.bulk_insert(
+		"Batch Bin",
+		fields=[
+			"name",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			"item_code",
+			"warehouse",
+			"batch_no",
+			"actual_qty",
+		],
+		values=values,
+	)
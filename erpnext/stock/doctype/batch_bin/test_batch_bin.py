@@ -0,0 +1,52 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, nowdate
+
+from erpnext.stock.doctype.batch.batch import get_batch_qty
+from erpnext.stock.doctype.batch_bin.batch_bin import repost_batch_bins
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+
+class TestBatchBin(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_batch_bin_follows_stock_ledger(self):
+		item_code = make_item(
+			"_Test Batch Bin Item", {"has_batch_no": 1, "create_new_batch": 1, "is_stock_item": 1}
+		).name
+		warehouse = "_Test Warehouse - _TC"
+
+		receipt = make_stock_entry(
+			item_code=item_code,
+			target=warehouse,
+			qty=10,
+			basic_rate=100,
+			posting_date=add_days(nowdate(), -2),
+		)
+		batch_no = receipt.items[0].batch_no
+
+		issue = make_stock_entry(
+			item_code=item_code,
+			source=warehouse,
+			qty=4,
+			batch_no=batch_no,
+			posting_date=nowdate(),
+		)
+
+		self.assertEqual(get_batch_qty(batch_no, warehouse), 6)
+		self.assertEqual(get_batch_qty(batch_no, warehouse, posting_date=add_days(nowdate(), -1)), 10)
+		self.assertEqual(get_batch_qty(batch_no=batch_no), [{"warehouse": warehouse, "qty": 6}])
+		self.assertEqual(frappe.db.get_value("Batch", batch_no, "batch_qty"), 6)
+
+		# reconciling from the stock ledger gives the same qty
+		repost_batch_bins(item_code)
+		self.assertEqual(get_batch_qty(batch_no, warehouse), 6)
+
+		issue.cancel()
+		self.assertEqual(get_batch_qty(batch_no, warehouse), 10)
+		self.assertEqual(frappe.db.get_value("Batch", batch_no, "batch_qty"), 10)
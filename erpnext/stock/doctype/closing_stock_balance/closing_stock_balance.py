@@ -11,6 +11,10 @@ from frappe.model.document import Document
 from frappe.utils import get_link_to_form, gzip_decompress, parse_json
 from frappe.utils.background_jobs import enqueue
 
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	is_stock_balance_snapshot_enabled,
+	make_stock_balance_snapshot,
+)
 from erpnext.stock.report.stock_balance.stock_balance import execute
 
 
@@ -125,6 +129,11 @@ def prepare_closing_stock_balance(name):
 	try:
 		doc.create_closing_stock_balance_entries()
 		doc.db_set("status", "Completed")
+
+		if is_stock_balance_snapshot_enabled() and not (
+			doc.warehouse or doc.item_code or doc.item_group or doc.warehouse_type
+		):
+			make_stock_balance_snapshot(doc.company, doc.to_date)
 	except Exception:
 		doc.db_set("status", "Failed")
 		doc.log_error(title="Closing Stock Balance Failed")
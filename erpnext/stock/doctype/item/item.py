@@ -25,7 +25,8 @@ import erpnext
 from erpnext.controllers.item_variant import (
 	ItemVariantExistsError,
 	copy_attributes_to_variant,
-	get_variant,
+	find_variant,
+	get_variant_signature,
 	make_variant_item_code,
 	validate_item_variant_attributes,
 )
@@ -105,6 +106,7 @@ class Item(Document):
 		self.validate_stock_exists_for_template_item()
 		self.validate_attributes()
 		self.validate_variant_attributes()
+		self.set_variant_signature()
 		self.validate_variant_based_on_change()
 		self.validate_fixed_asset()
 		self.clear_retain_sample()
@@ -888,7 +890,10 @@ class Item(Document):
 				d.idx = i + 1
 				args[d.attribute] = d.attribute_value
 
-			variant = get_variant(self.variant_of, args, self.name)
+			if not args:
+				frappe.throw(_("Please specify at least one attribute in the Attributes table"))
+
+			variant = find_variant(self.variant_of, args, self.name)
 			if variant:
 				frappe.throw(
 					_("Item variant {0} exists with same attributes").format(variant), ItemVariantExistsError
@@ -900,6 +905,14 @@ class Item(Document):
 			for d in self.attributes:
 				d.variant_of = self.variant_of
 
+	def set_variant_signature(self):
+		if self.variant_of and self.variant_based_on == "Item Attribute":
+			self.variant_signature = get_variant_signature(
+				{d.attribute: d.attribute_value for d in self.attributes}
+			)
+		else:
+			self.variant_signature = None
+
 	def cant_change(self):
 		if self.is_new():
 			return
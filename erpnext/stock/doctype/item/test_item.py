@@ -13,6 +13,7 @@ from frappe.utils import add_days, today
 from erpnext.controllers.item_variant import (
 	InvalidItemAttributeValueError,
 	ItemVariantExistsError,
+	create_multiple_variants,
 	create_variant,
 	get_variant,
 )
@@ -398,6 +399,28 @@ class TestItem(FrappeTestCase):
 		variant.item_code = "_Test Variant Item-L-duplicate"
 		self.assertRaises(ItemVariantExistsError, variant.save)
 
+	def test_create_multiple_variants(self):
+		template = make_item(
+			"_Test Multiple Variants Template",
+			{
+				"attributes": [{"attribute": "Test Size"}, {"attribute": "Test Colour"}],
+				"has_variants": 1,
+			},
+		)
+
+		args = {"Test Size": ["Small", "Medium"], "Test Colour": ["Red", "Green", "Blue"]}
+		self.assertEqual(create_multiple_variants(template.name, args), 6)
+
+		# the signature does not depend on the order of the attributes
+		variant = get_variant(template.name, {"Test Colour": "Green", "Test Size": "Medium"})
+		self.assertEqual(variant, f"{template.name}-M-G")
+		self.assertFalse(get_variant(template.name, {"Test Size": "Large", "Test Colour": "Green"}))
+
+		# existing combinations are skipped
+		args["Test Size"].append("Large")
+		self.assertEqual(create_multiple_variants(template.name, args), 3)
+		self.assertEqual(frappe.db.count("Item", {"variant_of": template.name}), 9)
+
 	def test_copy_fields_from_template_to_variants(self):
 		frappe.delete_doc_if_exists("Item", "_Test Variant Item-XL", force=1)
 
@@ -9,6 +9,7 @@ from frappe.utils import flt
 
 from erpnext.controllers.item_variant import (
 	InvalidItemAttributeValueError,
+	update_variant_signatures,
 	validate_is_incremental,
 	validate_item_attribute_value,
 )
@@ -30,6 +31,10 @@ class ItemAttribute(Document):
 	def on_update(self):
 		self.validate_exising_items()
 
+	def after_rename(self, old_name, new_name, merge):
+		# attribute names are part of the variant signature
+		update_variant_signatures(new_name)
+
 	def validate_exising_items(self):
 		"""Validate that if there are existing items with attributes, they are valid"""
 		attributes_list = [d.attribute_value for d in self.item_attribute_values]
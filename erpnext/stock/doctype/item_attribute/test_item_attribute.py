@@ -8,6 +8,8 @@ test_records = frappe.get_test_records("Item Attribute")
 
 from frappe.tests.utils import FrappeTestCase
 
+from erpnext.controllers.item_variant import create_variant, get_variant
+from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.item_attribute.item_attribute import ItemAttributeIncrementError
 
 
@@ -33,3 +35,35 @@ class TestItemAttribute(FrappeTestCase):
 
 		item_attribute.increment = 0.5
 		item_attribute.save()
+
+	def test_rename_updates_variant_signature(self):
+		for item_code in frappe.get_all("Item", {"variant_of": "_Test Finish Template Item"}, pluck="name"):
+			frappe.delete_doc("Item", item_code, force=True)
+		frappe.delete_doc_if_exists("Item", "_Test Finish Template Item", force=True)
+
+		for attribute in ("_Test_Finish", "_Test_Surface"):
+			if frappe.db.exists("Item Attribute", attribute):
+				frappe.delete_doc("Item Attribute", attribute, force=True)
+
+		frappe.get_doc(
+			{
+				"doctype": "Item Attribute",
+				"attribute_name": "_Test_Finish",
+				"item_attribute_values": [
+					{"attribute_value": "Matte", "abbr": "MT"},
+					{"attribute_value": "Gloss", "abbr": "GL"},
+				],
+			}
+		).insert()
+
+		template = make_item(
+			"_Test Finish Template Item",
+			{"attributes": [{"attribute": "_Test_Finish"}], "has_variants": 1},
+		)
+		variant = create_variant(template.name, {"_Test_Finish": "Matte"})
+		variant.save()
+
+		frappe.rename_doc("Item Attribute", "_Test_Finish", "_Test_Surface")
+
+		self.assertEqual(get_variant(template.name, {"_Test_Surface": "Matte"}), variant.name)
+		self.assertFalse(get_variant(template.name, {"_Test_Finish": "Matte"}))
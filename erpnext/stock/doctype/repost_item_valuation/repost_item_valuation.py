@@ -1,6 +1,8 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
+import hashlib
+
 import frappe
 from frappe import _
 from frappe.exceptions import QueryDeadlockError, QueryTimeoutError
@@ -8,12 +10,16 @@ from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
 from frappe.query_builder.functions import Max, Now
 from frappe.utils import cint, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.utils.background_jobs import is_job_enqueued
 from frappe.utils.user import get_users_with_role
 from rq.timeouts import JobTimeoutException
 
 import erpnext
 from erpnext.accounts.general_ledger import validate_accounting_period
 from erpnext.accounts.utils import get_future_stock_vouchers, repost_gle_for_stock_vouchers
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	clear_stock_balance_snapshots,
+)
 from erpnext.stock.stock_ledger import (
 	get_affected_transactions,
 	get_items_to_be_repost,
@@ -22,6 +28,9 @@ from erpnext.stock.stock_ledger import (
 
 RecoverableErrors = (JobTimeoutException, QueryDeadlockError, QueryTimeoutError)
 
+# a parallel repost job (and its item locks) is given up after this many seconds
+REPOST_JOB_TIMEOUT = 6 * 60 * 60
+
 
 class RepostItemValuation(Document):
 	@staticmethod
@@ -148,6 +157,8 @@ class RepostItemValuation(Document):
 		        These flags are useful for asserting real time behaviour like quantity updates.
 		"""
 
+		clear_stock_balance_snapshots(self.company, self.posting_date)
+
 		if not frappe.flags.in_test:
 			return
 		if self.flags.dont_run_in_test or frappe.flags.dont_execute_stock_reposts:
@@ -379,6 +390,10 @@ def repost_entries():
 
 	riv_entries = get_repost_item_valuation_entries()
 
+	if cint(frappe.db.get_single_value("Stock Reposting Settings", "parallel_reposting")):
+		enqueue_repost_components(riv_entries)
+		return
+
 	for row in riv_entries:
 		doc = frappe.get_doc("Repost Item Valuation", row.name)
 		if doc.status in ("Queued", "In Progress"):
@@ -392,7 +407,8 @@ def repost_entries():
 
 def get_repost_item_valuation_entries():
 	return frappe.db.sql(
-		""" SELECT name from `tabRepost Item Valuation`
+		""" SELECT name, based_on, item_code, voucher_type, voucher_no, items_to_be_repost, posting_date
+		from `tabRepost Item Valuation`
 		WHERE status in ('Queued', 'In Progress') and creation <= %s and docstatus = 1
 		ORDER BY timestamp(posting_date, posting_time) asc, creation asc, status asc
 	""",
@@ -401,6 +417,188 @@ def get_repost_item_valuation_entries():
 	)
 
 
+def get_repost_components(riv_entries) -> list[tuple[set[str], list[str]]]:
+	"""Group reposts that share an item (directly or through other reposts) into components.
+
+	Items are also grouped with the items their valuation flows to or from through a stock voucher
+	posted from the earliest posting date of the reposts (like the raw materials and finished
+	goods of a manufacture entry), as reposting one changes the valuation of the others. Vouchers
+	shared by components otherwise, like a Delivery Note of several items, get their GL Entries
+	reposted by each component one at a time, see `repost_gle_for_stock_vouchers`.
+
+	Components have no item in common and can be reposted in parallel, reposts within a
+	component keep the order of `riv_entries`.
+
+	Returns list of (items, repost names) for each component."""
+
+	parent = {}
+
+	def find(node):
+		while parent.setdefault(node, node) != node:
+			parent[node] = parent[parent[node]]
+			node = parent[node]
+		return node
+
+	def union(node, other):
+		parent[find(other)] = find(node)
+
+	entry_nodes = {}
+	for row in riv_entries:
+		# reposts without any item are independent of everything else
+		nodes = [("Item", item_code) for item_code in get_items_to_repost(row)] or [
+			("Repost Item Valuation", row.name)
+		]
+		for node in nodes[1:]:
+			union(nodes[0], node)
+
+		entry_nodes[row.name] = nodes
+
+	posting_dates = [getdate(row.posting_date) for row in riv_entries if row.get("posting_date")]
+	linked_items = get_linked_items(
+		{item_code for nodes in entry_nodes.values() for doctype, item_code in nodes if doctype == "Item"},
+		min(posting_dates) if posting_dates else None,
+	)
+	for item_code, other_item_code in linked_items:
+		union(("Item", item_code), ("Item", other_item_code))
+
+	components = {}
+	for row in riv_entries:
+		nodes = entry_nodes[row.name]
+		items, entries = components.setdefault(find(nodes[0]), (set(), []))
+		items.update(item_code for doctype, item_code in nodes if doctype == "Item")
+		entries.append(row.name)
+
+	# items only linked through vouchers are locked along with the component reposting them
+	for item_code, other_item_code in linked_items:
+		components[find(("Item", item_code))][0].update((item_code, other_item_code))
+
+	return list(components.values())
+
+
+def get_linked_items(items, from_date=None) -> set[tuple[str, str]]:
+	"""Pairs of items whose valuation flows from one to the other through a stock voucher posted on
+	or after `from_date` (like the raw materials and finished good of a manufacture or repack
+	entry), reachable from `items`.
+
+	Only entries linked by `dependant_sle_voucher_detail_no` are followed, the same way reposting
+	does, items merely sharing a voucher (e.g. rows of a Delivery Note) are not linked."""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	source = frappe.qb.DocType("Stock Ledger Entry").as_("source")
+
+	query = (
+		frappe.qb.from_(sle)
+		.join(source)
+		.on(
+			(source.voucher_type == sle.voucher_type)
+			& (source.voucher_no == sle.voucher_no)
+			& (source.voucher_detail_no == sle.dependant_sle_voucher_detail_no)
+		)
+		.select(source.item_code, sle.item_code)
+		.distinct()
+		.where(
+			(sle.dependant_sle_voucher_detail_no != "")
+			& (sle.is_cancelled == 0)
+			& (source.is_cancelled == 0)
+			& (source.item_code != sle.item_code)
+		)
+	)
+
+	if from_date:
+		query = query.where(sle.posting_date >= from_date)
+
+	linked = {}
+	for item_code, other_item_code in query.run():
+		linked.setdefault(item_code, set()).add(other_item_code)
+		linked.setdefault(other_item_code, set()).add(item_code)
+
+	pairs, seen, to_check = set(), set(items), list(items)
+	while to_check:
+		item_code = to_check.pop()
+		for other_item_code in linked.get(item_code, ()):
+			pairs.add((item_code, other_item_code))
+			if other_item_code not in seen:
+				seen.add(other_item_code)
+				to_check.append(other_item_code)
+
+	return pairs
+
+
+def get_items_to_repost(row) -> set[str]:
+	if row.based_on == "Transaction":
+		items = {
+			sle.item_code
+			for sle in get_items_to_be_repost(voucher_type=row.voucher_type, voucher_no=row.voucher_no)
+		}
+	else:
+		items = {row.item_code} if row.item_code else set()
+
+	# items found by an earlier, interrupted run of the same repost
+	for sle in frappe.parse_json(row.items_to_be_repost or "[]"):
+		items.add(sle.get("item_code"))
+
+	items.discard(None)
+	return items
+
+
+def enqueue_repost_components(riv_entries):
+	"""Enqueue independent components of pending reposts as separate jobs, so that they can
+	run in parallel on all available workers."""
+
+	for items, entries in get_repost_components(riv_entries):
+		key = ",".join(sorted(items)) or entries[0]
+		job_id = "repost_item_valuation::" + hashlib.sha1(key.encode()).hexdigest()
+		if is_job_enqueued(job_id):
+			continue
+
+		frappe.enqueue(
+			repost_component,
+			queue="long",
+			timeout=REPOST_JOB_TIMEOUT,
+			job_id=job_id,
+			now=frappe.flags.in_test,
+			items=list(items),
+			riv_entries=entries,
+		)
+
+
+def repost_component(items, riv_entries):
+	"""Repost one component of pending reposts in order, while holding locks on its items."""
+
+	if not acquire_item_locks(items):
+		# some item is being reposted by another job, next run will pick these up
+		return
+
+	try:
+		for name in riv_entries:
+			doc = frappe.get_doc("Repost Item Valuation", name)
+			if doc.status in ("Queued", "In Progress"):
+				repost(doc)
+				doc.deduplicate_similar_repost()
+	finally:
+		release_item_locks(items)
+
+
+def get_item_lock_key(item_code):
+	return frappe.cache().make_key(f"repost_item_valuation_lock::{item_code}")
+
+
+def acquire_item_locks(items) -> bool:
+	acquired = []
+	for item_code in sorted(items):
+		if not frappe.cache().set(get_item_lock_key(item_code), 1, nx=True, ex=REPOST_JOB_TIMEOUT):
+			release_item_locks(acquired)
+			return False
+
+		acquired.append(item_code)
+
+	return True
+
+
+def release_item_locks(items):
+	for item_code in items:
+		frappe.cache().delete(get_item_lock_key(item_code))
+
+
 def in_configured_timeslot(repost_settings=None, current_time=None):
 	"""Check if current time is in configured timeslot for reposting."""
 
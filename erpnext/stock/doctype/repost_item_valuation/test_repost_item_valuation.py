@@ -14,6 +14,7 @@ from erpnext.controllers.stock_controller import create_item_wise_repost_entries
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
 from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import (
+	get_repost_components,
 	in_configured_timeslot,
 )
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -226,6 +227,81 @@ class TestRepostItemValuation(FrappeTestCase, StockTestMixin):
 			sorted(frappe.parse_json(frappe.as_json(set([("a", "b"), ("c", "d")])))),
 		)
 
+	def test_repost_components(self):
+		def riv(name, item_code, items_to_be_repost=None):
+			return frappe._dict(
+				name=name,
+				based_on="Item and Warehouse",
+				item_code=item_code,
+				items_to_be_repost=items_to_be_repost and frappe.as_json(items_to_be_repost),
+			)
+
+		components = get_repost_components(
+			[
+				riv("RIV-1", "A"),
+				riv("RIV-2", "B"),
+				riv("RIV-3", "A"),
+				riv("RIV-4", "C", items_to_be_repost=[{"item_code": "C"}, {"item_code": "B"}]),
+				riv("RIV-5", "D"),
+			]
+		)
+
+		self.assertEqual(
+			sorted(components, key=lambda c: c[1]),
+			[({"A"}, ["RIV-1", "RIV-3"]), ({"B", "C"}, ["RIV-2", "RIV-4"]), ({"D"}, ["RIV-5"])],
+		)
+
+	def test_repost_components_linked_through_vouchers(self):
+		rm = make_item("_Test Repost Component RM").name
+		fg = make_item("_Test Repost Component FG").name
+		other = make_item("_Test Repost Component Other").name
+		warehouse = "_Test Warehouse - _TC"
+
+		make_stock_entry(item_code=rm, target=warehouse, qty=10, rate=10, posting_date=today())
+		make_stock_entry(item_code=other, target=warehouse, qty=10, rate=10, posting_date=today())
+
+		repack = make_stock_entry(
+			item_code=rm, source=warehouse, qty=10, rate=10, purpose="Repack", do_not_save=True
+		)
+		repack.append("items", {"item_code": fg, "t_warehouse": warehouse, "qty": 1, "transfer_qty": 1})
+		repack.save()
+		repack.submit()
+
+		def riv(name, item_code):
+			return frappe._dict(
+				name=name, based_on="Item and Warehouse", item_code=item_code, posting_date=today()
+			)
+
+		# reposting the raw material changes the valuation of the finished good made from it
+		components = get_repost_components([riv("RIV-1", rm), riv("RIV-2", other)])
+		self.assertEqual(
+			sorted(components, key=lambda c: c[1]), [({rm, fg}, ["RIV-1"]), ({other}, ["RIV-2"])]
+		)
+
+	def test_repost_components_not_linked_through_sales_vouchers(self):
+		first = make_item("_Test Repost Component Sold A").name
+		second = make_item("_Test Repost Component Sold B").name
+		warehouse = "_Test Warehouse - _TC"
+
+		make_stock_entry(item_code=first, target=warehouse, qty=10, rate=10, posting_date=today())
+		make_stock_entry(item_code=second, target=warehouse, qty=10, rate=10, posting_date=today())
+
+		si = create_sales_invoice(item_code=first, qty=2, update_stock=1, do_not_submit=True)
+		si.append("items", {**si.items[0].as_dict(), "name": None, "item_code": second, "item_name": second})
+		si.save()
+		si.submit()
+
+		def riv(name, item_code):
+			return frappe._dict(
+				name=name, based_on="Item and Warehouse", item_code=item_code, posting_date=today()
+			)
+
+		# selling both items doesn't move value from one to the other
+		components = get_repost_components([riv("RIV-1", first), riv("RIV-2", second)])
+		self.assertEqual(
+			sorted(components, key=lambda c: c[1]), [({first}, ["RIV-1"]), ({second}, ["RIV-2"])]
+		)
+
 	def test_gl_repost_progress(self):
 		from erpnext.accounts import utils
 
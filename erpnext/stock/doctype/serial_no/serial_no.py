@@ -7,7 +7,8 @@ import json
 import frappe
 from frappe import ValidationError, _
 from frappe.model.naming import make_autoname
-from frappe.query_builder.functions import Coalesce
+from frappe.query_builder import Order
+from frappe.query_builder.functions import Coalesce, Sum
 from frappe.utils import (
 	add_days,
 	cint,
@@ -205,58 +206,49 @@ class SerialNo(StockController):
 		if not serial_no:
 			serial_no = self.name
 
-		for sle in frappe.db.sql(
-			"""
-			SELECT voucher_type, voucher_no,
-				posting_date, posting_time, incoming_rate, actual_qty, serial_no, posting_datetime
-			FROM
-				`tabStock Ledger Entry`
-			WHERE
-				item_code=%s AND company = %s
-				AND is_cancelled = 0
-				AND (serial_no = %s
-					OR serial_no like %s
-					OR serial_no like %s
-					OR serial_no like %s
-				)
-			ORDER BY
-				posting_datetime desc, creation desc""",
-			(
-				self.item_code,
-				self.company,
-				serial_no,
-				serial_no + "\n%",
-				"%\n" + serial_no,
-				"%\n" + serial_no + "\n%",
-			),
-			as_dict=1,
+		sle = frappe.qb.DocType("Stock Ledger Entry")
+		serial_no_ledger = frappe.qb.DocType("Serial No Ledger Entry")
+
+		for entry in (
+			frappe.qb.from_(serial_no_ledger)
+			.inner_join(sle)
+			.on(sle.name == serial_no_ledger.stock_ledger_entry)
+			.select(
+				sle.voucher_type,
+				sle.voucher_no,
+				sle.posting_date,
+				sle.posting_time,
+				sle.incoming_rate,
+				sle.actual_qty,
+				sle.serial_no,
+				sle.posting_datetime,
+			)
+			.where(
+				(serial_no_ledger.serial_no == serial_no)
+				& (serial_no_ledger.item_code == self.item_code)
+				& (sle.company == self.company)
+				& (sle.is_cancelled == 0)
+			)
+			.orderby(sle.posting_datetime, order=Order.desc)
+			.orderby(sle.creation, order=Order.desc)
+			.run(as_dict=True)
 		):
-			if serial_no.upper() in get_serial_nos(sle.serial_no):
-				if "last_sle" not in sle_dict:
-					sle_dict["last_sle"] = sle
+			if "last_sle" not in sle_dict:
+				sle_dict["last_sle"] = entry
 
-				if cint(sle.actual_qty) > 0:
-					sle_dict.setdefault("incoming", []).append(sle)
-				else:
-					sle_dict.setdefault("outgoing", []).append(sle)
+			if cint(entry.actual_qty) > 0:
+				sle_dict.setdefault("incoming", []).append(entry)
+			else:
+				sle_dict.setdefault("outgoing", []).append(entry)
 
 		return sle_dict
 
 	def on_trash(self):
-		sl_entries = frappe.db.sql(
-			"""select serial_no from `tabStock Ledger Entry`
-			where serial_no like %s and item_code=%s and is_cancelled=0""",
-			("%%%s%%" % self.name, self.item_code),
-			as_dict=True,
+		sle_exists = frappe.db.exists(
+			"Serial No Ledger Entry",
+			{"serial_no": self.name, "item_code": self.item_code, "stock_ledger_entry": ("is", "set")},
 		)
 
-		# Find the exact match
-		sle_exists = False
-		for d in sl_entries:
-			if self.name.upper() in get_serial_nos(d.serial_no):
-				sle_exists = True
-				break
-
 		if sle_exists:
 			frappe.throw(
 				_("Cannot delete Serial No {0}, as it is used in stock transactions").format(self.name)
@@ -622,8 +614,13 @@ def update_serial_nos(sle, item_det):
 		and item_det.has_serial_no == 1
 		and item_det.serial_no_series
 	):
+		from erpnext.stock.doctype.serial_no_ledger_entry.serial_no_ledger_entry import (
+			make_serial_no_ledger_entries,
+		)
+
 		serial_nos = get_auto_serial_nos(item_det.serial_no_series, sle.actual_qty)
 		sle.db_set("serial_no", serial_nos)
+		make_serial_no_ledger_entries(sle)
 		validate_serial_no(sle, item_det)
 	if sle.serial_no:
 		auto_make_serial_nos(sle)
@@ -960,36 +957,21 @@ def get_pos_reserved_serial_nos(filters):
 	if isinstance(filters, str):
 		filters = json.loads(filters)
 
-	POSInvoice = frappe.qb.DocType("POS Invoice")
-	POSInvoiceItem = frappe.qb.DocType("POS Invoice Item")
+	# serial nos sold through submitted POS Invoices and not returned through them since
+	serial_no_ledger = frappe.qb.DocType("Serial No Ledger Entry")
 	query = (
-		frappe.qb.from_(POSInvoice)
-		.from_(POSInvoiceItem)
-		.select(POSInvoice.is_return, POSInvoiceItem.serial_no)
+		frappe.qb.from_(serial_no_ledger)
+		.select(serial_no_ledger.serial_no)
 		.where(
-			(POSInvoice.name == POSInvoiceItem.parent)
-			& (POSInvoice.docstatus == 1)
-			& (POSInvoiceItem.docstatus == 1)
-			& (POSInvoiceItem.item_code == filters.get("item_code"))
-			& (POSInvoiceItem.warehouse == filters.get("warehouse"))
-			& (POSInvoiceItem.serial_no.isnotnull())
-			& (POSInvoiceItem.serial_no != "")
+			(serial_no_ledger.item_code == filters.get("item_code"))
+			& (serial_no_ledger.warehouse == filters.get("warehouse"))
+			& (serial_no_ledger.voucher_type == "POS Invoice")
 		)
+		.groupby(serial_no_ledger.serial_no)
+		.having(Sum(serial_no_ledger.direction) < 0)
 	)
 
-	pos_transacted_sr_nos = query.run(as_dict=True)
-
-	reserved_sr_nos = set()
-	returned_sr_nos = set()
-	for d in pos_transacted_sr_nos:
-		if d.is_return == 0:
-			[reserved_sr_nos.add(x) for x in get_serial_nos(d.serial_no)]
-		elif d.is_return == 1:
-			[returned_sr_nos.add(x) for x in get_serial_nos(d.serial_no)]
-
-	reserved_sr_nos = list(reserved_sr_nos - returned_sr_nos)
-
-	return reserved_sr_nos
+	return query.run(pluck=True)
 
 
 def fetch_serial_numbers(filters, qty, do_not_include=None):
@@ -0,0 +1,161 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, now
+
+from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+from erpnext.stock.utils import get_combine_datetime
+
+ENTRY_FIELDS = (
+	"serial_no",
+	"item_code",
+	"warehouse",
+	"batch_no",
+	"company",
+	"voucher_type",
+	"voucher_no",
+	"voucher_detail_no",
+	"stock_ledger_entry",
+	"posting_datetime",
+	"direction",
+)
+
+
+class SerialNoLedgerEntry(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Serial No Ledger Entry", ["serial_no", "item_code"])
+	frappe.db.add_index("Serial No Ledger Entry", ["item_code", "warehouse", "posting_datetime"])
+	frappe.db.add_index("Serial No Ledger Entry", ["voucher_no", "voucher_type"])
+
+
+def make_serial_no_ledger_entries(sle):
+	"""Index the serial nos of a submitted Stock Ledger Entry"""
+	if sle.get("is_cancelled") or not sle.get("serial_no"):
+		return
+
+	insert_serial_no_ledger_entries(get_serial_no_ledger_entries(sle, sle.get("name")))
+
+
+def update_serial_no_ledger_entries(sle):
+	"""Re-index a Stock Ledger Entry whose serial nos were changed while reposting"""
+	frappe.db.delete("Serial No Ledger Entry", {"stock_ledger_entry": sle.get("name")})
+	make_serial_no_ledger_entries(sle)
+
+
+def delete_serial_no_ledger_entries(voucher_type, voucher_no):
+	frappe.db.delete("Serial No Ledger Entry", {"voucher_type": voucher_type, "voucher_no": voucher_no})
+
+
+def make_pos_serial_no_ledger_entries(doc):
+	"""Index the serial nos reserved (or released by a return) by a submitted POS Invoice.
+	These entries have no Stock Ledger Entry as POS Invoices only post stock once consolidated."""
+	posting_datetime = get_combine_datetime(doc.posting_date, doc.posting_time)
+
+	entries = []
+	for item in doc.get("items"):
+		if not item.serial_no:
+			continue
+
+		entries.extend(
+			get_serial_no_ledger_entries(
+				frappe._dict(
+					serial_no=item.serial_no,
+					item_code=item.item_code,
+					warehouse=item.warehouse,
+					batch_no=item.batch_no,
+					company=doc.company,
+					voucher_type=doc.doctype,
+					voucher_no=doc.name,
+					voucher_detail_no=item.name,
+					posting_datetime=posting_datetime,
+					actual_qty=-flt(item.qty),
+				)
+			)
+		)
+
+	insert_serial_no_ledger_entries(entries)
+
+
+def get_serial_no_ledger_entries(sle, stock_ledger_entry=None):
+	direction = 1 if flt(sle.actual_qty) > 0 else -1
+	return [
+		frappe._dict(
+			serial_no=serial_no,
+			item_code=sle.item_code,
+			warehouse=sle.warehouse,
+			batch_no=sle.batch_no,
+			company=sle.company,
+			voucher_type=sle.voucher_type,
+			voucher_no=sle.voucher_no,
+			voucher_detail_no=sle.voucher_detail_no,
+			stock_ledger_entry=stock_ledger_entry,
+			posting_datetime=sle.posting_datetime,
+			direction=direction,
+		)
+		for serial_no in get_serial_nos(sle.serial_no)
+	]
+
+
+def insert_serial_no_ledger_entries(entries):
+	if not entries:
+		return
+
+	timestamp, user = now(), frappe.session.user
+	fields = ["name", "creation", "modified", "owner", "modified_by", *ENTRY_FIELDS]
+	values = [
+		(
+			frappe.generate_hash(length=10),
+			timestamp,
+			timestamp,
+			user,
+			user,
+			*(entry.get(fieldname) for fieldname in ENTRY_FIELDS),
+		)
+		for entry in entries
+	]
+	frappe.db.bulk_insert("Serial No Ledger Entry", fields=fields, values=values)
+
+
+def rebuild_serial_no_ledger_entries():
+	"""Rebuild the serial no index from the active Stock Ledger Entries and submitted POS Invoices.
+
+	Runs as a patch and can be run manually with
+	`bench execute erpnext.stock.doctype.serial_no_ledger_entry.serial_no_ledger_entry.rebuild_serial_no_ledger_entries`
+	"""
+	frappe.db.delete("Serial No Ledger Entry")
+
+	for item_code in frappe.get_all("Item", filters={"has_serial_no": 1}, pluck="name"):
+		entries = []
+		for sle in frappe.get_all(
+			"Stock Ledger Entry",
+			filters={"item_code": item_code, "is_cancelled": 0, "serial_no": ("is", "set")},
+			fields=[
+				"name",
+				"serial_no",
+				"item_code",
+				"warehouse",
+				"batch_no",
+				"company",
+				"voucher_type",
+				"voucher_no",
+				"voucher_detail_no",
+				"posting_datetime",
+				"actual_qty",
+			],
+		):
+			entries.extend(get_serial_no_ledger_entries(sle, sle.name))
+
+		insert_serial_no_ledger_entries(entries)
+
+	for name in frappe.get_all(
+		"POS Invoice Item",
+		filters={"docstatus": 1, "serial_no": ("is", "set")},
+		pluck="parent",
+		distinct=True,
+	):
+		make_pos_serial_no_ledger_entries(frappe.get_doc("POS Invoice", name))
@@ -0,0 +1,73 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import nowdate
+
+from erpnext.stock.doctype.delivery_note.test_delivery_note import create_delivery_note
+from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+from erpnext.stock.doctype.serial_no_ledger_entry.serial_no_ledger_entry import (
+	rebuild_serial_no_ledger_entries,
+)
+from erpnext.stock.doctype.stock_entry.test_stock_entry import make_serialized_item
+from erpnext.stock.utils import get_serial_nos_data_after_transactions
+
+
+class TestSerialNoLedgerEntry(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_serial_nos_are_indexed_on_submit_and_cancel(self):
+		item_code = "_Test Serialized Item With Series"
+		warehouse = "_Test Warehouse - _TC"
+
+		se = make_serialized_item(target_warehouse=warehouse)
+		serial_nos = get_serial_nos(se.get("items")[0].serial_no)
+
+		def get_entries(serial_no):
+			return frappe.get_all(
+				"Serial No Ledger Entry",
+				filters={"serial_no": serial_no},
+				fields=["voucher_type", "voucher_no", "direction"],
+				order_by="posting_datetime, creation",
+				as_list=1,
+			)
+
+		def get_available_serial_nos():
+			return set(
+				get_serial_nos(
+					get_serial_nos_data_after_transactions(
+						{
+							"item_code": item_code,
+							"warehouse": warehouse,
+							"posting_date": nowdate(),
+							"posting_time": "23:59:59",
+						}
+					)
+				)
+			)
+
+		# auto created serial nos are indexed along with their entry
+		for serial_no in serial_nos:
+			self.assertEqual(get_entries(serial_no), [("Stock Entry", se.name, 1)])
+		self.assertTrue(set(serial_nos).issubset(get_available_serial_nos()))
+
+		dn = create_delivery_note(item_code=item_code, qty=1, serial_no=serial_nos[0])
+		self.assertEqual(
+			get_entries(serial_nos[0]), [("Stock Entry", se.name, 1), ("Delivery Note", dn.name, -1)]
+		)
+		self.assertNotIn(serial_nos[0], get_available_serial_nos())
+
+		serial_no = frappe.get_doc("Serial No", serial_nos[0])
+		self.assertEqual(serial_no.get_last_sle()["delivery_sle"].voucher_no, dn.name)
+
+		# the backfill rebuilds the same index
+		rebuild_serial_no_ledger_entries()
+		self.assertEqual(
+			get_entries(serial_nos[0]), [("Stock Entry", se.name, 1), ("Delivery Note", dn.name, -1)]
+		)
+
+		dn.cancel()
+		self.assertEqual(get_entries(serial_nos[0]), [("Stock Entry", se.name, 1)])
+		self.assertIn(serial_nos[0], get_available_serial_nos())
@@ -0,0 +1,238 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Max, Sum
+from frappe.utils import add_months, cint, flt, get_last_day, getdate, now, today
+from frappe.utils.nestedset import get_descendants_of
+
+from erpnext.stock.doctype.warehouse.warehouse import apply_warehouse_filter
+
+
+class StockBalanceSnapshot(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Stock Balance Snapshot", ["company", "snapshot_date"])
+
+
+def is_stock_balance_snapshot_enabled():
+	return cint(frappe.db.get_single_value("Stock Settings", "maintain_stock_balance_snapshots"))
+
+
+def update_stock_balance_snapshots():
+	"""Snapshot the stock balances of every company as at the end of the last month"""
+	if not is_stock_balance_snapshot_enabled():
+		return
+
+	snapshot_date = get_last_day(add_months(today(), -1))
+	for company in frappe.get_all("Company", pluck="name"):
+		if not frappe.db.exists(
+			"Stock Balance Snapshot", {"company": company, "snapshot_date": snapshot_date}
+		):
+			make_stock_balance_snapshot(company, snapshot_date)
+
+
+def make_stock_balance_snapshot(company, snapshot_date):
+	"""Snapshot the balance and FIFO slots of every item and warehouse of `company` as at the end of
+	`snapshot_date`, replaying only the Stock Ledger Entries after the previous snapshot"""
+	from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots
+
+	snapshot_date = getdate(snapshot_date)
+	if has_pending_reposts(company, snapshot_date):
+		# valuation of the period is not final yet
+		return
+
+	frappe.db.delete("Stock Balance Snapshot", {"company": company, "snapshot_date": snapshot_date})
+
+	previous_snapshot_date = get_latest_snapshot_date(company, snapshot_date, inclusive=False)
+	balance_values = get_balance_values(company, previous_snapshot_date, snapshot_date)
+
+	# FIFOSlots starts from the previous snapshot on its own
+	item_details = FIFOSlots(
+		frappe._dict(
+			{
+				"company": company,
+				"to_date": str(snapshot_date),
+				"show_warehouse_wise_stock": True,
+				"skip_closing_balance": True,
+			}
+		)
+	).generate()
+
+	timestamp, user = now(), frappe.session.user
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"company",
+		"item_code",
+		"warehouse",
+		"snapshot_date",
+		"bal_qty",
+		"bal_val",
+		"fifo_queue",
+	]
+
+	values = []
+	for key in set(item_details) | set(balance_values):
+		details = item_details.get(key, {})
+		bal_qty = flt(details.get("total_qty"))
+		bal_val = flt(balance_values.get(key))
+		fifo_queue = details.get("fifo_queue") or []
+
+		if not (bal_qty or bal_val or fifo_queue):
+			continue
+
+		values.append(
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				user,
+				user,
+				company,
+				key[0],
+				key[1],
+				snapshot_date,
+				bal_qty,
+				bal_val,
+				json.dumps(fifo_queue, default=str),
+			)
+		)
+
+	frappe.db.bulk_insert("Stock Balance Snapshot", fields=fields, values=values)
+
+
+def get_balance_values(company, previous_snapshot_date, snapshot_date):
+	"""Stock value per (item, warehouse) at `snapshot_date` from the previous snapshot and the
+	stock value difference of the entries posted after it"""
+	balance_values = {}
+
+	if previous_snapshot_date:
+		for d in frappe.get_all(
+			"Stock Balance Snapshot",
+			filters={"company": company, "snapshot_date": previous_snapshot_date},
+			fields=["item_code", "warehouse", "bal_val"],
+		):
+			balance_values[(d.item_code, d.warehouse)] = flt(d.bal_val)
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	query = (
+		frappe.qb.from_(sle)
+		.select(sle.item_code, sle.warehouse, Sum(sle.stock_value_difference))
+		.where((sle.company == company) & (sle.is_cancelled == 0) & (sle.posting_date <= snapshot_date))
+		.groupby(sle.item_code, sle.warehouse)
+	)
+
+	if previous_snapshot_date:
+		query = query.where(sle.posting_date > previous_snapshot_date)
+
+	for item_code, warehouse, stock_value_difference in query.run():
+		key = (item_code, warehouse)
+		balance_values[key] = balance_values.get(key, 0.0) + flt(stock_value_difference)
+
+	return balance_values
+
+
+def has_pending_reposts(company, date):
+	return frappe.db.exists(
+		"Repost Item Valuation",
+		{
+			"company": company,
+			"docstatus": 1,
+			"status": ("in", ["Queued", "In Progress"]),
+			"posting_date": ("<=", date),
+		},
+	)
+
+
+def clear_stock_balance_snapshots(company, from_date):
+	"""Remove the snapshots on or after `from_date`, called when stock is posted or reposted on that date"""
+	if not company or not is_stock_balance_snapshot_enabled():
+		return
+
+	filters = {"company": company, "snapshot_date": (">=", from_date)}
+	# most postings are after the latest snapshot, skip the delete for them
+	if frappe.db.exists("Stock Balance Snapshot", filters):
+		frappe.db.delete("Stock Balance Snapshot", filters)
+
+
+def get_latest_snapshot_date(company, date, inclusive=True):
+	table = frappe.qb.DocType("Stock Balance Snapshot")
+	query = frappe.qb.from_(table).select(Max(table.snapshot_date)).where(table.company == company)
+
+	if inclusive:
+		query = query.where(table.snapshot_date <= date)
+	else:
+		query = query.where(table.snapshot_date < date)
+
+	return query.run()[0][0]
+
+
+def get_stock_balance_snapshot(filters, date, inclusive=True):
+	"""Latest snapshot on or before `date` (before `date` if not `inclusive`) and its rows matching
+	the stock report `filters`, with the item details and the FIFO queue parsed"""
+	if not filters.get("company") or not is_stock_balance_snapshot_enabled():
+		return None, []
+
+	snapshot_date = get_latest_snapshot_date(filters.get("company"), date, inclusive=inclusive)
+	if not snapshot_date:
+		return None, []
+
+	snapshot = frappe.qb.DocType("Stock Balance Snapshot")
+	item = frappe.qb.DocType("Item")
+
+	query = (
+		frappe.qb.from_(snapshot)
+		.inner_join(item)
+		.on(snapshot.item_code == item.name)
+		.select(
+			snapshot.company,
+			snapshot.item_code,
+			snapshot.item_code.as_("name"),
+			snapshot.warehouse,
+			snapshot.bal_qty,
+			snapshot.bal_val,
+			snapshot.fifo_queue,
+			item.item_name,
+			item.item_group,
+			item.brand,
+			item.description,
+			item.stock_uom,
+			item.has_serial_no,
+		)
+		.where((snapshot.company == filters.get("company")) & (snapshot.snapshot_date == snapshot_date))
+	)
+
+	if filters.get("item_code"):
+		query = query.where(snapshot.item_code == filters.get("item_code"))
+
+	if filters.get("brand"):
+		query = query.where(item.brand == filters.get("brand"))
+
+	if item_group := filters.get("item_group"):
+		children = get_descendants_of("Item Group", item_group, ignore_permissions=True)
+		query = query.where(item.item_group.isin([*children, item_group]))
+
+	if filters.get("warehouse"):
+		query = apply_warehouse_filter(query, snapshot, filters)
+	elif warehouse_type := filters.get("warehouse_type"):
+		warehouse = frappe.qb.DocType("Warehouse")
+		query = (
+			query.join(warehouse)
+			.on(warehouse.name == snapshot.warehouse)
+			.where(warehouse.warehouse_type == warehouse_type)
+		)
+
+	rows = query.run(as_dict=True)
+	for row in rows:
+		row.fifo_queue = json.loads(row.fifo_queue or "[]")
+
+	return snapshot_date, rows
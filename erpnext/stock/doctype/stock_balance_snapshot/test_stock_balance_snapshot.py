@@ -0,0 +1,138 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import json
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	make_stock_balance_snapshot,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots
+from erpnext.stock.report.stock_balance.stock_balance import execute as stock_balance
+
+
+class TestStockBalanceSnapshot(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	@change_settings("Stock Settings", {"maintain_stock_balance_snapshots": 1})
+	def test_reports_match_stock_ledger(self):
+		item_code = make_item(properties={"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		for args in (
+			{"target": warehouse, "qty": 10, "basic_rate": 100, "posting_date": "2021-01-05"},
+			{"source": warehouse, "qty": 4, "posting_date": "2021-02-10"},
+			{"target": warehouse, "qty": 6, "basic_rate": 120, "posting_date": "2021-03-15"},
+		):
+			make_stock_entry(item_code=item_code, **args)
+
+		make_stock_balance_snapshot("_Test Company", "2021-01-31")
+		make_stock_balance_snapshot("_Test Company", "2021-02-28")
+
+		snapshot = frappe.db.get_value(
+			"Stock Balance Snapshot",
+			{"item_code": item_code, "warehouse": warehouse, "snapshot_date": "2021-02-28"},
+			["bal_qty", "bal_val"],
+			as_dict=True,
+		)
+		self.assertEqual(snapshot.bal_qty, 6)
+		self.assertEqual(snapshot.bal_val, 600)
+
+		balance_filters = frappe._dict(
+			company="_Test Company", item_code=item_code, from_date="2021-03-01", to_date="2021-03-31"
+		)
+		ageing_filters = frappe._dict(
+			company="_Test Company", item_code=item_code, to_date="2021-03-31", show_warehouse_wise_stock=1
+		)
+
+		def get_report_data():
+			balance = [
+				{key: row[key] for key in ("opening_qty", "opening_val", "in_qty", "bal_qty", "bal_val")}
+				for row in stock_balance(frappe._dict(balance_filters))[1]
+			]
+			ageing = {
+				key: (row["total_qty"], row["fifo_queue"])
+				for key, row in FIFOSlots(frappe._dict(ageing_filters)).generate().items()
+			}
+			return balance, ageing
+
+		from_snapshot = get_report_data()
+
+		frappe.db.set_single_value("Stock Settings", "maintain_stock_balance_snapshots", 0)
+		from_ledger = get_report_data()
+		frappe.db.set_single_value("Stock Settings", "maintain_stock_balance_snapshots", 1)
+
+		self.assertEqual(from_snapshot, from_ledger)
+
+		# a backdated entry removes the snapshots after it
+		make_stock_entry(
+			item_code=item_code, target=warehouse, qty=1, basic_rate=100, posting_date="2021-02-01"
+		)
+		self.assertTrue(frappe.db.exists("Stock Balance Snapshot", {"snapshot_date": "2021-01-31"}))
+		self.assertFalse(frappe.db.exists("Stock Balance Snapshot", {"snapshot_date": "2021-02-28"}))
+
+	@change_settings("Stock Settings", {"maintain_stock_balance_snapshots": 1})
+	def test_ignore_closing_balance_skips_snapshots(self):
+		item_code = make_item(properties={"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		make_stock_entry(
+			item_code=item_code, target=warehouse, qty=10, basic_rate=100, posting_date="2021-01-05"
+		)
+		make_stock_balance_snapshot("_Test Company", "2021-01-31")
+
+		# a snapshot out of sync with the ledger shows whether it was used
+		frappe.db.set_value(
+			"Stock Balance Snapshot", {"item_code": item_code}, {"bal_qty": 5, "bal_val": 500}
+		)
+
+		balance = stock_balance(
+			frappe._dict(
+				company="_Test Company",
+				item_code=item_code,
+				from_date="2021-02-01",
+				to_date="2021-02-28",
+				ignore_closing_balance=1,
+			)
+		)[1]
+		self.assertEqual(balance[0]["opening_qty"], 10)
+
+		ageing = FIFOSlots(
+			frappe._dict(
+				company="_Test Company", item_code=item_code, to_date="2021-02-28", ignore_closing_balance=1
+			)
+		).generate()
+		self.assertEqual(ageing[item_code]["total_qty"], 10)
+
+	@change_settings("Stock Settings", {"maintain_stock_balance_snapshots": 1})
+	def test_snapshot_replays_entries_after_previous_snapshot(self):
+		item_code = make_item(properties={"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		make_stock_entry(
+			item_code=item_code, target=warehouse, qty=10, basic_rate=100, posting_date="2021-01-05"
+		)
+		make_stock_entry(item_code=item_code, source=warehouse, qty=4, posting_date="2021-02-10")
+		make_stock_balance_snapshot("_Test Company", "2021-01-31")
+
+		# a previous snapshot out of sync with the ledger shows whether it was used
+		frappe.db.set_value(
+			"Stock Balance Snapshot",
+			{"item_code": item_code, "snapshot_date": "2021-01-31"},
+			{"bal_qty": 7, "fifo_queue": json.dumps([[7, "2021-01-05"]])},
+		)
+		make_stock_balance_snapshot("_Test Company", "2021-02-28")
+
+		snapshot = frappe.db.get_value(
+			"Stock Balance Snapshot",
+			{"item_code": item_code, "snapshot_date": "2021-02-28"},
+			["bal_qty", "fifo_queue"],
+			as_dict=True,
+		)
+		self.assertEqual(snapshot.bal_qty, 3)
+		self.assertEqual(json.loads(snapshot.fifo_queue), [[3, "2021-01-05"]])
@@ -1727,6 +1727,49 @@ class TestStockEntry(FrappeTestCase):
 			mr.cancel()
 			mr.delete()
 
+	def test_planned_material_requests_for_reorder(self):
+		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
+		from erpnext.stock.reorder_item import get_planned_material_requests
+
+		parent_warehouse = create_warehouse("_Test Reorder Group Warehouse", properties={"is_group": 1})
+		child_warehouse = create_warehouse(
+			"_Test Reorder Child Warehouse", properties={"parent_warehouse": parent_warehouse}
+		)
+
+		item_doc = make_item(
+			"Test Auto Reorder Item - 003",
+			properties={"stock_uom": "Kg", "purchase_uom": "Nos", "is_stock_item": 1},
+			uoms=[{"uom": "Nos", "conversion_factor": 5}],
+		)
+		make_stock_entry(item_code=item_doc.name, target=child_warehouse, qty=5, basic_rate=100)
+
+		item_doc.reorder_levels = []
+		item_doc.append(
+			"reorder_levels",
+			{
+				"warehouse_reorder_level": 20,
+				"warehouse_reorder_qty": 10,
+				"warehouse": child_warehouse,
+				"warehouse_group": parent_warehouse,
+				"material_request_type": "Purchase",
+			},
+		)
+		item_doc.save(ignore_permissions=True)
+
+		planned_items = [
+			d
+			for mr in get_planned_material_requests()
+			for d in mr["items"]
+			if d["item_code"] == item_doc.name
+		]
+
+		# projected qty of the group warehouse includes the child warehouse
+		self.assertEqual(len(planned_items), 1)
+		self.assertEqual(planned_items[0]["warehouse"], child_warehouse)
+		self.assertEqual(planned_items[0]["uom"], "Nos")
+		self.assertEqual(planned_items[0]["qty"], 3)
+		self.assertFalse(frappe.db.exists("Material Request Item", {"item_code": item_doc.name}))
+
 	def test_auto_reorder_level_with_lead_time_days(self):
 		from erpnext.stock.reorder_item import reorder_item
 
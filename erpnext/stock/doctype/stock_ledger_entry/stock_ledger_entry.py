@@ -129,23 +129,29 @@ class StockLedgerEntry(Document):
 
 	def on_submit(self):
 		self.check_stock_frozen_date()
+		self.update_batch_bin()
 		self.calculate_batch_qty()
 
+		from erpnext.stock.doctype.serial_no_ledger_entry.serial_no_ledger_entry import (
+			make_serial_no_ledger_entries,
+		)
+
+		make_serial_no_ledger_entries(self)
+
 		if not self.get("via_landed_cost_voucher"):
 			from erpnext.stock.doctype.serial_no.serial_no import process_serial_no
 
 			process_serial_no(self)
 
+	def update_batch_bin(self):
+		if self.batch_no and not self.is_cancelled:
+			from erpnext.stock.doctype.batch_bin.batch_bin import update_batch_bin_qty
+
+			update_batch_bin_qty(self.item_code, self.warehouse, self.batch_no, self.actual_qty)
+
 	def calculate_batch_qty(self):
 		if self.batch_no:
-			batch_qty = (
-				frappe.db.get_value(
-					"Stock Ledger Entry",
-					{"docstatus": 1, "batch_no": self.batch_no, "is_cancelled": 0},
-					"sum(actual_qty)",
-				)
-				or 0
-			)
+			batch_qty = frappe.db.get_value("Batch Bin", {"batch_no": self.batch_no}, "sum(actual_qty)") or 0
 			frappe.db.set_value("Batch", self.batch_no, "batch_qty", batch_qty)
 
 	def validate_mandatory(self):
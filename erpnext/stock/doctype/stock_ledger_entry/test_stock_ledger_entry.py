@@ -1203,6 +1203,35 @@ class TestStockLedgerEntry(FrappeTestCase, StockTestMixin):
 		self.assertEqual(sle[0].qty_after_transaction, 105)
 		self.assertEqual(sle[0].actual_qty, 100)
 
+	@change_settings("Stock Reposting Settings", {"stop_repost_on_convergence": 1})
+	def test_repost_stops_on_convergence(self):
+		item = make_item(properties={"valuation_method": "FIFO"}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		make_stock_entry(item_code=item, to_warehouse=warehouse, qty=10, rate=10, posting_date="2021-01-01")
+		make_stock_entry(item_code=item, from_warehouse=warehouse, qty=5, posting_date="2021-01-03")
+		create_stock_reconciliation(
+			item_code=item, warehouse=warehouse, qty=10, rate=30, posting_date="2021-01-04"
+		)
+		issue = make_stock_entry(item_code=item, from_warehouse=warehouse, qty=5, posting_date="2021-01-05")
+		last_issue = make_stock_entry(
+			item_code=item, from_warehouse=warehouse, qty=5, posting_date="2021-01-06"
+		)
+		last_modified = frappe.db.get_value("Stock Ledger Entry", {"voucher_no": last_issue.name}, "modified")
+
+		# stock reconciliation resets the valuation, so reposting converges right after it
+		make_stock_entry(item_code=item, to_warehouse=warehouse, qty=10, rate=20, posting_date="2021-01-02")
+
+		self.assertSLEs(issue, [{"qty_after_transaction": 5, "stock_value": 150}])
+		self.assertSLEs(last_issue, [{"qty_after_transaction": 0, "stock_value": 0}])
+		self.assertEqual(
+			last_modified,
+			frappe.db.get_value("Stock Ledger Entry", {"voucher_no": last_issue.name}, "modified"),
+		)
+		self.assertEqual(
+			frappe.db.get_value("Bin", {"item_code": item, "warehouse": warehouse}, "actual_qty"), 0
+		)
+
 	@change_settings("System Settings", {"float_precision": 3, "currency_precision": 2})
 	def test_transfer_invariants(self):
 		"""Extact stock value should be transferred."""
@@ -55,6 +55,7 @@ class StockSettings(Document):
 		self.cant_change_valuation_method()
 		self.validate_clean_description_html()
 		self.validate_pending_reposts()
+		self.validate_stock_balance_snapshots()
 
 	def validate_warehouses(self):
 		warehouse_fields = ["default_warehouse", "sample_retention_warehouse"]
@@ -100,6 +101,13 @@ class StockSettings(Document):
 		if self.stock_frozen_upto:
 			check_pending_reposting(self.stock_frozen_upto)
 
+	def validate_stock_balance_snapshots(self):
+		if not cint(self.maintain_stock_balance_snapshots) and cint(
+			self.db_get("maintain_stock_balance_snapshots") or 0
+		):
+			# snapshots are not kept up to date while disabled
+			frappe.db.delete("Stock Balance Snapshot")
+
 	def on_update(self):
 		self.toggle_warehouse_field_for_inter_warehouse_transfer()
 
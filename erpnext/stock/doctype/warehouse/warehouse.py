@@ -67,6 +67,7 @@ class Warehouse(NestedSet):
 			throw(_("Child warehouse exists for this warehouse. You can not delete this warehouse."))
 
 		frappe.db.delete("Bin", filters={"warehouse": self.name})
+		frappe.db.delete("Batch Bin", filters={"warehouse": self.name})
 		self.update_nsm_model()
 		self.unlink_from_items()
 
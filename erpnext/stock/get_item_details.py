@@ -3,6 +3,7 @@
 
 
 import json
+from contextlib import contextmanager
 
 import frappe
 from frappe import _, throw
@@ -133,6 +134,103 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 	return out
 
 
+@frappe.whitelist()
+def get_items_details(args_list, doc=None, for_validate=False, overwrite_warehouse=True):
+	"""Item details for many rows of the same transaction in one call, e.g. for rows pasted in the
+	item grid or imported together.
+
+	Item Prices, Bins and Pricing Rules for all rows are fetched together, see `batch_item_details`.
+	Serial Nos picked for a row are not picked again for later rows of the same item."""
+	from erpnext.accounts.doctype.pricing_rule.utils import batch_pricing_rules
+
+	args_list = [process_args(args) for args in process_string_args(args_list)]
+	for_validate = process_string_args(for_validate)
+	overwrite_warehouse = process_string_args(overwrite_warehouse)
+	if isinstance(doc, str):
+		doc = json.loads(doc)
+
+	out = []
+	selected_serial_nos = {}
+	with (
+		batch_item_details([args.item_code for args in args_list], {args.price_list for args in args_list}),
+		batch_pricing_rules(args_list),
+	):
+		for args in args_list:
+			if args.get("ignore_serial_nos") is None:
+				args.ignore_serial_nos = selected_serial_nos.get(args.item_code)
+
+			details = get_item_details(
+				args, doc=doc, for_validate=for_validate, overwrite_warehouse=overwrite_warehouse
+			)
+			if details.get("serial_no"):
+				selected_serial_nos.setdefault(args.item_code, []).extend(
+					details.get("serial_no").split("\n")
+				)
+
+			out.append(details)
+
+	return out
+
+
+@contextmanager
+def batch_item_details(item_codes, price_lists):
+	"""Fetch Item Prices and Bins for all `item_codes` of a transaction together.
+
+	Within the block, `get_item_price` and `get_bin_details` look up rows of the batch in memory
+	instead of querying per row. Item Prices are dropped from the batch once a price is inserted."""
+	item_codes = set(filter(None, item_codes))
+	price_lists = set(filter(None, price_lists))
+
+	if frappe.flags.item_details_batch is not None or len(item_codes) < 2:
+		yield
+		return
+
+	item_codes.update(
+		frappe.get_all(
+			"Item",
+			filters={"name": ("in", list(item_codes)), "variant_of": ("is", "set")},
+			pluck="variant_of",
+		)
+	)
+
+	item_prices = {}
+	if price_lists:
+		for d in frappe.get_all(
+			"Item Price",
+			filters={"item_code": ("in", list(item_codes)), "price_list": ("in", list(price_lists))},
+			fields=[
+				"name",
+				"item_code",
+				"price_list",
+				"price_list_rate",
+				"uom",
+				"batch_no",
+				"customer",
+				"supplier",
+				"valid_from",
+				"valid_upto",
+			],
+		):
+			item_prices.setdefault(d.item_code, []).append(d)
+
+	bins = {}
+	for d in frappe.get_all(
+		"Bin",
+		filters={"item_code": ("in", list(item_codes))},
+		fields=["item_code", "warehouse", "projected_qty", "actual_qty", "reserved_qty"],
+	):
+		bins.setdefault(d.item_code, {})[d.warehouse] = d
+
+	frappe.flags.item_details_batch = frappe._dict(
+		item_codes=item_codes, price_lists=price_lists, item_prices=item_prices, bins=bins
+	)
+
+	try:
+		yield
+	finally:
+		frappe.flags.item_details_batch = None
+
+
 def remove_standard_fields(details):
 	for key in child_table_fields + default_fields:
 		details.pop(key, None)
@@ -925,7 +1023,12 @@ def insert_item_price(args):
 		if not price_list_rate or item_price.price_list_rate == price_list_rate:
 			return
 
+		from erpnext.selling.page.point_of_sale.point_of_sale import clear_price_list_catalogues
+
 		frappe.db.set_value("Item Price", item_price.name, "price_list_rate", price_list_rate)
+		clear_batch_item_prices()
+		# set_value skips the doc events of Item Price which refresh the POS catalogue
+		clear_price_list_catalogues([args.price_list])
 		frappe.msgprint(
 			_("Item Price updated for {0} in Price List {1}").format(args.item_code, args.price_list),
 			alert=True,
@@ -949,12 +1052,18 @@ def insert_item_price(args):
 			}
 		)
 		item_price.insert()
+		clear_batch_item_prices()
 		frappe.msgprint(
 			_("Item Price added for {0} in Price List {1}").format(args.item_code, args.price_list),
 			alert=True,
 		)
 
 
+def clear_batch_item_prices():
+	if frappe.flags.item_details_batch:
+		frappe.flags.item_details_batch.item_prices = None
+
+
 def _get_stock_uom_rate(rate, args):
 	return rate / args.conversion_factor if args.conversion_factor else rate
 
@@ -967,6 +1076,14 @@ def get_item_price(args, item_code, ignore_party=False):
 	        optional fields transaction_date, customer, supplier
 	:param item_code: str, Item Doctype field item_code
 	"""
+	batch = frappe.flags.item_details_batch
+	if (
+		batch
+		and batch.item_prices is not None
+		and item_code in batch.item_codes
+		and args.get("price_list") in batch.price_lists
+	):
+		return get_item_price_from_batch(batch.item_prices.get(item_code, []), args, ignore_party)
 
 	ip = frappe.qb.DocType("Item Price")
 	query = (
@@ -1000,6 +1117,52 @@ def get_item_price(args, item_code, ignore_party=False):
 	return query.run()
 
 
+def get_item_price_from_batch(item_prices, args, ignore_party=False):
+	"""Item Prices of the batch matched in memory, in the same order and with the same conditions
+	as the query in `get_item_price`"""
+	transaction_date = getdate(args["transaction_date"]) if args.get("transaction_date") else None
+
+	def is_applicable(ip):
+		if ip.price_list != args.get("price_list"):
+			return False
+
+		if (ip.uom or "") not in ("", args.get("uom")):
+			return False
+
+		if (ip.batch_no or "") not in ("", args.get("batch_no")):
+			return False
+
+		if not ignore_party:
+			if args.get("customer"):
+				if ip.customer != args.get("customer"):
+					return False
+			elif args.get("supplier"):
+				if ip.supplier != args.get("supplier"):
+					return False
+			elif ip.customer or ip.supplier:
+				return False
+
+		if transaction_date and not (
+			getdate(ip.valid_from or "2000-01-01")
+			<= transaction_date
+			<= getdate(ip.valid_upto or "2500-12-31")
+		):
+			return False
+
+		return True
+
+	item_prices = [ip for ip in item_prices if is_applicable(ip)]
+
+	# stable sorts from the last sort key to the first, nulls last as with `order by .. desc`
+	item_prices.sort(key=lambda ip: (ip.uom is not None, ip.uom or ""), reverse=True)
+	item_prices.sort(key=lambda ip: ip.batch_no or "", reverse=True)
+	item_prices.sort(
+		key=lambda ip: (ip.valid_from is not None, getdate(ip.valid_from or "2000-01-01")), reverse=True
+	)
+
+	return [(ip.name, ip.price_list_rate, ip.uom) for ip in item_prices]
+
+
 def get_price_list_rate_for(args, item_code):
 	"""
 	:param customer: link to Customer DocType
@@ -1255,16 +1418,24 @@ def get_bin_details(item_code, warehouse, company=None, include_child_warehouses
 
 		warehouses = get_child_warehouses(warehouse) if include_child_warehouses else [warehouse]
 
-		bin = frappe.qb.DocType("Bin")
-		bin_details = (
-			frappe.qb.from_(bin)
-			.select(
-				Coalesce(Sum(bin.projected_qty), 0).as_("projected_qty"),
-				Coalesce(Sum(bin.actual_qty), 0).as_("actual_qty"),
-				Coalesce(Sum(bin.reserved_qty), 0).as_("reserved_qty"),
-			)
-			.where((bin.item_code == item_code) & (bin.warehouse.isin(warehouses)))
-		).run(as_dict=True)[0]
+		batch = frappe.flags.item_details_batch
+		if batch and item_code in batch.item_codes:
+			bins = batch.bins.get(item_code, {})
+			bin_details = {
+				fieldname: sum(flt(bins[wh][fieldname]) for wh in warehouses if wh in bins)
+				for fieldname in ("projected_qty", "actual_qty", "reserved_qty")
+			}
+		else:
+			bin = frappe.qb.DocType("Bin")
+			bin_details = (
+				frappe.qb.from_(bin)
+				.select(
+					Coalesce(Sum(bin.projected_qty), 0).as_("projected_qty"),
+					Coalesce(Sum(bin.actual_qty), 0).as_("actual_qty"),
+					Coalesce(Sum(bin.reserved_qty), 0).as_("reserved_qty"),
+				)
+				.where((bin.item_code == item_code) & (bin.warehouse.isin(warehouses)))
+			).run(as_dict=True)[0]
 
 	if company:
 		bin_details["company_total_stock"] = get_company_total_stock(item_code, company)
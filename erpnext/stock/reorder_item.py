@@ -7,6 +7,7 @@ from math import ceil
 
 import frappe
 from frappe import _
+from frappe.query_builder.functions import Sum
 from frappe.utils import add_days, cint, flt, nowdate
 
 import erpnext
@@ -23,6 +24,39 @@ def reorder_item():
 
 
 def _reorder_item():
+	material_requests = get_material_requests_for_reorder()
+
+	if material_requests:
+		return create_material_request(material_requests)
+
+
+@frappe.whitelist()
+def get_planned_material_requests():
+	"""Material Requests that the reorder job would create now, without creating them"""
+	frappe.has_permission("Material Request", "create", throw=True)
+
+	material_requests = get_material_requests_for_reorder() or {}
+	conversion_factors = get_purchase_uom_conversion_factors(material_requests)
+
+	planned_material_requests = []
+	for request_type in material_requests:
+		for company, items in material_requests[request_type].items():
+			if not items:
+				continue
+
+			planned_material_requests.append(
+				{
+					"company": company,
+					"material_request_type": get_material_request_type(request_type),
+					"items": get_material_request_items(request_type, items, conversion_factors),
+				}
+			)
+
+	return planned_material_requests
+
+
+def get_material_requests_for_reorder():
+	"""Items below their reorder level grouped by material request type and company"""
 	material_requests = {"Purchase": {}, "Transfer": {}, "Material Issue": {}, "Manufacture": {}}
 	warehouse_company = frappe._dict(
 		frappe.db.sql(
@@ -103,8 +137,7 @@ def _reorder_item():
 				),
 			)
 
-	if material_requests:
-		return create_material_request(material_requests)
+	return material_requests
 
 
 def get_items_for_reorder() -> dict[str, list]:
@@ -183,33 +216,27 @@ def get_reorder_levels_for_variants(itemwise_reorder):
 
 
 def get_item_warehouse_projected_qty(items_to_consider):
+	"""Projected qty of each item per warehouse, including the qty of all child warehouses"""
 	item_warehouse_projected_qty = {}
-	items_to_consider = list(items_to_consider.keys())
-
-	for item_code, warehouse, projected_qty in frappe.db.sql(
-		"""select item_code, warehouse, projected_qty
-		from tabBin where item_code in ({})
-			and (warehouse != '' and warehouse is not null)""".format(
-			", ".join(["%s"] * len(items_to_consider))
-		),
-		items_to_consider,
-	):
-		if item_code not in item_warehouse_projected_qty:
-			item_warehouse_projected_qty.setdefault(item_code, {})
-
-		if warehouse not in item_warehouse_projected_qty.get(item_code):
-			item_warehouse_projected_qty[item_code][warehouse] = flt(projected_qty)
-
-		warehouse_doc = frappe.get_doc("Warehouse", warehouse)
-
-		while warehouse_doc.parent_warehouse:
-			if not item_warehouse_projected_qty.get(item_code, {}).get(warehouse_doc.parent_warehouse):
-				item_warehouse_projected_qty.setdefault(item_code, {})[warehouse_doc.parent_warehouse] = flt(
-					projected_qty
-				)
-			else:
-				item_warehouse_projected_qty[item_code][warehouse_doc.parent_warehouse] += flt(projected_qty)
-			warehouse_doc = frappe.get_doc("Warehouse", warehouse_doc.parent_warehouse)
+
+	bin = frappe.qb.DocType("Bin")
+	warehouse = frappe.qb.DocType("Warehouse")
+	parent_warehouse = frappe.qb.DocType("Warehouse").as_("parent_warehouse")
+
+	# roll up the bins to every ancestor warehouse using the nested set of the warehouse tree
+	query = (
+		frappe.qb.from_(bin)
+		.inner_join(warehouse)
+		.on(bin.warehouse == warehouse.name)
+		.inner_join(parent_warehouse)
+		.on((parent_warehouse.lft <= warehouse.lft) & (parent_warehouse.rgt >= warehouse.rgt))
+		.select(bin.item_code, parent_warehouse.name, Sum(bin.projected_qty))
+		.where(bin.item_code.isin(list(items_to_consider)))
+		.groupby(bin.item_code, parent_warehouse.name)
+	)
+
+	for item_code, warehouse_name, projected_qty in query.run():
+		item_warehouse_projected_qty.setdefault(item_code, {})[warehouse_name] = flt(projected_qty)
 
 	return item_warehouse_projected_qty
 
@@ -229,6 +256,8 @@ def create_material_request(material_requests):
 		mr.log_error("Unable to create material request")
 
 	company_wise_mr = frappe._dict({})
+	conversion_factors = get_purchase_uom_conversion_factors(material_requests)
+
 	for request_type in material_requests:
 		for company in material_requests[request_type]:
 			try:
@@ -241,52 +270,12 @@ def create_material_request(material_requests):
 					{
 						"company": company,
 						"transaction_date": nowdate(),
-						"material_request_type": "Material Transfer"
-						if request_type == "Transfer"
-						else request_type,
+						"material_request_type": get_material_request_type(request_type),
 					}
 				)
 
-				for d in items:
-					d = frappe._dict(d)
-					item = d.get("item_details")
-					uom = item.stock_uom
-					conversion_factor = 1.0
-
-					if request_type == "Purchase":
-						uom = item.purchase_uom or item.stock_uom
-						if uom != item.stock_uom:
-							conversion_factor = (
-								frappe.db.get_value(
-									"UOM Conversion Detail",
-									{"parent": item.name, "uom": uom},
-									"conversion_factor",
-								)
-								or 1.0
-							)
-
-					must_be_whole_number = frappe.db.get_value("UOM", uom, "must_be_whole_number", cache=True)
-					qty = d.reorder_qty / conversion_factor
-					if must_be_whole_number:
-						qty = ceil(qty)
-
-					mr.append(
-						"items",
-						{
-							"doctype": "Material Request Item",
-							"item_code": d.item_code,
-							"schedule_date": add_days(nowdate(), cint(item.lead_time_days)),
-							"qty": qty,
-							"conversion_factor": conversion_factor,
-							"uom": uom,
-							"stock_uom": item.stock_uom,
-							"warehouse": d.warehouse,
-							"item_name": item.item_name,
-							"description": item.description,
-							"item_group": item.item_group,
-							"brand": item.brand,
-						},
-					)
+				for d in get_material_request_items(request_type, items, conversion_factors):
+					mr.append("items", d)
 
 				schedule_dates = [d.schedule_date for d in mr.items]
 				mr.schedule_date = max(schedule_dates or [nowdate()])
@@ -315,6 +304,72 @@ def create_material_request(material_requests):
 	return mr_list
 
 
+def get_material_request_type(request_type):
+	return "Material Transfer" if request_type == "Transfer" else request_type
+
+
+def get_purchase_uom_conversion_factors(material_requests):
+	"""Conversion factors of the purchase UOMs of all items to be purchased, fetched together"""
+	items = [
+		d.get("item_details")
+		for company_items in material_requests.get("Purchase", {}).values()
+		for d in company_items
+	]
+	items = [item for item in items if item.purchase_uom and item.purchase_uom != item.stock_uom]
+	if not items:
+		return {}
+
+	conversion_factors = frappe.get_all(
+		"UOM Conversion Detail",
+		filters={
+			"parent": ("in", list({item.name for item in items})),
+			"parenttype": "Item",
+			"uom": ("in", list({item.purchase_uom for item in items})),
+		},
+		fields=["parent", "uom", "conversion_factor"],
+	)
+
+	return {(d.parent, d.uom): d.conversion_factor for d in conversion_factors}
+
+
+def get_material_request_items(request_type, items, conversion_factors):
+	mr_items = []
+	for d in items:
+		d = frappe._dict(d)
+		item = d.get("item_details")
+		uom = item.stock_uom
+		conversion_factor = 1.0
+
+		if request_type == "Purchase":
+			uom = item.purchase_uom or item.stock_uom
+			if uom != item.stock_uom:
+				conversion_factor = conversion_factors.get((item.name, uom)) or 1.0
+
+		must_be_whole_number = frappe.db.get_value("UOM", uom, "must_be_whole_number", cache=True)
+		qty = d.reorder_qty / conversion_factor
+		if must_be_whole_number:
+			qty = ceil(qty)
+
+		mr_items.append(
+			{
+				"doctype": "Material Request Item",
+				"item_code": d.item_code,
+				"schedule_date": add_days(nowdate(), cint(item.lead_time_days)),
+				"qty": qty,
+				"conversion_factor": conversion_factor,
+				"uom": uom,
+				"stock_uom": item.stock_uom,
+				"warehouse": d.warehouse,
+				"item_name": item.item_name,
+				"description": item.description,
+				"item_group": item.item_group,
+				"brand": item.brand,
+			}
+		)
+
+	return mr_items
+
+
 def send_email_notification(company_wise_mr):
 	"""Notify user about auto creation of indent"""
 
@@ -69,7 +69,7 @@ def get_columns(filters):
 
 def get_data(filters):
 	data = []
-	batchwise_data = get_batchwise_data_from_stock_ledger(filters)
+	batchwise_data = get_batchwise_data(filters)
 
 	data = parse_batchwise_data(batchwise_data)
 
@@ -88,10 +88,10 @@ def parse_batchwise_data(batchwise_data):
 	return data
 
 
-def get_batchwise_data_from_stock_ledger(filters):
+def get_batchwise_data(filters):
 	batchwise_data = frappe._dict({})
 
-	table = frappe.qb.DocType("Stock Ledger Entry")
+	table = frappe.qb.DocType("Batch Bin")
 	batch = frappe.qb.DocType("Batch")
 
 	query = (
@@ -105,7 +105,6 @@ def get_batchwise_data_from_stock_ledger(filters):
 			batch.expiry_date,
 			Sum(table.actual_qty).as_("balance_qty"),
 		)
-		.where(table.is_cancelled == 0)
 		.groupby(table.batch_no, table.item_code, table.warehouse)
 	)
 
@@ -115,9 +114,37 @@ def get_batchwise_data_from_stock_ledger(filters):
 		key = (d.item_code, d.warehouse, d.batch_no)
 		batchwise_data.setdefault(key, d)
 
+	if filters.to_date != today():
+		# batch bins hold the current qty, take back what was posted after the date
+		for d in get_qty_posted_after(filters):
+			key = (d.item_code, d.warehouse, d.batch_no)
+			if key in batchwise_data:
+				batchwise_data[key].balance_qty -= flt(d.qty)
+
 	return batchwise_data
 
 
+def get_qty_posted_after(filters):
+	table = frappe.qb.DocType("Stock Ledger Entry")
+	batch = frappe.qb.DocType("Batch")
+
+	query = (
+		frappe.qb.from_(table)
+		.inner_join(batch)
+		.on(table.batch_no == batch.name)
+		.select(
+			table.item_code,
+			table.batch_no,
+			table.warehouse,
+			Sum(table.actual_qty).as_("qty"),
+		)
+		.where((table.is_cancelled == 0) & (table.posting_date > filters.to_date))
+		.groupby(table.batch_no, table.item_code, table.warehouse)
+	)
+
+	return get_query_based_on_filters(query, batch, table, filters).run(as_dict=True)
+
+
 def get_query_based_on_filters(query, batch, table, filters):
 	if filters.item_code:
 		query = query.where(table.item_code == filters.item_code)
@@ -131,9 +158,6 @@ def get_query_based_on_filters(query, batch, table, filters):
 
 		query = query.where(batch.batch_qty > 0)
 
-	else:
-		query = query.where(table.posting_date <= filters.to_date)
-
 	if filters.warehouse:
 		lft, rgt = frappe.db.get_value("Warehouse", filters.warehouse, ["lft", "rgt"])
 		warehouses = frappe.get_all(
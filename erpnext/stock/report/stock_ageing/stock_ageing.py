@@ -10,6 +10,7 @@ from frappe.query_builder import Order
 from frappe.utils import add_days, cint, date_diff, flt, get_date_str, get_datetime, getdate
 
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import get_stock_balance_snapshot
 
 Filters = frappe._dict
 
@@ -225,7 +226,9 @@ class FIFOSlots:
 		self.sle = sle
 
 	def get_closing_balance(self):
-		if self.filters.get("ignore_closing_balance"):
+		# `skip_closing_balance` is set by the stock balance snapshot job, which still
+		# starts from the previous snapshot
+		if self.filters.get("ignore_closing_balance") or self.filters.get("skip_closing_balance"):
 			return []
 
 		if (
@@ -277,6 +280,24 @@ class FIFOSlots:
 
 			self.__update_balances(d, key)
 
+	def prepare_stock_ageing_from_snapshot(self) -> bool:
+		if self.sle is not None or self.filters.get("ignore_closing_balance"):
+			return False
+
+		snapshot_date, snapshot = get_stock_balance_snapshot(self.filters, self.filters.get("to_date"))
+		if not snapshot_date:
+			return False
+
+		self.start_from = add_days(snapshot_date, 1)
+
+		for d in snapshot:
+			d.actual_qty = d.bal_qty
+			key, _, _ = self.__init_key_stores(d)
+
+			self.__update_balances(d, key)
+
+		return True
+
 	def generate(self) -> dict:
 		"""
 		Returns dict of the foll.g structure:
@@ -288,7 +309,8 @@ class FIFOSlots:
 		}
 		"""
 		self.start_from = None
-		self.prepare_stock_ageing_from_stock_closing_balance()
+		if not self.prepare_stock_ageing_from_snapshot():
+			self.prepare_stock_ageing_from_stock_closing_balance()
 
 		stock_ledger_entries = self.sle
 
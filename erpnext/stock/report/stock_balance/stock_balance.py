@@ -14,6 +14,7 @@ from frappe.utils.nestedset import get_descendants_of
 
 import erpnext
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import get_stock_balance_snapshot
 from erpnext.stock.doctype.warehouse.warehouse import apply_warehouse_filter
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, get_average_age
 from erpnext.stock.utils import add_additional_uom_columns
@@ -75,6 +76,9 @@ class StockBalanceReport:
 	def prepare_opening_data_from_closing_balance(self) -> None:
 		self.opening_data = frappe._dict({})
 
+		if self.prepare_opening_data_from_snapshot():
+			return
+
 		closing_balance = self.get_closing_balance()
 		if not closing_balance:
 			return
@@ -89,6 +93,29 @@ class StockBalanceReport:
 			if group_by_key not in self.opening_data:
 				self.opening_data.setdefault(group_by_key, entry)
 
+	def prepare_opening_data_from_snapshot(self) -> bool:
+		if self.filters.get("ignore_closing_balance"):
+			return False
+
+		# snapshots are kept per item and warehouse only
+		if self.filters.get("show_dimension_wise_stock") or any(
+			self.filters.get(fieldname) for fieldname in self.inventory_dimensions
+		):
+			return False
+
+		snapshot_date, snapshot = get_stock_balance_snapshot(self.filters, self.from_date, inclusive=False)
+		if not snapshot_date:
+			return False
+
+		self.start_from = add_days(snapshot_date, 1)
+
+		for entry in snapshot:
+			group_by_key = self.get_group_by_key(entry)
+			if group_by_key not in self.opening_data:
+				self.opening_data.setdefault(group_by_key, entry)
+
+		return True
+
 	def prepare_new_data(self):
 		self.item_warehouse_map = self.get_item_warehouse_map()
 
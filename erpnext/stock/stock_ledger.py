@@ -7,11 +7,24 @@ import frappe
 from frappe import _, bold
 from frappe.model.meta import get_field_precision
 from frappe.query_builder.functions import Sum
-from frappe.utils import cint, cstr, flt, format_date, get_link_to_form, getdate, now, nowdate
+from frappe.utils import (
+	cint,
+	cstr,
+	flt,
+	format_date,
+	get_datetime,
+	get_link_to_form,
+	getdate,
+	now,
+	nowdate,
+)
 
 import erpnext
 from erpnext.stock.doctype.bin.bin import update_qty as update_bin_qty
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	clear_stock_balance_snapshots,
+)
 from erpnext.stock.utils import (
 	get_combine_datetime,
 	get_incoming_outgoing_rate_for_cancel,
@@ -21,6 +34,22 @@ from erpnext.stock.utils import (
 )
 from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
 
+# number of future entries fetched (and written back) at a time while reposting
+REPOST_SLE_CHUNK_SIZE = 500
+
+# fields of a Stock Ledger Entry which are recomputed while reposting
+REPOSTED_SLE_FIELDS = (
+	"actual_qty",
+	"serial_no",
+	"incoming_rate",
+	"outgoing_rate",
+	"qty_after_transaction",
+	"valuation_rate",
+	"stock_value",
+	"stock_value_difference",
+	"stock_queue",
+)
+
 
 class NegativeStockError(frappe.ValidationError):
 	pass
@@ -48,6 +77,10 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 		args = get_args_for_future_sle(sl_entries[0])
 		future_sle_exists(args, sl_entries)
 
+		clear_stock_balance_snapshots(
+			sl_entries[0].get("company"), min(getdate(sle.get("posting_date")) for sle in sl_entries)
+		)
+
 		for sle in sl_entries:
 			if cancel:
 				sle["actual_qty"] = -flt(sle.get("actual_qty"))
@@ -150,12 +183,19 @@ def validate_cancellation(args):
 
 
 def set_as_cancel(voucher_type, voucher_no):
+	from erpnext.stock.doctype.batch_bin.batch_bin import cancel_batch_bin_qty
+	from erpnext.stock.doctype.serial_no_ledger_entry.serial_no_ledger_entry import (
+		delete_serial_no_ledger_entries,
+	)
+
+	cancel_batch_bin_qty(voucher_type, voucher_no)
 	frappe.db.sql(
 		"""update `tabStock Ledger Entry` set is_cancelled=1,
 		modified=%s, modified_by=%s
 		where voucher_type=%s and voucher_no=%s and is_cancelled = 0""",
 		(now(), frappe.session.user, voucher_type, voucher_no),
 	)
+	delete_serial_no_ledger_entries(voucher_type, voucher_no)
 
 
 def make_entry(args, allow_negative_stock=False, via_landed_cost_voucher=False):
@@ -190,6 +230,9 @@ def repost_future_sle(
 
 	distinct_item_warehouses = get_distinct_item_warehouse(args, doc)
 	affected_transactions = get_affected_transactions(doc)
+	stop_on_convergence = cint(
+		frappe.db.get_single_value("Stock Reposting Settings", "stop_repost_on_convergence")
+	)
 
 	i = get_current_index(doc) or 0
 	while i < len(args):
@@ -205,6 +248,7 @@ def repost_future_sle(
 				"distinct_item_warehouses": distinct_item_warehouses,
 				"items_to_be_repost": args,
 				"current_index": i,
+				"stop_on_convergence": stop_on_convergence,
 			},
 			allow_negative_stock=allow_negative_stock,
 			via_landed_cost_voucher=via_landed_cost_voucher,
@@ -354,10 +398,37 @@ class update_entries_after:
 		self.distinct_item_warehouses = args.get("distinct_item_warehouses", frappe._dict())
 		self.affected_transactions: set[tuple[str, str]] = set()
 
+		# reposted values are buffered and written back in batches
+		self.sle_updates = {}
+		self.set_convergence_check()
+
 		self.data = frappe._dict()
 		self.initialize_previous_data(self.args)
 		self.build()
 
+	def set_convergence_check(self):
+		"""
+		Reposting can stop once a future entry recomputes to exactly what is already stored,
+		since entries after it only depend on the running balance which is then unchanged.
+
+		Serial / batch valuation depends on more than the running balance, so such items
+		are always reposted till the end.
+		"""
+		self.stop_on_convergence = cint(self.args.get("stop_on_convergence")) and not (
+			self.via_landed_cost_voucher or self.args.get("sle_id")
+		)
+
+		if self.stop_on_convergence:
+			has_serial_no, has_batch_no = frappe.get_cached_value(
+				"Item", self.item_code, ["has_serial_no", "has_batch_no"]
+			)
+			self.stop_on_convergence = not (has_serial_no or has_batch_no)
+
+		# convergence only counts after at least one reposted entry has actually changed
+		self.reposted_entry_changed = False
+		# latest dependent entry in this item-warehouse, reposting can't stop before it
+		self.dependent_datetime = None
+
 	def set_precision(self):
 		self.flt_precision = cint(frappe.db.get_default("float_precision")) or 2
 		self.currency_precision = get_field_precision(
@@ -396,6 +467,7 @@ class update_entries_after:
 			{
 				"prev_stock_value": previous_sle.stock_value or 0.0,
 				"stock_queue": json.loads(previous_sle.stock_queue or "[]"),
+				"valuation_queue": None,
 				"stock_value_difference": 0.0,
 			}
 		)
@@ -405,21 +477,28 @@ class update_entries_after:
 
 		if self.args.get("sle_id"):
 			self.process_sle_against_current_timestamp()
+			self.flush_sle_updates()
 			if not future_sle_exists(self.args):
 				self.update_bin()
 		else:
-			entries_to_fix = self.get_future_entries_to_fix()
-
-			i = 0
-			while i < len(entries_to_fix):
-				sle = entries_to_fix[i]
-				i += 1
+			last_sle = None
+			for sle in self.get_future_entries_to_fix():
+				stored_values = self.get_stored_values(sle) if self.stop_on_convergence else None
 
 				self.process_sle(sle)
-				self.update_bin_data(sle)
+				last_sle = sle
 
 				if sle.dependant_sle_voucher_detail_no:
-					entries_to_fix = self.get_dependent_entries_to_fix(entries_to_fix, sle)
+					self.get_dependent_entries_to_fix(sle)
+
+				if stored_values and self.has_converged(sle, stored_values):
+					# remaining entries are already correct, bin has to match the last of them
+					last_sle = self.get_last_sle() or sle
+					break
+
+			self.flush_sle_updates()
+			if last_sle:
+				self.update_bin_data(last_sle)
 
 		if self.exceptions:
 			self.raise_exceptions()
@@ -455,40 +534,81 @@ class update_entries_after:
 		)
 
 	def get_future_entries_to_fix(self):
-		# includes current entry!
-		args = self.data[self.args.warehouse].previous_sle or frappe._dict(
-			{"item_code": self.item_code, "warehouse": self.args.warehouse}
+		"""Yield future entries (including current entry!) in chunks of `REPOST_SLE_CHUNK_SIZE`.
+
+		Chunks are paginated on (posting_datetime, creation), so only one chunk is held in memory.
+		"""
+		args = frappe._dict(
+			self.data[self.args.warehouse].previous_sle
+			or {"item_code": self.item_code, "warehouse": self.args.warehouse}
 		)
 
-		return list(self.get_sle_after_datetime(args))
+		extra_cond = None
+		while True:
+			entries = self.get_sle_after_datetime(args, limit=REPOST_SLE_CHUNK_SIZE, extra_cond=extra_cond)
+			yield from entries
+
+			if len(entries) < REPOST_SLE_CHUNK_SIZE:
+				break
+
+			last_entry = entries[-1]
+			args["last_posting_datetime"] = last_entry.posting_datetime
+			args["last_creation"] = last_entry.creation
+			# entries sharing the last timestamp are skipped by name, creation can repeat
+			args["last_names"] = tuple(
+				d.name
+				for d in entries
+				if d.posting_datetime == last_entry.posting_datetime and d.creation == last_entry.creation
+			)
+			extra_cond = """ and (
+				posting_datetime > %(last_posting_datetime)s
+				or (
+					posting_datetime = %(last_posting_datetime)s
+					and creation >= %(last_creation)s
+					and name not in %(last_names)s
+				)
+			)"""
 
-	def get_dependent_entries_to_fix(self, entries_to_fix, sle):
+	def get_dependent_entries_to_fix(self, sle):
 		dependant_sle = get_sle_by_voucher_detail_no(
 			sle.dependant_sle_voucher_detail_no, excluded_sle=sle.name
 		)
 
 		if not dependant_sle:
-			return entries_to_fix
+			return
 		elif dependant_sle.item_code == self.item_code and dependant_sle.warehouse == self.args.warehouse:
-			return entries_to_fix
+			self.set_dependent_datetime(dependant_sle)
 		elif dependant_sle.item_code != self.item_code:
 			self.update_distinct_item_warehouses(dependant_sle)
-			return entries_to_fix
 		elif dependant_sle.item_code == self.item_code and dependant_sle.warehouse in self.data:
-			return entries_to_fix
+			return
 		else:
 			self.initialize_previous_data(dependant_sle)
 			self.update_distinct_item_warehouses(dependant_sle)
-			return entries_to_fix
+
+	def set_dependent_datetime(self, dependant_sle):
+		if not self.dependent_datetime or get_datetime(self.dependent_datetime) < get_datetime(
+			dependant_sle.timestamp
+		):
+			self.dependent_datetime = dependant_sle.timestamp
 
 	def update_distinct_item_warehouses(self, dependant_sle):
 		key = (dependant_sle.item_code, dependant_sle.warehouse)
 		val = frappe._dict({"sle": dependant_sle})
 
+		# reposting of the dependent item-warehouse must not stop before the dependent entry
+		dependent_datetime = dependant_sle.timestamp
+		if key in self.distinct_item_warehouses:
+			existing_datetime = self.distinct_item_warehouses[key].get("dependent_datetime")
+			if existing_datetime and get_datetime(existing_datetime) > get_datetime(dependent_datetime):
+				dependent_datetime = existing_datetime
+		val["dependent_datetime"] = dependent_datetime
+
 		if key not in self.distinct_item_warehouses:
 			self.distinct_item_warehouses[key] = val
 			self.new_items_found = True
 		else:
+			self.distinct_item_warehouses[key]["dependent_datetime"] = dependent_datetime
 			existing_sle = self.distinct_item_warehouses[key].get("sle", {})
 			if getdate(existing_sle.get("posting_date")) > getdate(dependant_sle.posting_date):
 				self.distinct_item_warehouses[key] = val
@@ -613,9 +733,7 @@ class update_entries_after:
 					self.wh_data.valuation_rate
 				)
 				if self.valuation_method != "Moving Average":
-					self.wh_data.stock_queue = [
-						[self.wh_data.qty_after_transaction, self.wh_data.valuation_rate]
-					]
+					self.set_stock_queue([[self.wh_data.qty_after_transaction, self.wh_data.valuation_rate]])
 			else:
 				if self.valuation_method == "Moving Average":
 					self.get_moving_average_values(sle)
@@ -637,11 +755,12 @@ class update_entries_after:
 		sle.qty_after_transaction = self.wh_data.qty_after_transaction
 		sle.valuation_rate = self.wh_data.valuation_rate
 		sle.stock_value = self.wh_data.stock_value
-		sle.stock_queue = json.dumps(self.wh_data.stock_queue)
+		sle.stock_queue = self.get_stock_queue_json()
 
 		if not sle.is_adjustment_entry:
 			sle.stock_value_difference = stock_value_difference
 		elif sle.is_adjustment_entry and not self.args.get("sle_id"):
+			self.flush_sle_updates()
 			sle.stock_value_difference = (
 				get_stock_value_difference(
 					sle.item_code, sle.warehouse, sle.posting_date, sle.posting_time, sle.voucher_no
@@ -649,14 +768,88 @@ class update_entries_after:
 				* -1
 			)
 
-		sle.doctype = "Stock Ledger Entry"
-		sle.modified = now()
-		frappe.get_doc(sle).db_update()
+		self.queue_sle_update(sle)
 
 		if not self.args.get("sle_id"):
 			self.update_outgoing_rate_on_transaction(sle)
 
+	def get_stored_values(self, sle):
+		return {field: sle.get(field) for field in REPOSTED_SLE_FIELDS}
+
+	def has_converged(self, sle, stored_values) -> bool:
+		"""Check if the reposted entry is same as the stored one, after an earlier entry has changed."""
+		if self.exceptions or sle.is_adjustment_entry:
+			return False
+
+		unchanged = (
+			flt(sle.actual_qty, self.flt_precision) == flt(stored_values["actual_qty"], self.flt_precision)
+			and flt(sle.qty_after_transaction, self.flt_precision)
+			== flt(stored_values["qty_after_transaction"], self.flt_precision)
+			and all(
+				flt(sle.get(field), self.currency_precision)
+				== flt(stored_values[field], self.currency_precision)
+				for field in ("valuation_rate", "stock_value", "stock_value_difference")
+			)
+			and self.is_same_stock_queue(sle.stock_queue, stored_values["stock_queue"])
+		)
+
+		if not unchanged:
+			self.reposted_entry_changed = True
+			return False
+
+		if not self.reposted_entry_changed:
+			return False
+
+		# dependent entries of this item-warehouse (changed by this repost) must still be reposted
+		dependent_datetimes = [self.dependent_datetime]
+		key = (self.item_code, self.args.warehouse)
+		if self.distinct_item_warehouses.get(key):
+			dependent_datetimes.append(self.distinct_item_warehouses[key].get("dependent_datetime"))
+
+		return all(not d or get_datetime(sle.timestamp) > get_datetime(d) for d in dependent_datetimes)
+
+	def is_same_stock_queue(self, stock_queue, stored_stock_queue) -> bool:
+		stock_queue = json.loads(stock_queue or "[]")
+		stored_stock_queue = json.loads(stored_stock_queue or "[]")
+
+		if len(stock_queue) != len(stored_stock_queue):
+			return False
+
+		return all(
+			flt(qty, self.flt_precision) == flt(stored_qty, self.flt_precision)
+			and flt(rate, self.currency_precision) == flt(stored_rate, self.currency_precision)
+			for (qty, rate, *_), (stored_qty, stored_rate, *_) in zip(
+				stock_queue, stored_stock_queue, strict=True
+			)
+		)
+
+	def get_last_sle(self):
+		return frappe.db.get_value(
+			"Stock Ledger Entry",
+			{"item_code": self.item_code, "warehouse": self.args.warehouse, "is_cancelled": 0},
+			["item_code", "warehouse", "qty_after_transaction", "stock_value", "valuation_rate"],
+			order_by="posting_datetime desc, creation desc",
+			as_dict=True,
+		)
+
+	def queue_sle_update(self, sle):
+		self.sle_updates[sle.name] = {field: sle.get(field) for field in REPOSTED_SLE_FIELDS}
+
+		if len(self.sle_updates) >= REPOST_SLE_CHUNK_SIZE:
+			self.flush_sle_updates()
+
+	def flush_sle_updates(self):
+		"""Write buffered reposted values, must be called before reading the ledger back."""
+		if not self.sle_updates:
+			return
+
+		frappe.db.bulk_update(
+			"Stock Ledger Entry", self.sle_updates, chunk_size=REPOST_SLE_CHUNK_SIZE, modified=now()
+		)
+		self.sle_updates = {}
+
 	def reset_actual_qty_for_stock_reco(self, sle):
+		self.flush_sle_updates()
 		doc = frappe.get_cached_doc("Stock Reconciliation", sle.voucher_no)
 		doc.recalculate_current_qty(sle.voucher_detail_no, sle.creation, sle.actual_qty >= 0)
 
@@ -668,11 +861,24 @@ class update_entries_after:
 				as_dict=True,
 			)
 
-			sle.actual_qty = flt(stock_reco_details.current_qty) * -1
+			actual_qty = flt(stock_reco_details.current_qty) * -1
+			if sle.batch_no:
+				from erpnext.stock.doctype.batch_bin.batch_bin import update_batch_bin_qty
+
+				update_batch_bin_qty(
+					sle.item_code, sle.warehouse, sle.batch_no, actual_qty - flt(sle.actual_qty)
+				)
+
+			sle.actual_qty = actual_qty
 
 			if stock_reco_details.sn_no:
+				from erpnext.stock.doctype.serial_no_ledger_entry.serial_no_ledger_entry import (
+					update_serial_no_ledger_entries,
+				)
+
 				sle.serial_no = stock_reco_details.sn_no
 				sle.qty_after_transaction = 0.0
+				update_serial_no_ledger_entries(sle)
 
 		if sle.serial_no:
 			self.update_serial_no_status(sle)
@@ -726,6 +932,7 @@ class update_entries_after:
 	def get_dynamic_incoming_outgoing_rate(self, sle):
 		# Get updated incoming/outgoing rate from transaction
 		if sle.recalculate_rate:
+			self.flush_sle_updates()
 			rate = self.get_incoming_outgoing_rate_from_transaction(sle)
 
 			if flt(sle.actual_qty) >= 0:
@@ -851,6 +1058,7 @@ class update_entries_after:
 			self.recalculate_amounts_in_stock_entry(sle.voucher_no, sle.voucher_detail_no)
 
 	def recalculate_amounts_in_stock_entry(self, voucher_no, voucher_detail_no):
+		self.flush_sle_updates()
 		stock_entry = frappe.get_doc("Stock Entry", voucher_no, for_update=True)
 		stock_entry.calculate_rate_and_amount(reset_outgoing_rate=False, raise_error_if_no_rate=False)
 		stock_entry.db_update()
@@ -924,6 +1132,7 @@ class update_entries_after:
 
 	def update_rate_on_stock_reconciliation(self, sle):
 		if not sle.serial_no and not sle.batch_no:
+			self.flush_sle_updates()
 			sr = frappe.get_doc("Stock Reconciliation", sle.voucher_no, for_update=True)
 
 			for item in sr.items:
@@ -971,6 +1180,7 @@ class update_entries_after:
 			# In case of delivery/stock issue, get average purchase rate
 			# of serial nos of current entry
 			if not sle.is_cancelled:
+				self.flush_sle_updates()
 				outgoing_value = self.get_incoming_value_for_serial_nos(sle, serial_nos)
 				stock_value_change = -1 * outgoing_value
 			else:
@@ -1005,21 +1215,18 @@ class update_entries_after:
 		for serial_no in invalid_serial_nos:
 			incoming_rate = frappe.db.sql(
 				"""
-				select incoming_rate
-				from `tabStock Ledger Entry`
+				select sle.incoming_rate
+				from `tabSerial No Ledger Entry` sn_ledger
+				inner join `tabStock Ledger Entry` sle on sle.name = sn_ledger.stock_ledger_entry
 				where
-					company = %s
-					and actual_qty > 0
-					and is_cancelled = 0
-					and (serial_no = %s
-						or serial_no like %s
-						or serial_no like %s
-						or serial_no like %s
-					)
-				order by posting_date desc
+					sn_ledger.serial_no = %s
+					and sn_ledger.company = %s
+					and sle.actual_qty > 0
+					and sle.is_cancelled = 0
+				order by sle.posting_date desc
 				limit 1
 			""",
-				(sle.company, serial_no, serial_no + "\n%", "%\n" + serial_no, "%\n" + serial_no + "\n%"),
+				(serial_no, sle.company),
 			)
 
 			incoming_values += flt(incoming_rate[0][0]) if incoming_rate else 0
@@ -1074,10 +1281,7 @@ class update_entries_after:
 			self.wh_data.qty_after_transaction + actual_qty
 		)
 
-		if self.valuation_method == "LIFO":
-			stock_queue = LIFOValuation(self.wh_data.stock_queue)
-		else:
-			stock_queue = FIFOValuation(self.wh_data.stock_queue)
+		stock_queue = self.get_valuation_queue()
 
 		_prev_qty, prev_stock_value = stock_queue.get_total_stock_and_value()
 
@@ -1102,17 +1306,43 @@ class update_entries_after:
 
 		stock_value_difference = stock_value - prev_stock_value
 
-		self.wh_data.stock_queue = stock_queue.state
 		self.wh_data.stock_value = round_off_if_near_zero(self.wh_data.stock_value + stock_value_difference)
 
-		if not self.wh_data.stock_queue:
-			self.wh_data.stock_queue.append(
-				[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]
-			)
+		# the valuation object is kept for the next entry of the warehouse, its bins are
+		# written to `stock_queue` of the entry by `get_stock_queue_json`
+		if next(iter(stock_queue), None) is None:
+			self.set_stock_queue([[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]])
 
 		if self.wh_data.qty_after_transaction:
 			self.wh_data.valuation_rate = self.wh_data.stock_value / self.wh_data.qty_after_transaction
 
+	def set_stock_queue(self, stock_queue):
+		"""Replace queue of the warehouse, valuation object is rebuilt from it on next use."""
+		self.wh_data.stock_queue = stock_queue
+		self.wh_data.valuation_queue = None
+
+	def get_stock_queue_json(self) -> str:
+		"""Queue of the warehouse as JSON, read in place from the valuation object when in use."""
+		stock_queue = self.wh_data.get("valuation_queue")
+		if stock_queue is None:
+			stock_queue = self.wh_data.stock_queue
+
+		return "[" + ", ".join(json.dumps(stock_bin) for stock_bin in stock_queue) + "]"
+
+	def get_valuation_queue(self):
+		"""Get FIFO / LIFO queue of the warehouse, reused across entries until
+		`stock_queue` is replaced using `set_stock_queue` (e.g. by stock reconciliation)."""
+		stock_queue = self.wh_data.get("valuation_queue")
+		if stock_queue is None:
+			if self.valuation_method == "LIFO":
+				stock_queue = LIFOValuation(self.wh_data.stock_queue)
+			else:
+				stock_queue = FIFOValuation(self.wh_data.stock_queue)
+
+			self.wh_data.valuation_queue = stock_queue
+
+		return stock_queue
+
 	def update_batched_values(self, sle):
 		incoming_rate = flt(sle.incoming_rate)
 		actual_qty = flt(sle.actual_qty)
@@ -1124,6 +1354,7 @@ class update_entries_after:
 		if actual_qty > 0:
 			stock_value_difference = incoming_rate * actual_qty
 		else:
+			self.flush_sle_updates()
 			outgoing_rate = get_batch_incoming_rate(
 				item_code=sle.item_code,
 				warehouse=sle.warehouse,
@@ -1160,6 +1391,7 @@ class update_entries_after:
 	def get_fallback_rate(self, sle) -> float:
 		"""When exact incoming rate isn't available use any of other "average" rates as fallback.
 		This should only get used for negative stock."""
+		self.flush_sle_updates()
 		return get_valuation_rate(
 			sle.item_code,
 			sle.warehouse,
@@ -1177,9 +1409,17 @@ class update_entries_after:
 		sle = sle[0] if sle else frappe._dict()
 		return sle
 
-	def get_sle_after_datetime(self, args):
+	def get_sle_after_datetime(self, args, limit=None, extra_cond=None):
 		"""get Stock Ledger Entries after a particular datetime, for reposting"""
-		return get_stock_ledger_entries(args, ">", "asc", for_update=True, check_serial_no=False)
+		return get_stock_ledger_entries(
+			args,
+			">",
+			"asc",
+			limit=limit and f"limit {cint(limit)}",
+			for_update=True,
+			check_serial_no=False,
+			extra_cond=extra_cond,
+		)
 
 	def raise_exceptions(self):
 		msg_list = []
@@ -1323,23 +1563,10 @@ def get_stock_ledger_entries(
 		conditions += " and " + previous_sle.get("warehouse_condition")
 
 	if check_serial_no and previous_sle.get("serial_no"):
-		# conditions += " and serial_no like {}".format(frappe.db.escape('%{0}%'.format(previous_sle.get("serial_no"))))
-		serial_no = previous_sle.get("serial_no")
-		conditions += (
-			""" and
-			(
-				serial_no = {}
-				or serial_no like {}
-				or serial_no like {}
-				or serial_no like {}
-			)
-		"""
-		).format(
-			frappe.db.escape(serial_no),
-			frappe.db.escape(f"{serial_no}\n%"),
-			frappe.db.escape(f"%\n{serial_no}"),
-			frappe.db.escape(f"%\n{serial_no}\n%"),
-		)
+		conditions += """ and name in (
+			select stock_ledger_entry from `tabSerial No Ledger Entry`
+			where serial_no = {} and item_code = %(item_code)s
+		)""".format(frappe.db.escape(previous_sle.get("serial_no")))
 
 	if not previous_sle.get("posting_date"):
 		previous_sle["posting_datetime"] = "1900-01-01 00:00:00"
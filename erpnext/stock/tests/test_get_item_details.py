@@ -2,7 +2,7 @@ import frappe
 from frappe.test_runner import make_test_records
 from frappe.tests.utils import FrappeTestCase
 
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.get_item_details import get_item_details, get_items_details
 
 test_ignore = ["BOM"]
 test_dependencies = ["Customer", "Supplier", "Item", "Price List", "Item Price"]
@@ -34,3 +34,33 @@ class TestGetItemDetail(FrappeTestCase):
 		)
 		details = get_item_details(args)
 		self.assertEqual(details.get("price_list_rate"), 100)
+
+	def test_get_items_details_matches_get_item_details(self):
+		args_list = [
+			frappe._dict(
+				{
+					"item_code": item_code,
+					"company": "_Test Company",
+					"conversion_rate": 1.0,
+					"price_list_currency": "INR",
+					"plc_conversion_rate": 1.0,
+					"doctype": "Sales Order",
+					"name": None,
+					"customer": "_Test Customer",
+					"transaction_date": "2013-02-01",
+					"price_list": "_Test Price List",
+					"warehouse": "_Test Warehouse - _TC",
+					"ignore_pricing_rule": 1,
+					"qty": 1,
+				}
+			)
+			for item_code in ("_Test Item", "_Test Item 2", "_Test FG Item 2")
+		]
+
+		expected = [get_item_details(args.copy()) for args in args_list]
+		# as sent by the item grid
+		details = get_items_details(frappe.as_json(args_list))
+
+		for row, expected_row in zip(details, expected, strict=True):
+			for fieldname in ("price_list_rate", "projected_qty", "actual_qty", "reserved_qty"):
+				self.assertEqual(row.get(fieldname), expected_row.get(fieldname))
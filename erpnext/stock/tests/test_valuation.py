@@ -91,6 +91,28 @@ class TestFIFOValuation(unittest.TestCase):
 		self.queue.remove_stock(3, 20)
 		self.assertEqual(self.queue, [[1, 10], [5, 20]])
 
+	def test_remove_bins_with_rate_across_queue(self):
+		for rate in (10, 20, 30, 20, 40):
+			self.queue.add_stock(1, rate)
+
+		self.queue.remove_stock(1, 20)
+		self.queue.remove_stock(1, 40)
+		self.queue.remove_stock(1)
+		self.assertEqual(self.queue, [[1, 30], [1, 20]])
+
+		self.queue.add_stock(1, 40)
+		self.queue.remove_stock(2, 40)
+		self.assertEqual(self.queue, [[1, 20]])
+
+	def test_queue_state_is_shared(self):
+		state = [[1, 10], [1, 20], [1, 30]]
+		self.queue = FIFOValuation(state)
+
+		self.queue.remove_stock(1)
+		self.queue.remove_stock(1, 30)
+		self.assertIs(self.queue.state, state)
+		self.assertEqual(state, [[1, 20]])
+
 	def test_queue_with_unknown_rate(self):
 		self.queue.add_stock(1, 1)
 		self.queue.add_stock(1, 2)
@@ -124,6 +146,18 @@ class TestFIFOValuation(unittest.TestCase):
 		self.queue.add_stock(5, 17)
 		self.queue.add_stock(8, 11)
 
+	def test_reading_queue_keeps_layout(self):
+		for rate in (10, 20, 30):
+			self.queue.add_stock(1, rate)
+		self.queue.remove_stock(1)
+		self.queue.remove_stock(1, outgoing_rate=30)
+
+		bins, head = list(self.queue.queue), self.queue.head
+		self.assertEqual(self.queue.get_total_stock_and_value(), (1, 20))
+		self.assertEqual(list(self.queue), [[1, 20]])
+		# consumed bins are still skipped in place, not compacted on every read
+		self.assertEqual((self.queue.queue, self.queue.head), (bins, head))
+
 	@given(stock_queue_generator)
 	def test_fifo_qty_hypothesis(self, stock_queue):
 		self.queue = FIFOValuation([])
@@ -154,38 +154,27 @@ def get_stock_balance(
 
 
 def get_serial_nos_data_after_transactions(args):
-	serial_nos = set()
 	args = frappe._dict(args)
 
-	sle = frappe.qb.DocType("Stock Ledger Entry")
+	# serial nos which came into the warehouse more often than they went out
+	serial_no_ledger = frappe.qb.DocType("Serial No Ledger Entry")
 	query = (
-		frappe.qb.from_(sle)
-		.select(sle.serial_no, sle.actual_qty)
+		frappe.qb.from_(serial_no_ledger)
+		.select(serial_no_ledger.serial_no)
 		.where(
-			(sle.is_cancelled == 0)
-			& (sle.item_code == args.item_code)
-			& (sle.warehouse == args.warehouse)
-			& (
-				CombineDatetime(sle.posting_date, sle.posting_time)
-				< CombineDatetime(args.posting_date, args.posting_time)
-			)
+			(serial_no_ledger.item_code == args.item_code)
+			& (serial_no_ledger.warehouse == args.warehouse)
+			& (serial_no_ledger.posting_datetime < get_combine_datetime(args.posting_date, args.posting_time))
+			& (serial_no_ledger.stock_ledger_entry.isnotnull())
 		)
-		.orderby(sle.posting_date, sle.posting_time, sle.creation)
+		.groupby(serial_no_ledger.serial_no)
+		.having(Sum(serial_no_ledger.direction) > 0)
 	)
 
 	if args.batch_no:
-		query = query.where(sle.batch_no == args.batch_no)
-
-	stock_ledger_entries = query.run(as_dict=True)
-
-	for stock_ledger_entry in stock_ledger_entries:
-		changed_serial_no = get_serial_nos_data(stock_ledger_entry.serial_no)
-		if stock_ledger_entry.actual_qty > 0:
-			serial_nos.update(changed_serial_no)
-		else:
-			serial_nos.difference_update(changed_serial_no)
+		query = query.where(serial_no_ledger.batch_no == args.batch_no)
 
-	return "\n".join(serial_nos)
+	return "\n".join(query.run(pluck=True))
 
 
 def get_serial_nos_data(serial_nos):
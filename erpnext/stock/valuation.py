@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod, abstractproperty
+from collections import deque
 from collections.abc import Callable
 from typing import NewType
 
@@ -26,11 +27,15 @@ class BinWiseValuation(ABC):
 	def state(self) -> list[StockBin]:
 		pass
 
+	def get_bins(self) -> list[StockBin]:
+		"""Get current bins without changing the internal layout of the queue."""
+		return self.state
+
 	def get_total_stock_and_value(self) -> tuple[float, float]:
 		total_qty = 0.0
 		total_value = 0.0
 
-		for qty, rate in self.state:
+		for qty, rate in self.get_bins():
 			total_qty += flt(qty)
 			total_value += flt(qty) * flt(rate)
 
@@ -57,20 +62,65 @@ class FIFOValuation(BinWiseValuation):
 	Queue is implemented using "bins" of [qty, rate].
 
 	ref: https://en.wikipedia.org/wiki/FIFO_and_LIFO_accounting
+	Implementation detail: consumed bins are not removed from the list right away, bins
+	consumed from the front are skipped using `head` and others are replaced by `None`.
+	They are dropped when `state` is read, this makes consumption O(1). Use `get_bins`
+	to read the bins of a queue which is still being updated.
+	Positions of bins are indexed by rate for consuming bins with the outgoing rate.
 	"""
 
 	# specifying the attributes to save resources
 	# ref: https://docs.python.org/3/reference/datamodel.html#slots
-	__slots__ = ["queue"]
+	__slots__ = ["head", "offset", "queue", "rate_index", "removed", "total_qty", "total_value"]
 
 	def __init__(self, state: list[StockBin] | None):
 		self.queue: list[StockBin] = state if state is not None else []
 
+		# index of first unconsumed bin in `queue`
+		self.head = 0
+		# number of bins after `head` which are consumed
+		self.removed = 0
+		# number of bins dropped from the front of `queue` since `rate_index` was built
+		self.offset = 0
+		# rate -> positions (index + offset) of bins with that rate, built when required
+		self.rate_index: dict[float, deque[int]] | None = None
+		# running totals of the bins, updated on every change
+		self.total_qty = 0.0
+		self.total_value = 0.0
+		for stock_bin in self.queue:
+			self._update_totals(stock_bin[QTY], stock_bin[RATE])
+
 	@property
 	def state(self) -> list[StockBin]:
 		"""Get current state of queue."""
+		if self.removed:
+			self.queue[:] = [stock_bin for stock_bin in self.queue[self.head :] if stock_bin is not None]
+			self.head = self.removed = 0
+			self.rate_index = None
+		elif self.head:
+			del self.queue[: self.head]
+			self.offset += self.head
+			self.head = 0
+
 		return self.queue
 
+	def get_bins(self) -> list[StockBin]:
+		"""Get unconsumed bins, unlike `state` this doesn't compact the queue and
+		keeps `rate_index` intact."""
+		if self.removed:
+			return [stock_bin for stock_bin in self.queue[self.head :] if stock_bin is not None]
+
+		return self.queue[self.head :]
+
+	def __iter__(self):
+		# unconsumed bins, read in place without compacting the queue
+		return (
+			self.queue[index] for index in range(self.head, len(self.queue)) if self.queue[index] is not None
+		)
+
+	def get_total_stock_and_value(self) -> tuple[float, float]:
+		return round_off_if_near_zero(self.total_qty), round_off_if_near_zero(self.total_value)
+
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update fifo queue with new stock.
 
@@ -78,22 +128,28 @@ class FIFOValuation(BinWiseValuation):
 		        qty: new quantity to add
 		        rate: incoming rate of new quantity"""
 
-		if not len(self.queue):
-			self.queue.append([0, 0])
+		if not self._bin_count():
+			self._append_bin([0, 0])
 
 		# last row has the same rate, merge new bin.
 		if self.queue[-1][RATE] == rate:
 			self.queue[-1][QTY] += qty
+			self._update_totals(qty, rate)
 		else:
 			# Item has a positive balance qty, add new entry
 			if self.queue[-1][QTY] > 0:
-				self.queue.append([qty, rate])
+				self._append_bin([qty, rate])
 			else:  # negative balance qty
-				qty = self.queue[-1][QTY] + qty
+				last_qty, last_rate = self.queue[-1]
+				qty = last_qty + qty
 				if qty > 0:  # new balance qty is positive
 					self.queue[-1] = [qty, rate]
+					self._index_bin(len(self.queue) - 1)
+					self._update_totals(-last_qty, last_rate)
+					self._update_totals(qty, rate)
 				else:  # new balance qty is still negative, maintain same rate
 					self.queue[-1][QTY] = qty
+					self._update_totals(qty - last_qty, last_rate)
 
 	def remove_stock(
 		self, qty: float, outgoing_rate: float = 0.0, rate_generator: Callable[[], float] | None = None
@@ -110,46 +166,101 @@ class FIFOValuation(BinWiseValuation):
 
 		consumed_bins = []
 		while qty:
-			if not len(self.queue):
+			if not self._bin_count():
 				# rely on rate generator.
-				self.queue.append([0, rate_generator()])
+				self._append_bin([0, rate_generator()])
 
 			index = None
 			if outgoing_rate > 0:
 				# Find the entry where rate matched with outgoing rate
-				for idx, fifo_bin in enumerate(self.queue):
-					if fifo_bin[RATE] == outgoing_rate:
-						index = idx
-						break
-
-				# If no entry found with outgoing rate, consume as per FIFO
-				if index is None:  # nosemgrep
-					index = 0
-			else:
-				index = 0
+				index = self._find_bin(outgoing_rate)
+
+			# If no entry found with outgoing rate, consume as per FIFO
+			if index is None:  # nosemgrep
+				index = self.head
 
 			# select first bin or the bin with same rate
 			fifo_bin = self.queue[index]
 			if qty >= fifo_bin[QTY]:
 				# consume current bin
 				qty = round_off_if_near_zero(qty - fifo_bin[QTY])
-				to_consume = self.queue.pop(index)
-				consumed_bins.append(list(to_consume))
+				self._remove_bin(index)
+				consumed_bins.append(list(fifo_bin))
 
-				if not self.queue and qty:
+				if not self._bin_count() and qty:
 					# stock finished, qty still remains to be withdrawn
 					# negative stock, keep in as a negative bin
-					self.queue.append([-qty, outgoing_rate or fifo_bin[RATE]])
+					self._append_bin([-qty, outgoing_rate or fifo_bin[RATE]])
 					consumed_bins.append([qty, outgoing_rate or fifo_bin[RATE]])
 					break
 			else:
 				# qty found in current bin consume it and exit
-				fifo_bin[QTY] = round_off_if_near_zero(fifo_bin[QTY] - qty)
+				bin_qty = fifo_bin[QTY]
+				fifo_bin[QTY] = round_off_if_near_zero(bin_qty - qty)
+				self._update_totals(fifo_bin[QTY] - bin_qty, fifo_bin[RATE])
 				consumed_bins.append([qty, fifo_bin[RATE]])
 				qty = 0
 
 		return consumed_bins
 
+	def _bin_count(self) -> int:
+		return len(self.queue) - self.head - self.removed
+
+	def _update_totals(self, qty: float, rate: float) -> None:
+		self.total_qty += flt(qty)
+		self.total_value += flt(qty) * flt(rate)
+
+	def _append_bin(self, stock_bin: StockBin) -> None:
+		self.queue.append(stock_bin)
+		self._index_bin(len(self.queue) - 1)
+		self._update_totals(stock_bin[QTY], stock_bin[RATE])
+
+	def _remove_bin(self, index: int) -> None:
+		self._update_totals(-self.queue[index][QTY], self.queue[index][RATE])
+		self.queue[index] = None
+		self.removed += 1
+
+		if not self._bin_count():
+			# drop rounding errors accumulated in the totals
+			self.total_qty = self.total_value = 0.0
+
+		# keep first and last bins in the queue unconsumed
+		while self.head < len(self.queue) and self.queue[self.head] is None:
+			self.head += 1
+			self.removed -= 1
+
+		while len(self.queue) > self.head and self.queue[-1] is None:
+			self.queue.pop()
+			self.removed -= 1
+			# positions get reused by new bins, index is rebuilt on next lookup
+			self.rate_index = None
+
+	def _index_bin(self, index: int) -> None:
+		if self.rate_index is not None:
+			self.rate_index.setdefault(self.queue[index][RATE], deque()).append(index + self.offset)
+
+	def _find_bin(self, rate: float) -> int | None:
+		"""Get index of the first bin with given rate."""
+		if self.rate_index is None:
+			self.rate_index = {}
+			for index in range(self.head, len(self.queue)):
+				if self.queue[index] is not None:
+					self._index_bin(index)
+
+		positions = self.rate_index.get(rate)
+		while positions:
+			index = positions[0] - self.offset
+			# skip consumed bins and bins whose rate has since changed
+			if (
+				self.head <= index < len(self.queue)
+				and self.queue[index] is not None
+				and self.queue[index][RATE] == rate
+			):
+				return index
+			positions.popleft()
+
+		return None
+
 
 class LIFOValuation(BinWiseValuation):
 	"""Valuation method where a *stack* of all the incoming stock is maintained.
@@ -2,7 +2,8 @@
 # For license information, please see license.txt
 
 
-from datetime import datetime
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
 
 import frappe
 from frappe import _
@@ -13,7 +14,6 @@ from frappe.utils import (
 	get_datetime,
 	get_datetime_str,
 	get_link_to_form,
-	get_time,
 	get_time_zone,
 	get_weekdays,
 	getdate,
@@ -27,6 +27,8 @@ from frappe.utils.safe_exec import get_safe_globals
 
 from erpnext.support.doctype.issue.issue import get_holidays
 
+SLA_CALENDAR_CACHE_KEY = "service_level_agreement_calendar"
+
 
 class ServiceLevelAgreement(Document):
 	def validate(self):
@@ -207,12 +209,14 @@ class ServiceLevelAgreement(Document):
 
 	def on_trash(self):
 		set_documents_with_active_service_level_agreement()
+		clear_service_level_agreement_calendars(self)
 
 	def after_insert(self):
 		set_documents_with_active_service_level_agreement()
 
 	def on_update(self):
 		set_documents_with_active_service_level_agreement()
+		clear_service_level_agreement_calendars(self)
 
 	def clear_cache(self):
 		get_sla_doctypes.clear_cache()
@@ -291,14 +295,16 @@ class ServiceLevelAgreement(Document):
 def check_agreement_status():
 	service_level_agreements = frappe.get_all(
 		"Service Level Agreement",
-		filters=[{"enabled": 1}, {"default_service_level_agreement": 0}],
-		fields=["name"],
+		filters=[
+			{"enabled": 1},
+			{"default_service_level_agreement": 0},
+			{"end_date": ("<", getdate())},
+		],
+		pluck="name",
 	)
 
 	for service_level_agreement in service_level_agreements:
-		doc = frappe.get_doc("Service Level Agreement", service_level_agreement.name)
-		if doc.end_date and getdate(doc.end_date) < getdate(frappe.utils.getdate()):
-			frappe.db.set_value("Service Level Agreement", service_level_agreement.name, "enabled", 0)
+		frappe.db.set_value("Service Level Agreement", service_level_agreement, "enabled", 0)
 
 
 def get_active_service_level_agreement_for(doc):
@@ -602,53 +608,140 @@ def update_response_and_resolution_metrics(doc, apply_sla_for_resolution):
 
 
 def get_expected_time_for(parameter, service_level, start_date_time):
-	current_date_time = start_date_time
-	expected_time = current_date_time
-	start_time = end_time = None
-	expected_time_is_set = 0
-
 	allotted_seconds = get_allotted_seconds(parameter, service_level)
-	support_days = get_support_days(service_level)
-	holidays = get_holidays(service_level.get("holiday_list"))
-	weekdays = get_weekdays()
+	calendar = get_service_level_agreement_calendar(service_level)
 
-	while not expected_time_is_set:
-		current_weekday = weekdays[current_date_time.weekday()]
+	return calendar.add_working_seconds(start_date_time, allotted_seconds)
 
-		if not is_holiday(current_date_time, holidays) and current_weekday in support_days:
-			if (
-				getdate(current_date_time) == getdate(start_date_time)
-				and get_time_in_timedelta(current_date_time.time()) > support_days[current_weekday].start_time
-			):
-				start_time = current_date_time - datetime(
-					current_date_time.year, current_date_time.month, current_date_time.day
-				)
+
+class WorkingCalendar:
+	"""Support hours of a Service Level Agreement compiled for fast date arithmetic.
+
+	Days are handled as ordinals. The working seconds of the days before a day are the
+	seconds of the whole weeks before it, plus those of the remaining weekdays, less those lost
+	to the holidays before it, found by bisecting the sorted holidays."""
+
+	def __init__(self, support_days, holidays):
+		weekdays = get_weekdays()
+
+		# start and end of support in seconds, by weekday number
+		self.windows = {}
+		for weekday, window in support_days.items():
+			start, end = (to_timedelta(window.start_time), to_timedelta(window.end_time))
+			self.windows[weekdays.index(weekday)] = (start.total_seconds(), end.total_seconds())
+
+		self.seconds_by_weekday = [
+			max(self.windows[weekday][1] - self.windows[weekday][0], 0) if weekday in self.windows else 0
+			for weekday in range(7)
+		]
+		self.seconds_per_week = sum(self.seconds_by_weekday)
+
+		# working seconds of the days 0 to r - 1 (ordinal 1 is a Monday)
+		self.seconds_before_residue = [0]
+		for ordinal in range(6):
+			self.seconds_before_residue.append(
+				self.seconds_before_residue[-1] + self.seconds_by_weekday[(ordinal + 6) % 7]
+			)
+
+		self.holidays = sorted({getdate(holiday).toordinal() for holiday in holidays})
+		self.holiday_seconds_before = [0]
+		for ordinal in self.holidays:
+			self.holiday_seconds_before.append(
+				self.holiday_seconds_before[-1] + self.seconds_by_weekday[(ordinal + 6) % 7]
+			)
+
+	def get_window(self, ordinal):
+		"""Start and end of support on a day, None on holidays and days without support"""
+		index = bisect_left(self.holidays, ordinal)
+		if index < len(self.holidays) and self.holidays[index] == ordinal:
+			return None
+
+		return self.windows.get((ordinal + 6) % 7)
+
+	def get_seconds_before(self, ordinal):
+		"""Working seconds of the whole days before a day"""
+		weeks, residue = divmod(ordinal, 7)
+		seconds = weeks * self.seconds_per_week + self.seconds_before_residue[residue]
+
+		return seconds - self.holiday_seconds_before[bisect_left(self.holidays, ordinal)]
+
+	def get_day_start(self, date_time, ordinal):
+		"""Support start on the day of `date_time`, or the time of `date_time` if support already started"""
+		window = self.get_window(ordinal)
+		if not window:
+			return None, None
+
+		start, end = window
+		seconds = get_seconds_of_day(date_time)
+		if int(seconds) > start:
+			start = seconds
+
+		return start, end
+
+	def add_working_seconds(self, start_date_time, seconds):
+		"""Time at which `seconds` of support have passed since `start_date_time`"""
+		start_date_time = get_datetime(start_date_time)
+		if not seconds:
+			return start_date_time
+
+		ordinal = start_date_time.toordinal()
+
+		start, end = self.get_day_start(start_date_time, ordinal)
+		if start is not None and end > start:
+			if end - start >= seconds:
+				return self.get_datetime(ordinal, start + seconds)
+			seconds -= end - start
+
+		if not self.seconds_per_week:
+			frappe.throw(_("Support hours of the Service Level Agreement are not set"))
+
+		# find the first day by which the remaining seconds have passed,
+		# doubling the searched range of days until it is found
+		seconds_before_next_day = self.get_seconds_before(ordinal + 1)
+		low, high = ordinal + 1, ordinal + 8
+		while self.get_seconds_before(high) - seconds_before_next_day < seconds:
+			low, high = high, high + 2 * (high - ordinal)
+
+		while high - low > 1:
+			mid = (low + high) // 2
+			if self.get_seconds_before(mid) - seconds_before_next_day < seconds:
+				low = mid
 			else:
-				start_time = support_days[current_weekday].start_time
-
-			end_time = support_days[current_weekday].end_time
-			time_left_today = time_diff_in_seconds(end_time, start_time)
-			# no time left for support today
-			if time_left_today <= 0:
-				pass
-
-			elif allotted_seconds:
-				if time_left_today >= allotted_seconds:
-					expected_time = datetime.combine(getdate(current_date_time), get_time(start_time))
-					expected_time = add_to_date(expected_time, seconds=allotted_seconds)
-					expected_time_is_set = 1
-				else:
-					allotted_seconds = allotted_seconds - time_left_today
-
-		if not expected_time_is_set:
-			current_date_time = add_to_date(current_date_time, days=1)
-
-	if end_time and allotted_seconds >= 86400:
-		current_date_time = datetime.combine(getdate(current_date_time), get_time(end_time))
-	else:
-		current_date_time = expected_time
+				high = mid
+
+		day = high - 1
+		seconds -= self.get_seconds_before(day) - seconds_before_next_day
 
-	return current_date_time
+		return self.get_datetime(day, self.get_window(day)[0] + seconds)
+
+	@staticmethod
+	def get_datetime(ordinal, seconds):
+		return datetime.combine(date.fromordinal(ordinal), time()) + timedelta(seconds=seconds)
+
+
+def get_seconds_of_day(date_time):
+	return (date_time - datetime.combine(date_time.date(), time())).total_seconds()
+
+
+def get_service_level_agreement_calendar(service_level):
+	"""Compiled support hours of a Service Level Agreement, cached until it or its Holiday List changes"""
+	name = service_level.get("service_level_agreement")
+	calendar = frappe.cache().hget(SLA_CALENDAR_CACHE_KEY, name) if name else None
+	if calendar is None:
+		calendar = WorkingCalendar(
+			get_support_days(service_level), get_holidays(service_level.get("holiday_list"))
+		)
+		if name:
+			frappe.cache().hset(SLA_CALENDAR_CACHE_KEY, name, calendar)
+
+	return calendar
+
+
+def clear_service_level_agreement_calendars(doc=None, method=None):
+	if doc and doc.doctype == "Service Level Agreement":
+		frappe.cache().hdel(SLA_CALENDAR_CACHE_KEY, doc.name)
+	else:
+		frappe.cache().delete_key(SLA_CALENDAR_CACHE_KEY)
 
 
 def get_allotted_seconds(parameter, service_level):
@@ -730,9 +823,15 @@ def change_service_level_agreement_and_priority(self):
 
 
 def get_response_and_resolution_duration(doc):
-	sla = frappe.get_doc("Service Level Agreement", doc.service_level_agreement)
+	sla = frappe.get_cached_doc("Service Level Agreement", doc.service_level_agreement)
 	priority = sla.get_service_level_agreement_priority(doc.priority)
-	priority.update({"support_and_resolution": sla.support_and_resolution, "holiday_list": sla.holiday_list})
+	priority.update(
+		{
+			"service_level_agreement": sla.name,
+			"support_and_resolution": sla.support_and_resolution,
+			"holiday_list": sla.holiday_list,
+		}
+	)
 	return priority
 
 
@@ -957,17 +1056,6 @@ def update_agreement_status(doc, apply_sla_for_resolution):
 				doc.agreement_status = "Failed"
 
 
-def is_holiday(date, holidays):
-	return getdate(date) in holidays
-
-
-def get_time_in_timedelta(time):
-	"""Converts datetime.time(10, 36, 55, 961454) to datetime.timedelta(seconds=38215)."""
-	import datetime
-
-	return datetime.timedelta(hours=time.hour, minutes=time.minute, seconds=time.second)
-
-
 def now_datetime(user):
 	dt = convert_utc_to_user_timezone(datetime.utcnow(), user)
 	return dt.replace(tzinfo=None)
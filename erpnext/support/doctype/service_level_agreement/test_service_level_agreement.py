@@ -9,6 +9,7 @@ from frappe.utils import flt
 
 from erpnext.support.doctype.issue_priority.test_issue_priority import make_priorities
 from erpnext.support.doctype.service_level_agreement.service_level_agreement import (
+	WorkingCalendar,
 	get_service_level_agreement_fields,
 )
 
@@ -357,6 +358,31 @@ class TestServiceLevelAgreement(unittest.TestCase):
 		applied_sla = frappe.db.get_value("Lead", lead.name, "service_level_agreement")
 		self.assertFalse(applied_sla)
 
+	def test_working_calendar(self):
+		support_days = {
+			workday: frappe._dict(
+				start_time=datetime.timedelta(hours=10), end_time=datetime.timedelta(hours=18)
+			)
+			for workday in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+		}
+		# Tuesday
+		calendar = WorkingCalendar(support_days, [datetime.date(2019, 3, 5)])
+
+		# Monday 15:30 + 10 hours skips the holiday on Tuesday
+		start = datetime.datetime(2019, 3, 4, 15, 30)
+		self.assertEqual(
+			calendar.add_working_seconds(start, 10 * 3600), datetime.datetime(2019, 3, 6, 17, 30)
+		)
+		# skips the weekend and continues next week
+		self.assertEqual(
+			calendar.add_working_seconds(start, 30 * 3600), datetime.datetime(2019, 3, 11, 13, 30)
+		)
+		# before support starts on Saturday
+		self.assertEqual(
+			calendar.add_working_seconds(datetime.datetime(2019, 3, 9, 8, 0), 3600),
+			datetime.datetime(2019, 3, 11, 11, 0),
+		)
+
 	def tearDown(self):
 		for d in frappe.get_all("Service Level Agreement"):
 			frappe.delete_doc("Service Level Agreement", d.name, force=1)
@@ -4,11 +4,14 @@
 import unittest
 
 import frappe
+from frappe.tests.utils import change_settings
 
 from erpnext.accounts.doctype.pos_profile.test_pos_profile import make_pos_profile
-from erpnext.selling.page.point_of_sale.point_of_sale import get_items
+from erpnext.accounts.doctype.pricing_rule.test_pricing_rule import make_item_price
+from erpnext.selling.page.point_of_sale.point_of_sale import get_item_catalogue, get_items
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.get_item_details import insert_item_price
 
 
 class TestPointOfSale(unittest.TestCase):
@@ -61,3 +64,98 @@ class TestPointOfSale(unittest.TestCase):
 
 		self.assertEqual(len(filtered_items), 1)
 		self.assertEqual(filtered_items[0]["item_code"], item2.item_code)
+
+	def test_item_search_by_barcode_and_prefix(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Barcode Search")
+		item = make_item(
+			"Test Search Barcode Item",
+			{"is_stock_item": 1, "barcodes": [{"barcode": "POS-BARCODE-0001"}]},
+		)
+
+		result = get_items(
+			start=0,
+			page_length=20,
+			price_list=None,
+			item_group=item.item_group,
+			pos_profile=pos_profile.name,
+			search_term="POS-BARCODE-0001",
+		)
+		filtered_items = result.get("items")
+
+		self.assertEqual(len(filtered_items), 1)
+		self.assertEqual(filtered_items[0]["item_code"], item.item_code)
+		self.assertEqual(filtered_items[0]["barcode"], "POS-BARCODE-0001")
+
+		# saving the item refreshes the cached catalogue
+		item.append("barcodes", {"barcode": "POS-BARCODE-0002"})
+		item.save()
+
+		result = get_items(
+			start=0,
+			page_length=20,
+			price_list=None,
+			item_group=item.item_group,
+			pos_profile=pos_profile.name,
+			search_term="POS-BARCODE-0002",
+		)
+		self.assertEqual(result["items"][0]["item_code"], item.item_code)
+
+		result = get_items(
+			start=0,
+			page_length=20,
+			price_list=None,
+			item_group=item.item_group,
+			pos_profile=pos_profile.name,
+			search_term="test barc",
+		)
+		self.assertIn(item.item_code, [d["item_code"] for d in result["items"]])
+
+	def test_item_catalogue_permission(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Catalogue")
+
+		frappe.set_user("Guest")
+		try:
+			self.assertRaises(frappe.PermissionError, get_item_catalogue, pos_profile.name)
+		finally:
+			frappe.set_user("Administrator")
+
+		self.assertIn("items", get_item_catalogue(pos_profile.name))
+
+	@change_settings(
+		"Stock Settings",
+		{
+			"auto_insert_price_list_rate_if_missing": 1,
+			"update_existing_price_list_rate": 1,
+			"update_price_list_based_on": "Rate",
+		},
+	)
+	def test_item_catalogue_refreshed_on_price_update(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Price Update")
+		item = make_item("Test POS Price Update Item", {"is_stock_item": 0})
+		make_item_price(item.name, "_Test Price List", 100)
+
+		def get_price():
+			result = get_items(
+				start=0,
+				page_length=20,
+				price_list="_Test Price List",
+				item_group=item.item_group,
+				pos_profile=pos_profile.name,
+				search_term=item.name,
+			)
+			return next(d["price_list_rate"] for d in result["items"] if d["item_code"] == item.name)
+
+		self.assertEqual(get_price(), 100)
+
+		# the rate is updated without the doc events of Item Price
+		insert_item_price(
+			frappe._dict(
+				item_code=item.name,
+				price_list="_Test Price List",
+				currency="INR",
+				stock_uom=item.stock_uom,
+				conversion_factor=1,
+				rate=90,
+			)
+		)
+		self.assertEqual(get_price(), 90)
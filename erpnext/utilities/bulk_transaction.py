@@ -1,9 +1,15 @@
 import json
-from datetime import date, datetime
+import time
 
 import frappe
 from frappe import _
-from frappe.utils import get_link_to_form, today
+from frappe.utils import flt, get_link_to_form, now, nowtime, today
+from frappe.utils.background_jobs import is_job_enqueued
+
+# documents converted by one background job
+CHUNK_SIZE = 100
+# documents converted by a job between two commits of their logs
+COMMIT_INTERVAL = 20
 
 
 @frappe.whitelist()
@@ -19,13 +25,65 @@ def transaction_processing(data, from_doctype, to_doctype):
 	length_of_data = len(deserialized_data)
 
 	frappe.msgprint(_("Started a background job to create {1} {0}").format(to_doctype, length_of_data))
-	frappe.enqueue(
-		job,
-		deserialized_data=deserialized_data,
-		from_doctype=from_doctype,
-		to_doctype=to_doctype,
+
+	jobs = create_logs([d.get("name") for d in deserialized_data], from_doctype, to_doctype)
+	enqueue_jobs(jobs, from_doctype, to_doctype)
+
+
+def enqueue_jobs(jobs, from_doctype, to_doctype):
+	"""Enqueue a job for each chunk of logs in `jobs` {job_id: log_names}, unless it is already
+	queued or running. Chunks are converted by separate jobs, which run on any free worker."""
+	for job_id, log_names in jobs.items():
+		if is_job_enqueued(job_id):
+			continue
+
+		frappe.enqueue(
+			job,
+			queue="long",
+			job_id=job_id,
+			enqueue_after_commit=True,
+			now=frappe.flags.in_test,
+			log_names=log_names,
+			from_doctype=from_doctype,
+			to_doctype=to_doctype,
+		)
+
+
+def resume_queued_transactions():
+	"""Enqueue the documents still queued whose job is neither queued nor running, i.e. was interrupted"""
+	queued_logs = frappe.get_all(
+		"Bulk Transaction Log Detail",
+		filters={"transaction_status": "Queued"},
+		fields=["name", "job_id", "from_doctype", "to_doctype"],
+		order_by="creation, name",
 	)
 
+	jobs_by_doctype, unassigned = {}, {}
+	for log in queued_logs:
+		key = (log.from_doctype, log.to_doctype)
+		if log.job_id:
+			jobs_by_doctype.setdefault(key, {}).setdefault(log.job_id, []).append(log.name)
+		else:
+			unassigned.setdefault(key, []).append(log.name)
+
+	# logs queued before job ids were stored get one now, kept when they are resumed again
+	log = frappe.qb.DocType("Bulk Transaction Log Detail")
+	for key, log_names in unassigned.items():
+		for job_id, chunk in get_job_chunks(log_names).items():
+			frappe.qb.update(log).set(log.job_id, job_id).where(log.name.isin(chunk)).run()
+			jobs_by_doctype.setdefault(key, {})[job_id] = chunk
+
+	for (from_doctype, to_doctype), jobs in jobs_by_doctype.items():
+		enqueue_jobs(jobs, from_doctype, to_doctype)
+
+
+def get_job_chunks(log_names):
+	"""Split `log_names` into chunks converted by one job each, as {job_id: log_names}"""
+	return {
+		f"bulk_transaction::{log_names[i]}": log_names[i : i + CHUNK_SIZE]
+		for i in range(0, len(log_names), CHUNK_SIZE)
+	}
+
 
 @frappe.whitelist()
 def retry(date: str | None = None):
@@ -66,34 +124,108 @@ def retry_failed_transactions(failed_docs: list | None):
 
 
 def update_log(log_name, status, retried, err=None):
-	frappe.db.set_value("Bulk Transaction Log Detail", log_name, "transaction_status", status)
-	frappe.db.set_value("Bulk Transaction Log Detail", log_name, "retried", retried)
+	values = {"transaction_status": status, "retried": retried}
 	if err:
-		frappe.db.set_value("Bulk Transaction Log Detail", log_name, "error_description", err)
+		values["error_description"] = err
+
+	frappe.db.set_value("Bulk Transaction Log Detail", log_name, values)
+
+
+def update_logs(results):
+	"""Set the status of the logs in `results` [(log_name, status, error)], with a single query
+	for all the successful ones"""
+	succeeded = [log_name for log_name, status, _err in results if status == "Success"]
+	if succeeded:
+		log = frappe.qb.DocType("Bulk Transaction Log Detail")
+		(
+			frappe.qb.update(log)
+			.set(log.transaction_status, "Success")
+			.set(log.modified, now())
+			.where(log.name.isin(succeeded))
+		).run()
+
+	for log_name, status, err in results:
+		if status != "Success":
+			update_log(log_name, status, 0, err)
+
+
+def job(log_names, from_doctype, to_doctype):
+	"""Convert the documents of the queued `log_names`. Logs are committed with their documents every
+	few documents, so that an interrupted job is resumed from the documents still queued."""
+	start_time = time.monotonic()
+	results, processed, fail_count = [], 0, 0
+
+	def commit():
+		update_logs(results)
+		results.clear()
+
+		if not frappe.flags.in_test:
+			frappe.db.commit()  # nosemgrep
+
+		publish_progress(from_doctype, to_doctype, processed, len(log_names), fail_count, start_time)
+
+	for log_name in log_names:
+		frappe.db.savepoint("before_creation_state")
+
+		try:
+			log = lock_log(log_name)
+		except frappe.QueryTimeoutError:
+			# wait=False fails immediately if another job is converting it, that job sets its status
+			frappe.db.rollback(save_point="before_creation_state")
+			continue
 
+		if not log or log.transaction_status != "Queued":
+			continue
 
-def job(deserialized_data, from_doctype, to_doctype):
-	fail_count = 0
-	for d in deserialized_data:
 		try:
-			doc_name = d.get("name")
-			frappe.db.savepoint("before_creation_state")
-			task(doc_name, from_doctype, to_doctype)
+			task(log.transaction_name, from_doctype, to_doctype)
 		except Exception:
 			frappe.db.rollback(save_point="before_creation_state")
 			fail_count += 1
-			create_log(
-				doc_name,
-				str(frappe.get_traceback(with_context=True)),
-				from_doctype,
-				to_doctype,
-				status="Failed",
-				log_date=str(date.today()),
-			)
+			results.append((log_name, "Failed", str(frappe.get_traceback(with_context=True))))
 		else:
-			create_log(doc_name, None, from_doctype, to_doctype, status="Success", log_date=str(date.today()))
+			results.append((log_name, "Success", None))
+
+		processed += 1
+		if len(results) >= COMMIT_INTERVAL:
+			commit()
+
+	commit()
+	show_job_status(fail_count, processed, to_doctype)
+
+
+def lock_log(log_name):
+	"""Lock the log until it is committed, so that a resumed job does not convert it again. Fails right
+	away instead of waiting when another job holds the lock."""
+	return frappe.db.get_value(
+		"Bulk Transaction Log Detail",
+		log_name,
+		["transaction_name", "transaction_status"],
+		as_dict=True,
+		for_update=True,
+		wait=False,
+	)
+
+
+def publish_progress(from_doctype, to_doctype, processed, total, fail_count, start_time):
+	elapsed = time.monotonic() - start_time
 
-	show_job_status(fail_count, len(deserialized_data), to_doctype)
+	frappe.publish_realtime(
+		"bulk_transaction_progress",
+		{
+			"from_doctype": from_doctype,
+			"to_doctype": to_doctype,
+			"processed": processed,
+			"total": total,
+			"failed": fail_count,
+			"docs_per_second": flt(processed / elapsed, 2) if elapsed else 0,
+			"queued": frappe.db.count(
+				"Bulk Transaction Log Detail",
+				{"from_doctype": from_doctype, "to_doctype": to_doctype, "transaction_status": "Queued"},
+			),
+		},
+		user=frappe.session.user,
+	)
 
 
 def task(doc_name, from_doctype, to_doctype):
@@ -150,18 +282,57 @@ def task(doc_name, from_doctype, to_doctype):
 	obj.insert(ignore_mandatory=True)
 
 
-def create_log(doc_name, e, from_doctype, to_doctype, status, log_date=None, restarted=0):
-	transaction_log = frappe.new_doc("Bulk Transaction Log Detail")
-	transaction_log.transaction_name = doc_name
-	transaction_log.date = today()
-	now = datetime.now()
-	transaction_log.time = now.strftime("%H:%M:%S")
-	transaction_log.transaction_status = status
-	transaction_log.error_description = str(e)
-	transaction_log.from_doctype = from_doctype
-	transaction_log.to_doctype = to_doctype
-	transaction_log.retried = restarted
-	transaction_log.save(ignore_permissions=True)
+def create_logs(doc_names, from_doctype, to_doctype):
+	"""Log the documents to convert as queued, with a single query. Returns the chunks of log names
+	to convert as {job_id: log_names}, the job id is stored with the logs to resume the chunk."""
+	timestamp, user = now(), frappe.session.user
+	date, time_of_day = today(), nowtime()
+
+	log_names = [frappe.generate_hash(length=10) for _ in doc_names]
+	jobs = get_job_chunks(log_names)
+	job_ids = {log_name: job_id for job_id, chunk in jobs.items() for log_name in chunk}
+
+	values = []
+	for log_name, doc_name in zip(log_names, doc_names, strict=True):
+		values.append(
+			(
+				log_name,
+				job_ids[log_name],
+				timestamp,
+				timestamp,
+				user,
+				user,
+				doc_name,
+				from_doctype,
+				to_doctype,
+				"Queued",
+				date,
+				time_of_day,
+				0,
+			)
+		)
+
+	frappe.db.bulk_insert(
+		"Bulk Transaction Log Detail",
+		fields=[
+			"name",
+			"job_id",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			"transaction_name",
+			"from_doctype",
+			"to_doctype",
+			"transaction_status",
+			"date",
+			"time",
+			"retried",
+		],
+		values=values,
+	)
+
+	return jobs
 
 
 def show_job_status(fail_count, deserialized_data_count, to_doctype):
@@ -1,11 +1,14 @@
 # Copyright (c) 2021, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+from contextlib import contextmanager
+
 import frappe
 from frappe.query_builder.functions import IfNull
 from frappe.utils import cint, flt, fmt_money, getdate, nowdate
 
 from erpnext.accounts.doctype.pricing_rule.pricing_rule import get_pricing_rule_for_item
+from erpnext.accounts.doctype.pricing_rule.utils import batch_pricing_rules
 from erpnext.stock.doctype.batch.batch import get_batch_qty
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
 
@@ -94,24 +97,23 @@ def qty_from_all_warehouses(batch_info):
 def get_price(item_code, price_list, customer_group, company, qty=1):
 	from erpnext.e_commerce.shopping_cart.cart import get_party
 
-	template_item_code = frappe.db.get_value("Item", item_code, "variant_of")
+	batch = frappe.flags.web_item_price_batch
+	if batch and (batch.price_list != price_list or item_code not in batch.variant_of):
+		batch = None
+
+	if batch:
+		template_item_code = batch.variant_of[item_code]
+	else:
+		template_item_code = frappe.db.get_value("Item", item_code, "variant_of")
 
 	if price_list:
-		price = frappe.get_all(
-			"Item Price",
-			fields=["price_list_rate", "currency"],
-			filters={"price_list": price_list, "item_code": item_code},
-		)
+		price = get_web_item_prices(item_code, price_list, batch)
 
 		if template_item_code and not price:
-			price = frappe.get_all(
-				"Item Price",
-				fields=["price_list_rate", "currency"],
-				filters={"price_list": price_list, "item_code": template_item_code},
-			)
+			price = get_web_item_prices(template_item_code, price_list, batch)
 
 		if price:
-			party = get_party()
+			party = batch.party if batch else get_party()
 			pricing_rule_dict = frappe._dict(
 				{
 					"item_code": item_code,
@@ -169,15 +171,18 @@ def get_price(item_code, price_list, customer_group, company, qty=1):
 					or ""
 				)
 
-				uom_conversion_factor = frappe.db.sql(
-					"""select	C.conversion_factor
-					from `tabUOM Conversion Detail` C
-					inner join `tabItem` I on C.parent = I.name and C.uom = I.sales_uom
-					where I.name = %s""",
-					item_code,
-				)
+				if batch:
+					uom_conversion_factor = batch.sales_uom_conversion_factors.get(item_code, 1)
+				else:
+					uom_conversion_factor = frappe.db.sql(
+						"""select	C.conversion_factor
+						from `tabUOM Conversion Detail` C
+						inner join `tabItem` I on C.parent = I.name and C.uom = I.sales_uom
+						where I.name = %s""",
+						item_code,
+					)
 
-				uom_conversion_factor = uom_conversion_factor[0][0] if uom_conversion_factor else 1
+					uom_conversion_factor = uom_conversion_factor[0][0] if uom_conversion_factor else 1
 				price_obj["formatted_price_sales_uom"] = fmt_money(
 					price_obj["price_list_rate"] * uom_conversion_factor, currency=price_obj["currency"]
 				)
@@ -194,6 +199,83 @@ def get_price(item_code, price_list, customer_group, company, qty=1):
 			return price_obj
 
 
+def get_web_item_prices(item_code, price_list, batch=None):
+	if batch:
+		# copies, as the price is modified for the pricing rule
+		return [frappe._dict(d) for d in batch.item_prices.get(item_code, [])]
+
+	return frappe.get_all(
+		"Item Price",
+		fields=["price_list_rate", "currency"],
+		filters={"price_list": price_list, "item_code": item_code},
+	)
+
+
+def get_prices(item_codes, price_list, customer_group, company, qty=1):
+	"""`get_price` of all `item_codes`, e.g. for a page of a product listing, with the Item Prices
+	and pricing rules of all the items fetched together"""
+	with (
+		batch_web_item_prices(item_codes, price_list),
+		batch_pricing_rules([{"item_code": item_code} for item_code in item_codes]),
+	):
+		return {
+			item_code: get_price(item_code, price_list, customer_group, company, qty=qty)
+			for item_code in item_codes
+		}
+
+
+@contextmanager
+def batch_web_item_prices(item_codes, price_list):
+	"""Within the block, `get_price` reads the templates, Item Prices and sales UOM conversion factors
+	of `item_codes` from one query each instead of querying them per item."""
+	from erpnext.e_commerce.shopping_cart.cart import get_party
+
+	if frappe.flags.web_item_price_batch is not None or not item_codes or not price_list:
+		yield
+		return
+
+	variant_of = dict(
+		frappe.get_all(
+			"Item", filters={"name": ("in", item_codes)}, fields=["name", "variant_of"], as_list=True
+		)
+	)
+
+	item_prices = {}
+	for d in frappe.get_all(
+		"Item Price",
+		fields=["item_code", "price_list_rate", "currency"],
+		filters={
+			"price_list": price_list,
+			"item_code": ("in", list(set(item_codes) | set(filter(None, variant_of.values())))),
+		},
+	):
+		item_prices.setdefault(d.pop("item_code"), []).append(d)
+
+	uom = frappe.qb.DocType("UOM Conversion Detail")
+	item = frappe.qb.DocType("Item")
+	sales_uom_conversion_factors = dict(
+		frappe.qb.from_(uom)
+		.inner_join(item)
+		.on((uom.parent == item.name) & (uom.uom == item.sales_uom))
+		.select(item.name, uom.conversion_factor)
+		.where(item.name.isin(item_codes))
+		.run()
+	)
+
+	frappe.flags.web_item_price_batch = frappe._dict(
+		price_list=price_list,
+		variant_of=variant_of,
+		item_prices=item_prices,
+		sales_uom_conversion_factors=sales_uom_conversion_factors,
+		party=get_party(),
+	)
+
+	try:
+		yield
+	finally:
+		frappe.flags.web_item_price_batch = None
+
+
 def get_non_stock_item_status(item_code, item_warehouse_field):
 	# if item is a product bundle, check if its bundle items are in stock
 	if frappe.db.exists("Product Bundle", item_code):